@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+from pipeline import run_pipeline
+
+# Sheet rules untuk proses worker; di-set sekali per worker oleh _init_worker
+_worker_sheets = None
+
+
+def _init_worker(sheets):
+    global _worker_sheets
+    _worker_sheets = sheets
+
+
+# CPU yang benar-benar boleh dipakai proses ini (container bisa membatasi)
+def default_worker_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _run_job(job, options):
+    file_name, raw_data, project_name = job
+    start_time = time.time()
+    try:
+        result = run_pipeline(BytesIO(raw_data), project_name, _worker_sheets, **options)
+    except Exception as e:
+        return {
+            "File": file_name, "Project": project_name, "Rows In": None, "Rows Out": None,
+            "Seconds": round(time.time() - start_time, 2), "Output File": None, "Error": str(e),
+            "Output Data": None,
+        }
+    return {
+        "File": file_name, "Project": project_name, "Rows In": result.rows_in, "Rows Out": result.rows_out,
+        "Seconds": round(time.time() - start_time, 2), "Output File": result.output_filename, "Error": "",
+        "Output Data": result.output_data,
+    }
+
+
+# === Batch Processing ===
+# jobs: [(nama file, isi file raw data dalam bytes, project name)]. Setiap file
+# diproses penuh di process pool; rules di-load sekali per worker dan model
+# gender / Media Tier di-cache per worker. Returns (timing DataFrame, zip bytes).
+def run_batch(jobs, sheets, max_workers=None, **options):
+    max_workers = max_workers or default_worker_count()
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    if max_workers == 1:
+        _init_worker(sheets)
+        results = [_run_job(job, options) for job in jobs]
+    else:
+        # spawn: worker tidak ikut mewarisi thread server Streamlit
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(sheets,)) as executor:
+            results = list(executor.map(_run_job, jobs, [options] * len(jobs)))
+
+    buffer = BytesIO()
+    used_names = set()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for result in results:
+            if result["Output Data"] is None:
+                continue
+            # Beberapa file bisa untuk project yang sama
+            name = result["Output File"]
+            stem, ext = os.path.splitext(name)
+            suffix = 2
+            while name in used_names:
+                name = f"{stem} ({suffix}){ext}"
+                suffix += 1
+            used_names.add(name)
+            result["Output File"] = name
+            archive.writestr(name, result.pop("Output Data"))
+
+    timing = pd.DataFrame([{k: v for k, v in result.items() if k != "Output Data"} for result in results])
+    return timing, buffer.getvalue()
@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import gender_predictor  # noqa: E402
+from media_tier import load_media_tier_map  # noqa: E402
+from pipeline import load_rules_sheets, run_pipeline  # noqa: E402
+from profiling import Profiler  # noqa: E402
+from synthetic import PROJECT_NAME, SIZES, prepare_inputs  # noqa: E402
+from workbook_loader import get_workbook_loader  # noqa: E402
+
+# === Benchmark ===
+# Menjalankan pipeline pada data sintetis dan mencatat waktu per stage.
+#   python benchmarks/run_benchmarks.py --sizes 10k 100k
+#   python benchmarks/run_benchmarks.py --sizes 10k --compare benchmarks/results/<baseline>.json
+# Hasil disimpan sebagai JSON di benchmarks/results untuk dibandingkan antar commit.
+
+DEFAULT_DATA_DIR = os.path.join(BENCHMARK_DIR, "data")
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+REGRESSION_THRESHOLD = 1.2   # lebih lambat 20% dari baseline dianggap regresi
+MIN_SECONDS = 0.05           # stage yang lebih cepat dari ini tidak dibandingkan (noise)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# Satu run pipeline; gender cache dimulai kosong (cold) atau dipakai ulang (warm)
+def run_once(paths, label, sheets, options, gender_cache):
+    default_cache = gender_predictor.get_gender_cache
+    with tempfile.TemporaryDirectory(prefix="bench_gender_") as cache_dir:
+        if gender_cache == "cold":
+            cache = gender_predictor.GenderCache(os.path.join(cache_dir, "gender_cache.sqlite"))
+            gender_predictor.get_gender_cache = lambda: cache
+
+        profiler = Profiler().start()
+        start = time.perf_counter()
+        try:
+            result = run_pipeline(
+                paths["raw"][label], PROJECT_NAME, sheets,
+                media_tier_source=paths["media_tier"], profiler=profiler, **options
+            )
+        finally:
+            profiler.stop()
+            gender_predictor.get_gender_cache = default_cache
+        total = time.perf_counter() - start
+
+    stages = {record["Stage"]: record for record in profiler.to_dict()["stages"]}
+    stages["Total"] = {"Stage": "Total", "Seconds": total, "Rows In": result.rows_in, "Rows Out": result.rows_out}
+    return stages, profiler.rule_report()
+
+
+# Tiap ukuran dijalankan `repeat` kali; per stage diambil waktu tercepat
+def run_benchmarks(sizes, repeat=3, data_dir=DEFAULT_DATA_DIR, n_rules=200, seed=0, gender_cache="cold", options=None):
+    options = options or {"remove_duplicate_links": True, "apply_media_tier": True}
+    paths = prepare_inputs(data_dir, sizes, n_rules=n_rules, seed=seed)
+    sheets = load_rules_sheets(paths["rules"])
+
+    # Model gender dan workbook Media Tier di-load sekali per proses; load pertama
+    # tidak ikut diukur supaya run pertama sebanding dengan run berikutnya
+    gender_predictor.get_gender_predictor(gender_predictor.model_fingerprint())
+    load_media_tier_map(get_workbook_loader(paths["media_tier"]))
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": {"repeat": repeat, "n_rules": n_rules, "seed": seed, "gender_cache": gender_cache, "options": options},
+        "sizes": {},
+    }
+    for label in sizes:
+        best = {}
+        slowest_rules = None
+        for i in range(repeat):
+            print(f"[{label}] run {i + 1}/{repeat}...")
+            stages, rule_report = run_once(paths, label, sheets, options, gender_cache)
+            for name, record in stages.items():
+                if name not in best or record["Seconds"] < best[name]["Seconds"]:
+                    best[name] = record
+            slowest_rules = rule_report.head(10)
+        results["sizes"][label] = {
+            "rows": SIZES[label],
+            "stages": list(best.values()),
+            "slowest_rules": json.loads(slowest_rules.to_json(orient="records")),
+        }
+    return results
+
+
+def stage_table(results):
+    rows = []
+    for label, size in results["sizes"].items():
+        for record in size["stages"]:
+            rows.append({"Size": label, "Stage": record["Stage"], "Seconds": record["Seconds"],
+                         "Peak RSS (MB)": record.get("Peak RSS (MB)"), "Frame MB": record.get("Frame MB")})
+    return pd.DataFrame(rows)
+
+
+# Bandingkan dengan hasil baseline: Ratio = waktu sekarang / waktu baseline
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    current = stage_table(results)
+    previous = stage_table(baseline)[["Size", "Stage", "Seconds"]]
+    table = current.merge(previous, on=["Size", "Stage"], how="left", suffixes=("", " Baseline"))
+    table["Ratio"] = table["Seconds"] / table["Seconds Baseline"]
+    table["Regression"] = (table["Ratio"] > threshold) & (table[["Seconds", "Seconds Baseline"]].max(axis=1) >= MIN_SECONDS)
+    return table
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline dengan data sintetis.")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k"], choices=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rules", type=int, default=200, help="Jumlah rule di sheet Rules sintetis")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gender-cache", choices=["cold", "warm"], default="cold",
+                        help="cold: gender cache kosong setiap run; warm: pakai gender cache biasa")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Folder untuk file input sintetis (di-cache)")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--label", default=None, help="Nama tambahan untuk file hasil")
+    parser.add_argument("--compare", default=None, help="File JSON hasil sebelumnya sebagai baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(
+        args.sizes, repeat=args.repeat, data_dir=args.data_dir, n_rules=args.rules,
+        seed=args.seed, gender_cache=args.gender_cache,
+    )
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    name = "_".join(filter(None, [
+        datetime.now().strftime("%Y%m%d-%H%M%S"), results["environment"]["commit"], args.label,
+    ]))
+    output_path = os.path.join(args.results_dir, f"{name}.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print(stage_table(results).to_string(index=False))
+    print(f"Hasil disimpan di {output_path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        table = compare(results, baseline, args.threshold)
+        print(table.to_string(index=False))
+        regressions = table[table["Regression"]]
+        if not regressions.empty:
+            print(f"⚠️ {len(regressions)} stage lebih lambat dari baseline (> {args.threshold:.2f}x)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from output_writer import write_xlsx  # noqa: E402
+
+# === Synthetic Data ===
+# Raw export, workbook rules dan workbook Media Tier buatan untuk benchmark.
+# Data dibuat dengan seed tetap, jadi hasil benchmark antar commit sebanding.
+
+PROJECT_NAME = "Benchmark Project"
+
+CHANNELS = ["Twitter", "Instagram", "TikTok", "Online News", "Facebook", "Youtube", "Printed Media"]
+CHANNEL_WEIGHTS = [0.35, 0.2, 0.15, 0.12, 0.1, 0.05, 0.03]
+NEWS_CHANNELS = ["Online News", "Printed Media"]
+
+FIRST_NAMES = ["budi", "siti", "ayu", "rizky", "dewi", "agus", "putri", "andi", "nur", "fajar", "john", "maria", "kevin", "sarah"]
+LAST_NAMES = ["santoso", "wijaya", "pratama", "lestari", "hidayat", "saputra", "kusuma", "official", "id", "store", ""]
+NAME_DECORATIONS = ["", "", "", "_", "99", ".", "_official", "123", "!"]
+
+MEDIA_NAMES = [f"media{i}.co.id" for i in range(400)] + ["detik.com", "kompas.com", "tribunnews.com", "cnnindonesia.com"]
+
+WORDS = [
+    "air", "mineral", "le", "minerale", "segar", "murah", "mahal", "harga", "promo", "diskon", "viral",
+    "galon", "botol", "minum", "sehat", "enak", "haus", "beli", "jual", "toko", "kemasan", "rasa",
+    "manis", "ada", "yang", "dan", "ini", "itu", "banget", "sekali", "aku", "kamu", "kita", "giveaway",
+    "iklan", "brand", "kualitas", "pabrik", "sumber", "pegunungan", "alami", "natural", "plastik",
+]
+TITLES = ["Berita Terkini", "Promo Air Mineral", "Le Minerale Diskon", "Review Produk", "Info Harga", ""]
+
+# Ukuran standar benchmark
+SIZES = {"10k": 10000, "100k": 100000, "1M": 1000000}
+
+
+def _choice(rng, values, n, p=None):
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=p)]
+
+
+def _text(rng, n, min_words, max_words):
+    lengths = rng.integers(min_words, max_words + 1, size=n)
+    words = np.asarray(WORDS, dtype=object)[rng.integers(0, len(WORDS), size=(n, max_words))]
+    # Sebagian kata ditulis kapital, seperti data asli
+    upper = rng.random((n, max_words)) < 0.05
+    words[upper] = np.char.upper(words[upper].astype(str)).astype(object)
+    return np.array([" ".join(row[:length]) for row, length in zip(words, lengths)], dtype=object)
+
+
+# Raw export dengan kolom yang dibaca pipeline dan kolom teks untuk rules
+def make_raw_data(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+
+    channel = _choice(rng, CHANNELS, n_rows, CHANNEL_WEIGHTS)
+    is_news = np.isin(channel, NEWS_CHANNELS)
+
+    author = (
+        _choice(rng, FIRST_NAMES, n_rows) + _choice(rng, [" ", "_", ""], n_rows)
+        + _choice(rng, LAST_NAMES, n_rows) + _choice(rng, NAME_DECORATIONS, n_rows)
+    )
+    author[rng.random(n_rows) < 0.03] = None
+
+    gender = np.full(n_rows, None, dtype=object)
+    known_gender = rng.random(n_rows) < 0.3
+    gender[known_gender] = _choice(rng, ["male", "female"], int(known_gender.sum()))
+
+    media_name = np.full(n_rows, None, dtype=object)
+    media_name[is_news] = _choice(rng, MEDIA_NAMES, int(is_news.sum()))
+    ad_value = np.round(rng.lognormal(mean=15, sigma=1.5, size=n_rows), -3)
+    ad_value[rng.random(n_rows) < 0.05] = np.nan
+
+    verified = _choice(rng, ["yes", "no", "-", "", "TRUE"], n_rows, [0.1, 0.6, 0.2, 0.05, 0.05])
+
+    # ~10% link duplikat
+    link_ids = rng.integers(0, int(n_rows * 0.9) + 1, size=n_rows)
+    link_url = np.char.add("https://example.com/post/", link_ids.astype(str)).astype(object)
+
+    original_reach = rng.integers(0, 5000000, size=n_rows).astype(float)
+    original_reach[rng.random(n_rows) < 0.1] = np.nan
+    potential_reach = rng.integers(0, 20000000, size=n_rows).astype(float)
+
+    content = _text(rng, n_rows, 0, 25)
+    content[rng.random(n_rows) < 0.03] = None
+
+    return pd.DataFrame({
+        "Date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 90 * 24, size=n_rows), unit="h"),
+        "Author": author,
+        "Gender": gender,
+        "Channel": channel,
+        "Media Name": media_name,
+        "Title": _choice(rng, TITLES, n_rows),
+        "Content": content,
+        "Ad Value": ad_value,
+        "Verified Account": verified,
+        "Link URL": link_url,
+        "Original Reach": original_reach,
+        "Potential Reach": potential_reach,
+        "Campaign": "Benchmark",
+    })
+
+
+def _contains_value(rng):
+    words = rng.choice(WORDS, size=4, replace=False)
+    shape = rng.integers(0, 5)
+    if shape == 0:
+        return str(words[0])
+    if shape == 1:
+        return "!" + str(words[0])
+    if shape == 2:
+        return f"{words[0]}+{words[1]}"
+    if shape == 3:
+        return f"{words[0]}|{words[1]}+!{words[2]}"
+    return f"{words[0]} {words[1]}+{words[2]}|{words[3]}"
+
+
+# Sheet "Rules" dengan semua Matching Type: contains (+, |, !), equals,
+# greater_than, less_than dan count_contains
+def make_rules(n_rules=200, seed=0):
+    rng = np.random.default_rng(seed)
+    match_types = ["contains", "equals", "greater_than", "less_than", "count_contains"]
+    weights = [0.6, 0.1, 0.1, 0.1, 0.1]
+
+    rows = []
+    for i in range(n_rules):
+        match_type = match_types[rng.choice(len(match_types), p=weights)]
+        if match_type == "contains":
+            column = rng.choice(["Content", "Content+Title", "Author", "Title"], p=[0.6, 0.2, 0.1, 0.1])
+            value = _contains_value(rng)
+        elif match_type == "equals":
+            column = rng.choice(["Media Name", "Title", "Verified Account"])
+            value = {
+                "Media Name": rng.choice(MEDIA_NAMES),
+                "Title": rng.choice(TITLES[:-1]),
+                "Verified Account": rng.choice(["Yes", "No"]),
+            }[column]
+        elif match_type in ("greater_than", "less_than"):
+            column = rng.choice(["Ad Value", "Original Reach", "Potential Reach"])
+            value = str(int(rng.choice([1e5, 1e6, 5e6, 1e7])))
+        else:
+            column = "Content"
+            value = f"{rng.choice(WORDS)}:{rng.choice(['min', 'max'])}={int(rng.integers(1, 4))}"
+
+        outputs = {"Output Noise Tag": None, "Output Issue": None, "Output Sub Issue": None}
+        target = rng.integers(0, 3)
+        if target == 0:
+            outputs["Output Noise Tag"] = int(rng.choice([0, 1, 2, 3]))
+        elif target == 1:
+            outputs["Output Issue"] = str(rng.choice(["Harga", "Kualitas", "Promo", "Distribusi"]))
+        else:
+            outputs["Output Issue"] = str(rng.choice(["Harga", "Kualitas"]))
+            outputs["Output Sub Issue"] = str(rng.choice(["Mahal", "Murah", "Segar", "Kemasan"]))
+
+        rows.append({
+            "Project": "Default" if i % 3 else PROJECT_NAME,
+            "Priority": int(rng.integers(1, 11)),
+            "Matching Column": column,
+            "Matching Value": value,
+            "Matching Type": match_type,
+            "Channel": rng.choice(["twitter", "instagram", "online news"]) if rng.random() < 0.3 else None,
+            **outputs,
+        })
+    return pd.DataFrame(rows)
+
+
+# Official Account Setup: handle "equals" dan "contains" per channel
+def make_official_accounts(n_accounts=100, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_accounts):
+        match_type = "equals" if i % 2 else "contains"
+        rows.append({
+            "Project": PROJECT_NAME,
+            "Verified Account": rng.choice([True, "no"]),
+            "Channel": rng.choice(["Twitter", "Instagram", "TikTok"]),
+            "Matching Column": "Author",
+            "Matching Value": (
+                f"{rng.choice(FIRST_NAMES)}{rng.choice(['_', ' ', ''])}{rng.choice(LAST_NAMES)}"
+                if match_type == "equals" else f"{rng.choice(FIRST_NAMES)}_official"
+            ),
+            "Matching Type": match_type,
+        })
+    return pd.DataFrame(rows)
+
+
+# Workbook rules lengkap, dengan sheet yang sama seperti file rules di Google Drive
+def make_rules_workbook(path, n_rules=200, n_accounts=100, seed=0):
+    output_columns = [
+        "Date", "Author", "Official Account", "Channel", "Media Name", "Media Tier", "Title", "Content",
+        "Noise Tag", "Noise Tag - Chain Overwrite", "Issue", "Sub Issue", "Gender", "Ad Value",
+        "Verified Account", "Link URL", "Followers", "Campaigns",
+    ]
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"Project Name": [PROJECT_NAME]}).to_excel(writer, sheet_name="Project List", index=False)
+        pd.DataFrame({
+            "Project": ["Default", "Default", "Default", "Default"],
+            "Target Column": ["Noise Tag", "Issue", "Sub Issue", "Official Account"],
+            "Reference Column": ["Content", "Noise Tag", "Issue", "Author"],
+            "Position": ["after", "after", "after", "after"],
+            "Default Value": ["0", None, None, None],
+        }).to_excel(writer, sheet_name="Column Setup", index=False)
+        make_rules(n_rules, seed).to_excel(writer, sheet_name="Rules", index=False)
+        pd.DataFrame({
+            "Project": "Default",
+            "Column Name": output_columns,
+            "Hide": ["Yes" if col == "Media Tier" else "No" for col in output_columns],
+        }).to_excel(writer, sheet_name="Column Order Setup", index=False)
+        pd.DataFrame({
+            "Project": [PROJECT_NAME] * 3,
+            "Keyword": ["promo", "harga", "giveaway"],
+            "Category": ["Promo", "Harga", "Promo"],
+        }).to_excel(writer, sheet_name="Method 1 Keyword", index=False)
+        pd.DataFrame({"Project": [PROJECT_NAME], "Method": ["Method 1"]}).to_excel(writer, sheet_name="Method Selection", index=False)
+        make_official_accounts(n_accounts, seed).to_excel(writer, sheet_name="Official Account Setup", index=False)
+        pd.DataFrame([["Last Updated", "benchmark"]]).to_excel(writer, sheet_name="NOTES", index=False, header=False)
+
+
+def make_media_tier_workbook(path, seed=0):
+    rng = np.random.default_rng(seed)
+    client = pd.DataFrame({"Media Name": MEDIA_NAMES[::3], "Media Tier": rng.integers(1, 4, size=len(MEDIA_NAMES[::3]))})
+    online = pd.DataFrame({"Media Name": MEDIA_NAMES[::2], "Media Tier": rng.integers(1, 4, size=len(MEDIA_NAMES[::2]))})
+    with pd.ExcelWriter(path) as writer:
+        client.to_excel(writer, sheet_name="Le Minerale - from Client", index=False)
+        online.to_excel(writer, sheet_name="Online with AVE - Updated", index=False)
+
+
+# Buat (atau pakai ulang) semua input benchmark di data_dir.
+# Returns {"rules": path, "media_tier": path, "raw": {size label: path}}
+def prepare_inputs(data_dir, sizes, n_rules=200, seed=0):
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {
+        "rules": os.path.join(data_dir, f"rules_{n_rules}_{seed}.xlsx"),
+        "media_tier": os.path.join(data_dir, f"media_tier_{seed}.xlsx"),
+        "raw": {},
+    }
+    if not os.path.exists(paths["rules"]):
+        make_rules_workbook(paths["rules"], n_rules=n_rules, seed=seed)
+    if not os.path.exists(paths["media_tier"]):
+        make_media_tier_workbook(paths["media_tier"], seed=seed)
+    for label in sizes:
+        path = os.path.join(data_dir, f"raw_{label}_{seed}.xlsx")
+        if not os.path.exists(path):
+            print(f"Membuat raw data {label} ({SIZES[label]} baris)...")
+            with open(path + ".partial", "wb") as f:
+                write_xlsx([("Sheet1", make_raw_data(SIZES[label], seed))], f)
+            os.replace(path + ".partial", path)
+        paths["raw"][label] = path
+    return paths
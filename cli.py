@@ -0,0 +1,130 @@
+import argparse
+import os
+import sys
+import tempfile
+
+from batch import default_worker_count
+from link_dedup import SeenLinksStore
+from output_writer import OUTPUT_FORMATS
+from pipeline import PipelineError, load_rules_sheets, run_pipeline, run_pipeline_chunked
+from profiling import DISABLED, Profiler
+from workbook_loader import RULES_FILE_ID, drive_url
+
+# === Command Line ===
+# Menjalankan pipeline tanpa Streamlit, mis. dari cron:
+#   python cli.py raw.xlsx --project "Le Minerale" --rules rules.xlsx --media-tier --output out/
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Proses raw data dengan rules project (tanpa Streamlit).")
+    parser.add_argument("raw_file", help="File Excel raw data")
+    parser.add_argument("--project", required=True, help="Nama project (kolom 'Project' di Project List)")
+    parser.add_argument("--rules", default=drive_url(RULES_FILE_ID),
+                        help="Path atau URL workbook rules (default: file rules di Google Drive)")
+    parser.add_argument("--media-tier-workbook", default=None,
+                        help="Path atau URL workbook Media Tier (default: file di Google Drive)")
+    parser.add_argument("--output", default=".",
+                        help="Folder output, atau nama file output")
+    parser.add_argument("--summary", default=None, help="Simpan Summary Execution Report ke file CSV ini")
+    parser.add_argument("--format", default="xlsx", choices=sorted(set(OUTPUT_FORMATS.values())))
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Proses raw data per N baris dan tulis output langsung ke file (hemat memori)")
+    parser.add_argument("--rule-workers", type=int, default=1,
+                        help="Jumlah proses untuk evaluasi rule (0 = semua CPU); data kecil tetap serial")
+    parser.add_argument("--profile", default=None,
+                        help="Simpan profiling per stage dan per rule ke file JSON ini")
+    parser.add_argument("--remove-duplicate-links", action="store_true", help="Remove duplicate link")
+    parser.add_argument("--seen-links-dir", default=None,
+                        help="Dengan --remove-duplicate-links: hapus juga link yang sudah ada di export "
+                             "sebelumnya untuk project yang sama (riwayat disimpan di folder ini)")
+    parser.add_argument("--export-name", default=None,
+                        help="Dengan --seen-links-dir: nama export / batch id (default nama file raw data); "
+                             "upload ulang dengan nama yang sama dianggap export yang sama")
+    parser.add_argument("--mark-delivered", action="store_true",
+                        help="Dengan --seen-links-dir: catat link hasil run ini sebagai sudah dikirim ke client")
+    parser.add_argument("--keep-raw-data", action="store_true", help="Keep RAW Data")
+    parser.add_argument("--media-tier", action="store_true", help="Apply Media Tier")
+    parser.add_argument("--kol-type", action="store_true", help="Apply KOL Type")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    options = dict(
+        remove_duplicate_links=args.remove_duplicate_links,
+        keep_raw_data=args.keep_raw_data,
+        apply_media_tier=args.media_tier,
+        apply_kol_type=args.kol_type,
+        output_format=args.format,
+        media_tier_source=args.media_tier_workbook,
+        rule_workers=args.rule_workers or default_worker_count(),
+        seen_links_store=SeenLinksStore(args.seen_links_dir) if args.seen_links_dir else None,
+        export_name=args.export_name,
+    )
+    output_path = args.output
+    profiler = Profiler().start() if args.profile else None
+    options["profiler"] = profiler
+    try:
+        with (profiler or DISABLED).stage("Load Rules Workbook"):
+            sheets = load_rules_sheets(args.rules)
+        if args.chunk_size:
+            # Nama file output baru diketahui setelah selesai; tulis ke file sementara
+            # (nama unik, run lain ke folder yang sama tidak menimpanya) dulu
+            partial_dir = output_path if os.path.isdir(output_path) else os.path.dirname(os.path.abspath(output_path))
+            fd, partial_path = tempfile.mkstemp(dir=partial_dir, suffix=".partial")
+            os.close(fd)
+            try:
+                result = run_pipeline_chunked(
+                    args.raw_file, args.project, sheets, chunk_size=args.chunk_size, output=partial_path, **options
+                )
+            except BaseException:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                raise
+        else:
+            result = run_pipeline(args.raw_file, args.project, sheets, **options)
+    except PipelineError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.stop()
+
+    for level, message in result.notices:
+        print(message, file=sys.stderr if level == "warning" else sys.stdout)
+
+    if os.path.isdir(output_path):
+        output_path = os.path.join(output_path, result.output_filename)
+    if args.chunk_size:
+        # mkstemp membuat file 0600; samakan dengan file biasa (umask)
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(partial_path, 0o666 & ~umask)
+        os.replace(partial_path, output_path)
+    else:
+        with open(output_path, "wb") as f:
+            f.write(result.output_data)
+
+    # Link dicatat setelah file hasil ditulis, hanya kalau user menandai hasil ini dikirim
+    if args.mark_delivered and result.link_hashes is not None:
+        options["seen_links_store"].record(args.project, result.link_hashes, result.export)
+
+    if args.summary:
+        result.summary_combined.to_csv(args.summary, index=False, encoding="utf-8-sig")
+    if profiler is not None:
+        with open(args.profile, "w", encoding="utf-8") as f:
+            f.write(profiler.to_json())
+
+    print(f"✅ {result.rows_out} rows -> {output_path} ({result.duration_seconds:.2f} detik)")
+    if result.gender_stats:
+        print(f"Gender cache: {result.gender_stats['Cache Hits']} hits, {result.gender_stats['Cache Misses']} misses")
+    if result.summary_combined is not None and not result.summary_combined.empty:
+        print(result.summary_combined.to_string(index=False))
+    if profiler is not None:
+        print(profiler.stage_report().to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Path relatif terhadap folder repo, supaya CLI bisa dijalankan dari folder mana saja
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, 'path_files/file1.pkl')
+VECTORIZER_PATH = os.path.join(BASE_DIR, 'path_files/file2.pkl')
+GENDER_CACHE_PATH = os.path.join(BASE_DIR, '.cache/gender_cache.sqlite')
+GENDER_CACHE_MAX_ENTRIES = 500000
+
+
+# Load the model and vectorizer for gender prediction
+class GenderPredictor:
+    def __init__(self):
+        # joblib / sklearn baru di-import saat model benar-benar dibutuhkan
+        import joblib
+
+        self.model = joblib.load(MODEL_PATH)
+        self.vectorizer = joblib.load(VECTORIZER_PATH)
+        self.labels = {1: "male", 0: "female"}
+
+    def predict(self, name: str):
+        genders, probabilities = self.predict_batch([name])
+        return genders[0], probabilities[0]
+
+    # Predict many cleaned names at once: one transform and one predict_proba call
+    def predict_batch(self, names):
+        vectors = self.vectorizer.transform(list(names))
+        proba = self.model.predict_proba(vectors)
+        results = self.model.classes_[proba.argmax(axis=1)]
+        genders = np.array([self.labels[result] for result in results], dtype=object)
+        probabilities = np.array([round(p * 100, 2) for p in proba.max(axis=1)])
+        return genders, probabilities
+
+
+# Fingerprint of the model + vectorizer pickles; changes whenever either file changes
+def model_fingerprint():
+    digest = hashlib.sha256()
+    for path in (MODEL_PATH, VECTORIZER_PATH):
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+# Model cukup di-load sekali per proses (dan di-load ulang kalau pickle berubah)
+@lru_cache(maxsize=1)
+def get_gender_predictor(fingerprint=None):
+    return GenderPredictor()
+
+
+# === Gender Cache ===
+# Hasil prediksi per nama (sudah dibersihkan) disimpan di SQLite, dengan key
+# nama + fingerprint model. Entry yang paling lama tidak dipakai dibuang
+# ketika jumlahnya melewati max_entries.
+class GenderCache:
+    def __init__(self, path=GENDER_CACHE_PATH, max_entries=GENDER_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "fingerprint TEXT NOT NULL, name TEXT NOT NULL, gender TEXT NOT NULL, "
+                "probability REAL NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (fingerprint, name))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used)")
+
+    # Returns {name: (gender, probability)} for the names already in the cache
+    def get_many(self, fingerprint, names):
+        names = list(names)
+        found = {}
+        now = time.time()
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT name, gender, probability FROM predictions "
+                    f"WHERE fingerprint = ? AND name IN ({placeholders})",
+                    [fingerprint] + chunk,
+                ).fetchall()
+                for name, gender, probability in rows:
+                    found[name] = (gender, probability)
+            conn.executemany(
+                "UPDATE predictions SET last_used = ? WHERE fingerprint = ? AND name = ?",
+                [(now, fingerprint, name) for name in found],
+            )
+        return found
+
+    def put_many(self, fingerprint, names, genders, probabilities):
+        now = time.time()
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute("DELETE FROM predictions WHERE fingerprint != ?", (fingerprint,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                [
+                    (fingerprint, name, gender, float(probability), now)
+                    for name, gender, probability in zip(names, genders, probabilities)
+                ],
+            )
+            overflow = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM predictions WHERE rowid IN "
+                    "(SELECT rowid FROM predictions ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+
+
+@lru_cache(maxsize=1)
+def get_gender_cache():
+    return GenderCache()
+
+
+# Function to process and fill gender prediction if confidence > 70%
+def fill_gender(df, use_cache=True):
+    stats = {"Cache Hits": 0, "Cache Misses": 0}
+    author = df['Author']  # Assuming there's an 'Author' column
+
+    # Only rows without Gender and with an Author name
+    candidates = np.flatnonzero(df['Gender'].isna().to_numpy() & author.notna().to_numpy())
+    if len(candidates) == 0:
+        return df, stats
+
+    # Remove non-alphabetic characters (keep only letters), skip empty names after cleaning
+    names_cleaned = author.iloc[candidates].astype(str).str.replace(r'[^a-zA-Z]', '', regex=True).to_numpy(dtype=object)
+    has_name = names_cleaned != ''
+    candidates = candidates[has_name]
+    if len(candidates) == 0:
+        return df, stats
+
+    # Predict each distinct name once, only the ones not in the cache
+    codes, unique_names = pd.factorize(names_cleaned[has_name])
+    genders = np.empty(len(unique_names), dtype=object)
+    probabilities = np.zeros(len(unique_names))
+    fingerprint = model_fingerprint()
+
+    cached = {}
+    if use_cache:
+        try:
+            cached = get_gender_cache().get_many(fingerprint, unique_names)
+        except sqlite3.Error as e:
+            print(f"⚠️ Gender cache tidak bisa dibaca: {e}")
+            use_cache = False
+    is_miss = np.fromiter((name not in cached for name in unique_names), dtype=bool, count=len(unique_names))
+    for i in np.flatnonzero(~is_miss):
+        genders[i], probabilities[i] = cached[unique_names[i]]
+
+    misses = unique_names[is_miss]
+    if len(misses) > 0:
+        genders[is_miss], probabilities[is_miss] = get_gender_predictor(fingerprint).predict_batch(misses)
+        if use_cache:
+            try:
+                get_gender_cache().put_many(fingerprint, misses, genders[is_miss], probabilities[is_miss])
+            except sqlite3.Error as e:
+                print(f"⚠️ Gender cache tidak bisa disimpan: {e}")
+    stats["Cache Hits"] = int((~is_miss).sum())
+    stats["Cache Misses"] = len(misses)
+
+    # Fill the 'Gender' column if the prediction confidence is greater than 70%
+    confident = (probabilities > 70)[codes]
+    if confident.any():
+        # Kolom Gender dari raw data bisa category atau float (kosong semua)
+        if df['Gender'].dtype != object:
+            df['Gender'] = df['Gender'].astype(object)
+        gender_col = df.columns.get_loc('Gender')
+        df.iloc[candidates[confident], gender_col] = genders[codes[confident]]
+    return df, stats
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import contains_index
+
+# Kolom output klasifikasi keyword dan kolom yang dicocokkan kalau sheet
+# "Method 1 Keyword" tidak punya kolom "Matching Column"
+OUTPUT_COLUMN = "Category"
+DEFAULT_MATCHING_COLUMN = "Content"
+
+METHOD_1 = "method 1"
+
+# Kolom yang harus ada di sheet "Method Selection" dan "Method 1 Keyword"
+METHOD_SELECTION_COLUMNS = ["Project", "Method"]
+KEYWORD_COLUMNS = ["Project", "Keyword", "Category"]
+
+
+# Kolom dari columns yang tidak ada di sheet (nama kolom di-strip)
+def missing_columns(df, columns):
+    present = {str(col).strip() for col in df.columns}
+    return [col for col in columns if col not in present]
+
+
+# Method klasifikasi untuk project dari sheet "Method Selection" (lowercase), None kalau tidak ada
+def selected_method(df_method_selection, project_name):
+    selection = df_method_selection.rename(columns=lambda c: c.strip())
+    methods = selection.loc[selection["Project"] == project_name, "Method"].dropna()
+    if methods.empty:
+        return None
+    return str(methods.iloc[0]).strip().lower()
+
+
+# === Method 1 Keyword ===
+# Keyword (Default + project) dari sheet "Method 1 Keyword" dicocokkan per kolom
+# lewat contains_index, jalur yang sama dengan rules "contains" (teks astype(str),
+# case-insensitive seperti str.contains(case=False)). Kalau beberapa keyword
+# cocok, baris keyword paling atas di sheet yang menentukan Category.
+class KeywordCategoryMatcher:
+    def __init__(self, df_keywords, project_name):
+        keywords = df_keywords.rename(columns=lambda c: c.strip())
+        keywords = keywords[keywords["Project"].isin(["Default", project_name])]
+        keywords = keywords.dropna(subset=["Keyword", "Category"])
+        if "Matching Column" in keywords.columns:
+            columns = keywords["Matching Column"].fillna(DEFAULT_MATCHING_COLUMN)
+        else:
+            columns = pd.Series(DEFAULT_MATCHING_COLUMN, index=keywords.index)
+
+        # (kolom, keyword, category) sesuai urutan sheet
+        self.rows = [
+            (str(col).strip(), str(keyword).strip(), category)
+            for col, keyword, category in zip(columns, keywords["Keyword"], keywords["Category"])
+        ]
+        self.columns = list(dict.fromkeys(col for col, _, _ in self.rows))
+        self.keywords = {col: [keyword for c, keyword, _ in self.rows if c == col] for col in self.columns}
+
+    def apply(self, df):
+        hits = {
+            col: contains_index(df[col].astype(str), self.keywords[col])
+            for col in self.columns if col in df.columns
+        }
+        if not hits:
+            return df
+
+        # Baris sheet paling atas ditulis terakhir supaya menang
+        categories = np.full(len(df), np.nan, dtype=object)
+        for col, keyword, category in reversed(self.rows):
+            if col in hits:
+                categories[hits[col][keyword]] = category
+
+        matched = pd.notna(categories)
+        if OUTPUT_COLUMN not in df.columns:
+            df[OUTPUT_COLUMN] = np.nan
+        if df[OUTPUT_COLUMN].dtype != object:
+            df[OUTPUT_COLUMN] = df[OUTPUT_COLUMN].astype(object)
+        df.iloc[np.flatnonzero(matched), df.columns.get_loc(OUTPUT_COLUMN)] = categories[matched]
+        return df
@@ -0,0 +1,99 @@
+import re
+
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# === Keyword Matcher ===
+# Semua keyword "contains" untuk satu kolom dicocokkan sekaligus: satu automaton
+# Aho-Corasick per kolom (pyahocorasick), teks cukup di-scan satu kali. Tanpa
+# pyahocorasick, fallback ke substring search per keyword unik.
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self.keywords = sorted({str(k).lower() for k in keywords})
+        self.automaton = None
+        if ahocorasick is not None and any(self.keywords):
+            self.automaton = ahocorasick.Automaton()
+            for keyword_id, keyword in enumerate(self.keywords):
+                if keyword:
+                    self.automaton.add_word(keyword, keyword_id)
+            self.automaton.make_automaton()
+
+    # Returns {keyword: sorted row positions containing it} for a lowercased series
+    def match(self, lowered):
+        values = lowered.to_numpy(dtype=object)
+        is_text = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+
+        if self.automaton is None:
+            return {
+                keyword: np.flatnonzero(
+                    lowered.str.contains(keyword, regex=False, na=False).to_numpy(dtype=bool) & is_text
+                )
+                for keyword in self.keywords
+            }
+
+        hits = [[] for _ in self.keywords]
+        automaton_iter = self.automaton.iter
+        for pos in np.flatnonzero(is_text):
+            for keyword_id in {keyword_id for _, keyword_id in automaton_iter(values[pos])}:
+                hits[keyword_id].append(pos)
+
+        index = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            if keyword:
+                index[keyword] = np.asarray(hits[keyword_id], dtype=np.int64)
+            else:
+                # Keyword kosong selalu match, sama seperti str.contains("")
+                index[keyword] = np.flatnonzero(is_text)
+        return index
+
+    # Boolean mask of the rows that contain at least one keyword
+    def match_any(self, lowered):
+        values = lowered.to_numpy(dtype=object)
+        is_text = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        if "" in self.keywords:
+            return is_text
+
+        if self.automaton is None:
+            mask = np.zeros(len(values), dtype=bool)
+            for keyword in self.keywords:
+                mask |= lowered.str.contains(keyword, regex=False, na=False).to_numpy(dtype=bool)
+            return mask & is_text
+
+        mask = np.zeros(len(values), dtype=bool)
+        automaton_iter = self.automaton.iter
+        for pos in np.flatnonzero(is_text):
+            # Cukup match pertama
+            for _ in automaton_iter(values[pos]):
+                mask[pos] = True
+                break
+        return mask
+
+
+# Huruf yang match huruf ASCII dengan re.IGNORECASE: A-Z, dan İ / ı (i), ſ (s), K (k)
+_ASCII_CASE_FOLD = str.maketrans(
+    {**{chr(c): chr(c).lower() for c in range(ord("A"), ord("Z") + 1)}, "\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"}
+)
+
+
+# {keyword: sorted row positions}, sama dengan str.contains(re.escape(keyword), case=False)
+# untuk setiap keyword. Keyword ASCII di-scan sekaligus (KeywordMatcher) pada teks
+# yang huruf-hurufnya dilipat satu per satu ke huruf ASCII kecil, seperti
+# perbandingan huruf re.IGNORECASE (str.lower() berbeda, mis. "İ".lower() = "i̇").
+# Keyword non-ASCII memakai regex asli.
+def contains_index(texts, keywords):
+    keywords = set(keywords)
+    ascii_keywords = [k for k in keywords if k.isascii()]
+    index = {}
+    if ascii_keywords:
+        hits = KeywordMatcher(ascii_keywords).match(texts.str.translate(_ASCII_CASE_FOLD))
+        index.update((k, hits[k.lower()]) for k in ascii_keywords)
+    for keyword in keywords.difference(ascii_keywords):
+        index[keyword] = np.flatnonzero(
+            texts.str.contains(re.escape(keyword), case=False, na=False).to_numpy(dtype=bool)
+        )
+    return index
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# Sheet opsional di workbook rules yang mengatur KOL Type. Tanpa sheet ini
+# KOL Type tidak diisi (tidak ada batas tier bawaan).
+KOL_TYPE_SHEET = "KOL Type Setup"
+KOL_TYPE_COLUMNS = ["Project", "KOL Type", "Min Followers"]
+OUTPUT_COLUMN = "KOL Type"
+
+
+# === KOL Type ===
+# Baris project (atau Default kalau project tidak punya baris) dari sheet
+# "KOL Type Setup":
+# - baris dengan "Channel" memberi KOL Type tetap ke channel itu (mis. media),
+#   dicocokkan setelah strip + lowercase, tanpa melihat Followers
+# - baris lain adalah tier: batas bawah Followers (Original Reach + Potential Reach)
+# Followers di bawah tier terendah atau kosong dibiarkan kosong.
+class KolTypeSetup:
+    def __init__(self, df_setup, project_name):
+        setup = df_setup.rename(columns=lambda c: str(c).strip())
+        if project_name in setup["Project"].values:
+            setup = setup[setup["Project"] == project_name]
+        else:
+            setup = setup[setup["Project"] == "Default"]
+        setup = setup.dropna(subset=["KOL Type"])
+
+        channels = setup["Channel"] if "Channel" in setup.columns else pd.Series(np.nan, index=setup.index)
+        self.channel_types = {}
+        for channel, kol_type in zip(channels.dropna(), setup.loc[channels.notna(), "KOL Type"]):
+            # Channel yang muncul dua kali: baris paling atas yang dipakai
+            self.channel_types.setdefault(str(channel).strip().lower(), kol_type)
+
+        tiers = pd.DataFrame({
+            "min": pd.to_numeric(setup.loc[channels.isna(), "Min Followers"], errors="coerce"),
+            "type": setup.loc[channels.isna(), "KOL Type"],
+        }).dropna().sort_values("min", kind="stable")
+        self.thresholds = tiers["min"].to_numpy(dtype=float)
+        self.types = tiers["type"].to_numpy(dtype=object)
+
+    # One searchsorted over all rows; Channel is normalized per unique value only
+    def apply(self, df):
+        followers = pd.to_numeric(df["Followers"], errors="coerce").to_numpy(dtype=float)
+        bins = np.searchsorted(self.thresholds, followers, side="right")
+        kol_type = np.full(len(df), np.nan, dtype=object)
+        tiered = (bins > 0) & ~np.isnan(followers)
+        kol_type[tiered] = self.types[bins[tiered] - 1]
+
+        if self.channel_types and "Channel" in df.columns:
+            codes, uniques = pd.factorize(df["Channel"])
+            channel_kol = np.array(
+                [self.channel_types.get(str(u).strip().lower(), np.nan) for u in uniques] + [np.nan], dtype=object
+            )[codes]
+            fixed = pd.notna(channel_kol)
+            kol_type[fixed] = channel_kol[fixed]
+
+        df[OUTPUT_COLUMN] = kol_type
+        return df
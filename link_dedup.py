@@ -0,0 +1,218 @@
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SEEN_LINKS_DIR = os.path.join(BASE_DIR, ".cache/seen_links")
+
+# Parameter query yang hanya untuk tracking, tidak mengubah post yang dituju
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+# Regex RE2 (pyarrow.compute) untuk link ASCII; RE2 tidak punya lookaround.
+# Whitespace ASCII sama dengan \s / str.isspace di Python.
+_SPACE = r"\t\n\x0b\f\r \x1c-\x1f"
+# Satu parameter query yang tidak kosong dan tidak diawali utm_ (huruf besar/kecil bebas)
+_PARAM = (
+    r"(?:[^uU&#{0}][^&#{0}]*|[uU](?:[^tT&#{0}][^&#{0}]*|[tT](?:[^mM&#{0}][^&#{0}]*|[mM](?:[^_&#{0}][^&#{0}]*)?)?)?)"
+).format(_SPACE)
+
+# Link yang sudah dalam bentuk standar (kebanyakan link export): https, host
+# lowercase, tanpa trailing slash, tanpa parameter utm_*, tanpa "?" / "#" kosong.
+# normalize_link tidak mengubahnya, jadi tidak perlu di-parse.
+_NORMALIZED_LINK = (
+    r"^https://[a-z0-9.:-]+(?:/[^?#{0}]*[^/?#{0}])?(?:\?(?:{1}(?:&{1}?)*|(?:&{1}?)+))?(?:#[^{0}]+)?$"
+).format(_SPACE, _PARAM)
+
+# Bentuk yang paling sering perlu dinormalisasi: http:// dan query yang hanya
+# berisi parameter utm_* (mis. link share). Ditulis ulang tanpa parse, lalu
+# dicek lagi dengan _NORMALIZED_LINK.
+_HTTP_SCHEME = r"^http://"
+_TRACKING_QUERY = r"^([^?#]*)\?utm_[^&#{0}]*(?:&utm_[^&#{0}]*)*$".format(_SPACE)
+
+
+# Bentuk standar satu link untuk remove duplicate: scheme http/https dan host
+# tanpa beda huruf besar/kecil, tanpa trailing slash dan tanpa parameter utm_*.
+# Nilai yang bukan URL hanya di-strip.
+def normalize_link(link):
+    if not isinstance(link, str):
+        return link
+    link = link.strip()
+    try:
+        scheme, netloc, path, query, fragment = urlsplit(link)
+    except ValueError:
+        return link
+    if not netloc:
+        return link
+    scheme = scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+    if query:
+        query = "&".join(
+            param for param in query.split("&") if not param.lower().startswith(TRACKING_PARAM_PREFIXES)
+        )
+    return urlunsplit((scheme, netloc.lower(), path.rstrip("/"), query, fragment))
+
+
+# URL dengan host; NaN, "", "-" dan teks lain bukan link
+def _is_url(link):
+    try:
+        return bool(urlsplit(link.strip()).netloc)
+    except ValueError:
+        return False
+
+
+# normalize_link untuk setiap link (array, mis. link unik satu kolom), dan mask
+# link yang URL. Link ASCII dicek dan ditulis ulang sekaligus dengan pyarrow;
+# normalize_link hanya dipanggil untuk sisanya.
+def normalize_links(links):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    normalized = np.array(links, dtype=object)
+    is_text = ~pd.isna(normalized)
+    if pd.api.types.infer_dtype(normalized[is_text], skipna=False) not in ("string", "empty"):
+        is_text = np.fromiter((isinstance(link, str) for link in normalized), dtype=bool, count=len(normalized))
+    text_pos = np.flatnonzero(is_text)
+    ascii_pos = text_pos[np.fromiter(map(str.isascii, normalized[text_pos]), dtype=bool, count=len(text_pos))]
+
+    is_standard = np.zeros(len(normalized), dtype=bool)
+    ascii_links = pa.array(normalized[ascii_pos], type=pa.string())
+    ascii_standard = pc.match_substring_regex(ascii_links, _NORMALIZED_LINK).to_numpy(zero_copy_only=False)
+    is_standard[ascii_pos] = ascii_standard
+
+    rewrite_pos = ascii_pos[~ascii_standard]
+    rewritten = pc.replace_substring_regex(
+        pc.replace_substring_regex(ascii_links.filter(pa.array(~ascii_standard)), _HTTP_SCHEME, "https://"),
+        _TRACKING_QUERY, r"\1",
+    )
+    rewritten_standard = pc.match_substring_regex(rewritten, _NORMALIZED_LINK).to_numpy(zero_copy_only=False)
+    normalized[rewrite_pos[rewritten_standard]] = rewritten.filter(pa.array(rewritten_standard)).to_numpy(
+        zero_copy_only=False
+    )
+    is_standard[rewrite_pos[rewritten_standard]] = True
+
+    is_url = is_standard.copy()
+    for pos in np.flatnonzero(is_text & ~is_standard):
+        is_url[pos] = _is_url(normalized[pos])
+        normalized[pos] = normalize_link(normalized[pos])
+    return normalized, is_url
+
+
+# Baris pertama per link setelah normalize_link, seperti drop_duplicates pada
+# link standar (NaN dianggap satu nilai). Duplikat persis di-drop dulu, jadi
+# normalisasi hanya untuk link unik. Returns (posisi baris, link standar dan
+# mask URL baris tersebut).
+def unique_links(links):
+    links = pd.Series(links).astype(object)
+    first_rows = np.flatnonzero(~links.duplicated(keep="first").to_numpy())
+    normalized, is_url = normalize_links(links.to_numpy()[first_rows])
+    keep = ~pd.Series(normalized).duplicated(keep="first").to_numpy()
+    return first_rows[keep], normalized[keep], is_url[keep]
+
+
+# 64-bit hash per link standar (hasil normalize_link)
+def hash_links(standard_links):
+    return pd.util.hash_array(np.asarray(standard_links, dtype=object), categorize=False)
+
+
+# Id export dari project dan nama export (batch id dari user, default nama file
+# raw data), bukan dari isi file: upload ulang export yang sudah dikoreksi tetap
+# export yang sama, jadi link-nya tidak dianggap sudah dikirim
+def export_id(project_name, export_name):
+    key = f"{project_name}\0{export_name}".encode("utf-8")
+    return np.uint64(int(hashlib.sha256(key).hexdigest()[:16], 16))
+
+
+# === Seen Links ===
+# Hash link yang sudah pernah muncul, disimpan sebagai array uint64 terurut
+# (8 byte per link), untuk remove duplicate link lintas chunk. url_hashes
+# hanya berisi link yang URL, yang dicatat di SeenLinksStore.
+class SeenLinks:
+    def __init__(self):
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.url_hashes = np.empty(0, dtype=np.uint64)
+
+    # Mask hash yang belum pernah dilihat (kemunculan pertama menang), lalu
+    # hash tersebut ditandai sudah dilihat
+    def first_seen_hashes(self, hashes, is_url=None):
+        is_new = ~pd.Index(hashes).duplicated(keep="first")
+
+        positions = np.searchsorted(self.hashes, hashes)
+        found = positions < len(self.hashes)
+        found[found] = self.hashes[positions[found]] == hashes[found]
+        is_new &= ~found
+
+        self.hashes = np.union1d(self.hashes, hashes[is_new])
+        if is_url is not None:
+            self.url_hashes = np.union1d(self.url_hashes, hashes[is_new & is_url])
+        return is_new
+
+    def __len__(self):
+        return len(self.hashes)
+
+
+_store_lock = threading.Lock()
+
+
+# === Seen Links Store ===
+# Link yang sudah pernah dikirim per project, disimpan di disk (satu .npz per
+# project): hash link dan id export pertama yang memuatnya, 16 byte per link.
+# Baris dengan link dari export lain di-drop; run ulang export yang sama
+# memberi hasil yang sama. Link hanya dicatat (record) setelah hasil benar-benar
+# dikirim, bukan saat output dibuat. Hanya hash link URL yang dicatat dan dicek:
+# baris tanpa link (NaN, "", "-") tidak pernah dianggap sudah dikirim.
+class SeenLinksStore:
+    def __init__(self, directory=SEEN_LINKS_DIR):
+        self.directory = directory
+
+    def _path(self, project_name):
+        digest = hashlib.sha256(str(project_name).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.npz")
+
+    def _load(self, project_name):
+        path = self._path(project_name)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64)
+        with np.load(path) as data:
+            return data["hashes"], data["exports"]
+
+    # Mask baris dengan link yang sudah dikirim oleh export lain
+    def delivered(self, project_name, hashes, export):
+        stored, exports = self._load(project_name)
+        positions = pd.Index(stored).get_indexer(hashes)
+        found = positions >= 0
+        found[found] = exports[positions[found]] != export
+        return found
+
+    # Tandai link export ini sudah dikirim (link lama tetap milik export pertamanya)
+    def record(self, project_name, hashes, export):
+        with _store_lock:
+            stored, exports = self._load(project_name)
+            new = np.unique(hashes)
+            new = new[~pd.Index(new).isin(stored)]
+            if len(new) == 0:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(project_name)
+            with open(path + ".tmp", "wb") as f:
+                np.savez(
+                    f,
+                    hashes=np.concatenate([stored, new]),
+                    exports=np.concatenate([exports, np.full(len(new), export, dtype=np.uint64)]),
+                )
+            os.replace(path + ".tmp", path)
+
+    def clear(self, project_name):
+        with _store_lock:
+            if os.path.exists(self._path(project_name)):
+                os.remove(self._path(project_name))
+
+
+@lru_cache(maxsize=1)
+def get_seen_links_store():
+    return SeenLinksStore()
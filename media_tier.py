@@ -0,0 +1,74 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from workbook_loader import drive_url, get_prefetch_executor, get_workbook_loader
+
+MEDIA_TIER_FILE_ID = "1LIcEKO-fdXfo1v-IUeU64He5mh6ti1nc"  # ID file Excel update Media Tier
+
+# Ad Value thresholds for media that are not in the Media Tier workbook
+TIER_1_AD_VALUE = 18000000
+TIER_2_AD_VALUE = 12600000
+
+
+# Mapping 'Media Name' to 'Media Tier' for both sheets. Within "Le Minerale -
+# from Client" the last row wins; "Online with AVE - Updated" only adds media
+# that the client sheet does not have, first row wins.
+def build_media_tier_map(sheet_client, sheet_online):
+    client = sheet_client[["Media Name", "Media Tier"]].drop_duplicates(subset="Media Name", keep="last")
+    online = sheet_online[["Media Name", "Media Tier"]].drop_duplicates(subset="Media Name", keep="first")
+    online = online[~online["Media Name"].isin(client["Media Name"])]
+    combined = pd.concat([client, online], ignore_index=True)
+    return pd.Series(combined["Media Tier"].to_numpy(dtype=object), index=combined["Media Name"])
+
+
+def get_media_tier_loader():
+    return get_workbook_loader(drive_url(MEDIA_TIER_FILE_ID))
+
+
+_media_tier_cache = {}
+_media_tier_lock = threading.Lock()
+
+
+# Media Tier map, rebuilt only when the workbook content changes
+def load_media_tier_map(loader=None):
+    loader = loader or get_media_tier_loader()
+    loader.refresh()
+    with _media_tier_lock:
+        cached = _media_tier_cache.get(loader.source)
+        if cached is None or cached[0] != loader.version:
+            sheet_client = loader.sheet("Le Minerale - from Client")
+            sheet_online = loader.sheet("Online with AVE - Updated")
+            cached = (loader.version, build_media_tier_map(sheet_client, sheet_online))
+            _media_tier_cache[loader.source] = cached
+        return cached[1]
+
+
+# Download workbook dan build map di background; load_media_tier_map
+# berikutnya menunggu hasilnya (atau mencoba lagi kalau gagal)
+def prefetch_media_tier_map(loader=None):
+    return get_prefetch_executor().submit(load_media_tier_map, loader or get_media_tier_loader())
+
+
+# Apply media tier to the raw data: tier from the map, otherwise from Ad Value
+def assign_media_tier(df, media_tier_map):
+    has_media = df["Media Name"].notna().to_numpy()
+    if not has_media.any():
+        return df
+    media = df["Media Name"][has_media]
+
+    in_map = media.isin(media_tier_map.index).to_numpy()
+    mapped = media.map(media_tier_map).to_numpy(dtype=object)
+
+    ad_value = pd.to_numeric(df["Ad Value"][has_media], errors="coerce").to_numpy(dtype=float)
+    fallback = np.select([ad_value >= TIER_1_AD_VALUE, ad_value >= TIER_2_AD_VALUE], [1, 2], default=3)
+
+    tiers = np.where(in_map, mapped, fallback.astype(object))
+    if "Media Tier" not in df.columns:
+        df["Media Tier"] = np.nan
+    # Tier bisa campuran angka / teks dari workbook; kolom float tidak bisa menampungnya
+    if df["Media Tier"].dtype != object:
+        df["Media Tier"] = df["Media Tier"].astype(object)
+    df.iloc[np.flatnonzero(has_media), df.columns.get_loc("Media Tier")] = tiers
+    return df
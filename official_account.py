@@ -0,0 +1,146 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher
+
+# Kolom yang ditulis oleh official account logic
+OUTPUT_COLUMNS = ("Official Account", "Noise Tag")
+
+
+# Normalisasi seperti str(x).strip().lower(), dihitung per nilai unik saja
+def _normalized(series):
+    codes, uniques = pd.factorize(series.astype(str))
+    labels = np.array([u.strip().lower() for u in uniques], dtype=object)
+    return labels[codes]
+
+
+# Baris yang cocok dengan minimal satu handle "contains" (re.escape + case=False)
+def _contains_any(texts, values):
+    # re.escape juga dipakai untuk validasi: nilai bukan teks gagal sama seperti sebelumnya
+    patterns = [re.escape(val) for val in values]
+
+    # Untuk teks dan handle ASCII, case=False sama dengan substring pada teks lowercase
+    ascii_values = [val for val in values if val.isascii()]
+    other_patterns = [pattern for val, pattern in zip(values, patterns) if not val.isascii()]
+    is_ascii = np.fromiter((text.isascii() for text in texts), dtype=bool, count=len(texts))
+
+    mask = np.zeros(len(texts), dtype=bool)
+    if ascii_values:
+        ascii_rows = np.flatnonzero(is_ascii)
+        lowered = texts.iloc[ascii_rows].str.lower()
+        mask[ascii_rows] = KeywordMatcher(ascii_values).match_any(lowered)
+
+        # Teks non-ASCII memakai regex asli (case folding Unicode)
+        other_rows = np.flatnonzero(~is_ascii)
+        if len(other_rows):
+            pattern = "|".join(re.escape(val) for val in ascii_values)
+            mask[other_rows] = texts.iloc[other_rows].str.contains(pattern, case=False, na=False).to_numpy(dtype=bool)
+    if other_patterns:
+        mask |= texts.str.contains("|".join(other_patterns), case=False, na=False).to_numpy(dtype=bool)
+    return mask
+
+
+# Kolom output harus object sebelum diisi teks (kolom raw bisa category atau
+# float kalau kosong semua)
+def _writable_output(df):
+    for col in OUTPUT_COLUMNS:
+        if col in df.columns and df[col].dtype != object:
+            df[col] = df[col].astype(object)
+
+
+# === Official Account Matcher ===
+# Sheet "Official Account Setup" untuk satu project di-compile sekali: handle
+# dikelompokkan per (verified, channel, kolom). "equals" menjadi satu lookup
+# (isin) per kelompok dan semua handle "contains" satu multi-pattern match,
+# hanya pada baris dengan channel dan verified yang sesuai. Hasilnya sama dengan
+# mengecek setiap baris setup satu per satu.
+class OfficialAccountMatcher:
+    def __init__(self, setup_df, project_name):
+        setup_df.columns = setup_df.columns.str.strip()
+
+        # Ubah nilai TRUE/FALSE jadi Yes/No (string)
+        setup_df["Verified Account"] = setup_df["Verified Account"].apply(
+            lambda x: "yes" if str(x).strip().lower() in ["true", "yes", "1"] else "no"
+        )
+
+        # Ambil rules yang sesuai project
+        setup_project = setup_df[setup_df["Project"] == project_name]
+
+        self.rows = []      # (verified, channel, kolom, nilai, match type) sesuai urutan sheet
+        self.groups = {}    # (verified, channel, kolom) -> {"contains": [...], "equals": set(...)}
+        for _, row in setup_project.iterrows():
+            verified = str(row.get("Verified Account", "")).strip().lower()
+            channel = str(row.get("Channel", "")).strip().lower()
+            col = row["Matching Column"]
+            val = row["Matching Value"]
+            match_type = row["Matching Type"]
+            if match_type not in ("contains", "equals"):
+                continue
+            self.rows.append((verified, channel, col, val, match_type))
+
+            group = self.groups.setdefault((verified, channel, col), {"contains": [], "equals": set()})
+            if match_type == "contains":
+                group["contains"].append(val)
+            elif isinstance(val, str):
+                # astype(str) tidak pernah sama dengan nilai non-teks
+                group["equals"].add(val)
+
+        # Handle yang membaca kolom hasil official account sendiri bergantung pada
+        # urutan baris setup, jadi dicek satu per satu
+        self.sequential = any(col in OUTPUT_COLUMNS for _, _, col, _, _ in self.rows)
+
+    def apply(self, df):
+        if "Channel" not in df.columns or "Verified Account" not in df.columns:
+            return df
+        if self.sequential:
+            return self._apply_sequential(df)
+        groups = {key: group for key, group in self.groups.items() if key[2] in df.columns}
+        if not groups:
+            return df
+        # Handle "contains" yang bukan teks gagal di re.escape seperti sebelumnya,
+        # juga kalau tidak ada baris dengan channel / verified yang sesuai
+        for group in groups.values():
+            for val in group["contains"]:
+                re.escape(val)
+
+        verified_values = _normalized(df["Verified Account"])
+        channel_values = _normalized(df["Channel"])
+
+        mask = np.zeros(len(df), dtype=bool)
+        for (verified, channel, col), group in groups.items():
+            rows = np.flatnonzero((verified_values == verified) & (channel_values == channel))
+            if len(rows) == 0:
+                continue
+            texts = df[col].iloc[rows].astype(str)
+
+            matched = np.zeros(len(rows), dtype=bool)
+            if group["equals"]:
+                matched |= texts.isin(group["equals"]).to_numpy(dtype=bool)
+            if group["contains"]:
+                matched |= _contains_any(texts, group["contains"])
+            mask[rows[matched]] = True
+
+        if mask.any():
+            _writable_output(df)
+        df.loc[mask, "Official Account"] = "Official Account"
+        df.loc[mask, "Noise Tag"] = "1"
+        return df
+
+    def _apply_sequential(self, df):
+        _writable_output(df)
+        verified_values = _normalized(df["Verified Account"])
+        channel_values = _normalized(df["Channel"])
+        for verified, channel, col, val, match_type in self.rows:
+            if col not in df.columns:
+                continue
+            mask = (verified_values == verified) & (channel_values == channel)
+            series = df[col].astype(str)
+            if match_type == "contains":
+                mask &= series.str.contains(re.escape(val), case=False, na=False).to_numpy(dtype=bool)
+            else:
+                mask &= (series == val).to_numpy(dtype=bool)
+            df.loc[mask, "Official Account"] = "Official Account"
+            df.loc[mask, "Noise Tag"] = "1"
+        return df
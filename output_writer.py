@@ -0,0 +1,178 @@
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Pilihan format output di UI -> format internal
+OUTPUT_FORMATS = {
+    "Excel (.xlsx)": "xlsx",
+    "CSV (.zip)": "csv",
+    "Parquet (.zip)": "parquet",
+}
+
+
+# Column values as Python objects, NaN/NaT -> None (written as empty cells)
+def _column_values(series):
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+# Rows are converted per block so the whole frame is never held as Python objects
+def _iter_rows(df, block_size=10000):
+    for start in range(0, len(df), block_size):
+        block = df.iloc[start:start + block_size]
+        yield from zip(*(_column_values(block.iloc[:, i]) for i in range(block.shape[1])))
+
+
+# Row-by-row with xlsxwriter constant_memory: only one row per sheet is kept in memory
+class _XlsxWriterBook:
+    def __init__(self, output):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(output, {
+            "constant_memory": True,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "nan_inf_to_errors": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+        })
+        # Same header style as DataFrame.to_excel
+        self.header_format = self.workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        self.sheets = {}
+
+    def append(self, sheet_name, df):
+        if sheet_name not in self.sheets:
+            worksheet = self.workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, [str(col) for col in df.columns], self.header_format)
+            self.sheets[sheet_name] = [worksheet, 1]
+        worksheet, next_row = self.sheets[sheet_name]
+        for row_idx, row in enumerate(_iter_rows(df), start=next_row):
+            worksheet.write_row(row_idx, 0, row)
+        self.sheets[sheet_name][1] = next_row + len(df)
+
+    def close(self):
+        self.workbook.close()
+
+
+# Fallback: openpyxl write-only mode, rows are streamed instead of kept as cells
+class _OpenpyxlBook:
+    def __init__(self, output):
+        from openpyxl import Workbook
+
+        self.output = output
+        self.workbook = Workbook(write_only=True)
+        self.sheets = {}
+
+    def append(self, sheet_name, df):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, Side
+
+        if sheet_name not in self.sheets:
+            worksheet = self.workbook.create_sheet(sheet_name)
+            thin = Side(style="thin")
+            header = []
+            for col in df.columns:
+                cell = WriteOnlyCell(worksheet, value=str(col))
+                cell.font = Font(bold=True)
+                cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+                cell.alignment = Alignment(horizontal="center", vertical="top")
+                header.append(cell)
+            worksheet.append(header)
+            self.sheets[sheet_name] = worksheet
+        worksheet = self.sheets[sheet_name]
+        for row in _iter_rows(df):
+            worksheet.append(row)
+
+    def close(self):
+        self.workbook.save(self.output)
+
+
+def _xlsx_book(output):
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        return _OpenpyxlBook(output)
+    return _XlsxWriterBook(output)
+
+
+def write_xlsx(sheets, output):
+    book = _xlsx_book(output)
+    for sheet_name, df in sheets:
+        book.append(sheet_name, df)
+    book.close()
+
+
+# Kolom teks dengan tipe campuran (mis. Noise Tag "1" dan 2) disimpan sebagai string
+def parquet_table(df, schema=None):
+    import pyarrow as pa
+
+    mixed = [
+        col for col in df.columns
+        if df[col].dtype == object or isinstance(df[col].dtype, pd.CategoricalDtype)
+    ]
+    table = pa.Table.from_pandas(df.astype({col: "string" for col in mixed}), preserve_index=False)
+    # Chunk berikutnya mengikuti schema chunk pertama (mis. int64 -> float64)
+    return table if schema is None else table.cast(schema)
+
+
+# === Output Writer ===
+# Output ditulis per potongan: write() boleh dipanggil berkali-kali untuk sheet
+# yang sama, baris ditambahkan di bawahnya. CSV dan Parquet dikemas dalam zip,
+# satu file per sheet. close() returns (file extension, mime type).
+class OutputWriter:
+    def __init__(self, output, output_format="xlsx"):
+        if output_format not in ("xlsx", "csv", "parquet"):
+            raise ValueError(f"Format output tidak dikenal: {output_format}")
+        self.output = output
+        self.output_format = output_format
+        self._book = _xlsx_book(output) if output_format == "xlsx" else None
+        self._parts = {}    # sheet name -> temporary file (CSV) / ParquetWriter
+
+    def write(self, sheet_name, df):
+        if self.output_format == "xlsx":
+            self._book.append(sheet_name, df)
+        elif self.output_format == "csv":
+            first = sheet_name not in self._parts
+            if first:
+                self._parts[sheet_name] = tempfile.TemporaryFile()
+            df.to_csv(self._parts[sheet_name], index=False, header=first, encoding="utf-8-sig" if first else "utf-8")
+        else:
+            import pyarrow.parquet as pq
+
+            if sheet_name not in self._parts:
+                table = parquet_table(df)
+                part = tempfile.TemporaryFile()
+                self._parts[sheet_name] = (part, pq.ParquetWriter(part, table.schema))
+            else:
+                table = parquet_table(df, self._parts[sheet_name][1].schema)
+            self._parts[sheet_name][1].write_table(table)
+
+    def close(self):
+        if self.output_format == "xlsx":
+            self._book.close()
+            return "xlsx", XLSX_MIME
+
+        with zipfile.ZipFile(self.output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for sheet_name, part in self._parts.items():
+                if self.output_format == "parquet":
+                    part, parquet_writer = part
+                    parquet_writer.close()
+                part.seek(0)
+                with archive.open(f"{sheet_name}.{self.output_format}", "w") as f:
+                    shutil.copyfileobj(part, f)
+                part.close()
+        return "zip", "application/zip"
+
+
+# === Write Output ===
+# sheets: [(sheet name, DataFrame)]. Returns (bytes, file extension, mime type).
+def write_output(sheets, output_format="xlsx"):
+    buffer = BytesIO()
+    writer = OutputWriter(buffer, output_format)
+    for sheet_name, df in sheets:
+        writer.write(sheet_name, df)
+    output_ext, output_mime = writer.close()
+    return buffer.getvalue(), output_ext, output_mime
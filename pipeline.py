@@ -0,0 +1,774 @@
+import os
+import time
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from gender_predictor import fill_gender, model_fingerprint
+from keyword_category import (
+    KEYWORD_COLUMNS, METHOD_1, METHOD_SELECTION_COLUMNS, OUTPUT_COLUMN as CATEGORY_COLUMN, KeywordCategoryMatcher,
+    missing_columns, selected_method,
+)
+from kol_type import KOL_TYPE_COLUMNS, KOL_TYPE_SHEET, OUTPUT_COLUMN as KOL_TYPE_COLUMN, KolTypeSetup
+from link_dedup import SeenLinks, export_id, hash_links, unique_links
+from media_tier import assign_media_tier, get_media_tier_loader, load_media_tier_map, prefetch_media_tier_map
+from official_account import OfficialAccountMatcher
+from output_writer import OutputWriter, write_output
+from profiling import DISABLED
+from raw_data_reader import compact_text_dtypes, iter_raw_data, read_raw_data, required_raw_columns, source_bytes
+from rule_engine import apply_rules, compile_rules, summary_for_rows
+from run_cache import RunSnapshot, content_hash, frame_hash, row_hashes
+from workbook_loader import get_workbook_loader
+
+# Sheet dari workbook rules yang dipakai pipeline
+RULES_SHEETS = [
+    "Project List", "Column Setup", "Rules", "Column Order Setup",
+    "Method 1 Keyword", "Method Selection", "Official Account Setup",
+]
+
+# Sheet opsional dari workbook rules: hanya dibaca kalau ada di workbook
+OPTIONAL_RULES_SHEETS = [KOL_TYPE_SHEET]
+
+# Sheet yang menentukan hasil per baris, bagian dari key run cache
+SETUP_SHEETS = [
+    "Column Setup", "Rules", "Column Order Setup", "Official Account Setup", "Method 1 Keyword", "Method Selection",
+]
+
+# Jumlah baris raw data per chunk untuk run_pipeline_chunked
+DEFAULT_CHUNK_SIZE = 100000
+
+
+class PipelineError(Exception):
+    pass
+
+
+class PipelineResult:
+    def __init__(self):
+        self.df_raw = None
+        self.df_processed = None
+        self.df_final = None
+        self.summary_df = None
+        self.summary_combined = None
+        self.gender_stats = None
+        self.output_data = None
+        self.output_filename = None
+        self.output_mime = None
+        self.noise_tag_counts = None
+        self.rows_in = None
+        self.rows_out = None
+        self.profile = None     # Profiler, kalau profiling diaktifkan
+        self.reused_rows = 0    # baris yang hasilnya diambil dari run sebelumnya (run cache)
+        self.notices = []   # [(level, message)], level = "info" / "warning"
+        self.export = None          # id export untuk SeenLinksStore
+        self.link_hashes = None     # hash link URL di output, dicatat di SeenLinksStore setelah dikirim
+        self.duration_seconds = None
+
+
+# workbook: WorkbookLoader, atau path / URL workbook rules
+def load_rules_sheets(workbook):
+    if isinstance(workbook, str):
+        workbook = get_workbook_loader(workbook)
+    sheets = {sheet_name: workbook.sheet(sheet_name) for sheet_name in RULES_SHEETS}
+    available = set(workbook.sheet_names())
+    sheets.update((name, workbook.sheet(name)) for name in OPTIONAL_RULES_SHEETS if name in available)
+    return sheets
+
+
+# === Apply Media Tier Logic ===
+# media_tier_source: path / URL workbook Media Tier, default file di Google Drive
+def _media_tier_loader(media_tier_source):
+    return get_workbook_loader(media_tier_source) if media_tier_source else get_media_tier_loader()
+
+
+def apply_media_tier_logic(df, media_tier_source=None):
+    try:
+        # Workbook Media Tier di-cache per proses dan di-revalidate berkala
+        media_tier_map = load_media_tier_map(_media_tier_loader(media_tier_source))
+    except Exception as e:
+        raise PipelineError(f"❌ Gagal load file Media Tier dari Google Drive: {e}")
+    return assign_media_tier(df, media_tier_map)
+
+
+# Function to update a column's visibility in the Column Order Setup sheet
+def update_column_visibility(df_column_order, column_name):
+
+    # Find the row where 'Column Name' is column_name
+    column_row = df_column_order[df_column_order["Column Name"] == column_name]
+
+    # Check if "Hide" is "Yes" and change it to "No"
+    if not column_row.empty:
+        if column_row["Hide"].iloc[0].strip().lower() == "yes":
+            df_column_order.loc[df_column_order["Column Name"] == column_name, "Hide"] = "No"
+
+    # Return the updated DataFrame
+    return df_column_order
+
+
+# Function to update the "Media Tier" visibility in the Column Order Setup sheet
+def update_media_tier_visibility(df_column_order):
+    return update_column_visibility(df_column_order, "Media Tier")
+
+
+# Kolom output yang tidak ada di Column Order Setup project: disisipkan setelah
+# kolom after (atau di akhir)
+def _add_output_column(ordered_cols, column_sheet_names, column_name, after=None):
+    if column_name in column_sheet_names:
+        return ordered_cols
+    insert_at = ordered_cols.index(after) + 1 if after in ordered_cols else len(ordered_cols)
+    return ordered_cols[:insert_at] + [column_name] + ordered_cols[insert_at:]
+
+
+#Untuk menentukan official account
+def apply_official_account_logic(df, setup_df, project_name):
+    return OfficialAccountMatcher(setup_df, project_name).apply(df)
+
+
+class _ProjectSetup:
+    def __init__(self, project_name, sheets, keep_raw_data, apply_media_tier, run_cache=None, rule_workers=None,
+                 apply_kol_type=False):
+        df_column_setup = sheets["Column Setup"]
+        df_rules = sheets["Rules"]
+        df_column_order = sheets["Column Order Setup"].copy()
+        df_official_account_setup = sheets["Official Account Setup"].copy()
+
+        # Baca hanya kolom yang dipakai project ini, kecuali RAW Data ikut disimpan
+        self.raw_columns = None if keep_raw_data else required_raw_columns(
+            project_name, df_column_order, df_column_setup, df_rules, df_official_account_setup
+        )
+
+        # Official Account Setup di-compile sekali, dipakai untuk setiap chunk
+        self.official_account = OfficialAccountMatcher(df_official_account_setup, project_name)
+
+        # Klasifikasi keyword sesuai method project di sheet Method Selection.
+        # Sheet dengan kolom yang tidak dikenal tidak menggagalkan run: stage
+        # klasifikasi dilewati dengan warning.
+        self.notices = []
+        self.keyword_method = None
+        self.keyword_category = None
+        missing = missing_columns(sheets["Method Selection"], METHOD_SELECTION_COLUMNS)
+        if missing:
+            _add_notice(self.notices, "warning", _missing_columns_message("Method Selection", missing, "klasifikasi keyword"))
+        else:
+            self.keyword_method = selected_method(sheets["Method Selection"], project_name)
+        if self.keyword_method == METHOD_1:
+            missing = missing_columns(sheets["Method 1 Keyword"], KEYWORD_COLUMNS)
+            if missing:
+                _add_notice(self.notices, "warning", _missing_columns_message("Method 1 Keyword", missing, "klasifikasi keyword"))
+                self.keyword_method = None
+            else:
+                self.keyword_category = KeywordCategoryMatcher(sheets["Method 1 Keyword"].copy(), project_name)
+                if self.raw_columns is not None:
+                    self.raw_columns.update(self.keyword_category.columns)
+
+        # KOL Type hanya diisi dari sheet KOL Type Setup; tanpa sheet (atau
+        # dengan kolom yang tidak dikenal) stage dilewati dengan warning
+        self.kol_type = None
+        if apply_kol_type:
+            if KOL_TYPE_SHEET not in sheets:
+                _add_notice(self.notices, "warning", f"⚠️ Sheet {KOL_TYPE_SHEET} tidak ada di workbook rules: KOL Type dilewati.")
+            else:
+                missing = missing_columns(sheets[KOL_TYPE_SHEET], KOL_TYPE_COLUMNS)
+                if missing:
+                    _add_notice(self.notices, "warning", _missing_columns_message(KOL_TYPE_SHEET, missing, "KOL Type"))
+                else:
+                    self.kol_type = KolTypeSetup(sheets[KOL_TYPE_SHEET].copy(), project_name)
+
+        # Setup Columns
+        column_setup_default = df_column_setup[df_column_setup["Project"] == "Default"]
+        column_setup_project = df_column_setup[df_column_setup["Project"] == project_name]
+        self.column_setup = pd.concat([column_setup_default, column_setup_project], ignore_index=True)
+
+        # === Apply Rules ===
+        rules_default = df_rules[df_rules["Project"] == "Default"]
+        rules_project = df_rules[df_rules["Project"] == project_name] if project_name in df_rules["Project"].values else pd.DataFrame()
+        rules_combined = pd.concat([rules_default, rules_project], ignore_index=True)
+
+        # Rules di-compile sekali; Issue dan Sub Issue memakai ulang hasil evaluasi Noise Tag
+        self.rule_plan = compile_rules(rules_combined)
+        self.rule_plan.mask_cache = run_cache
+        self.rule_plan.workers = rule_workers or 1
+
+        # Update "Media Tier" visibility to be shown
+        if apply_media_tier:
+            df_column_order = update_media_tier_visibility(df_column_order)
+        if self.kol_type is not None:
+            df_column_order = update_column_visibility(df_column_order, KOL_TYPE_COLUMN)
+
+        # Setup Column Order
+        if project_name in df_column_order["Project"].values:
+            ordered_cols = df_column_order[df_column_order["Project"] == project_name]
+        else:
+            ordered_cols = df_column_order[df_column_order["Project"] == "Default"]
+        self.ordered_cols = ordered_cols[ordered_cols["Hide"].str.lower() != "yes"]["Column Name"].tolist()
+
+        # KOL Type dan Category tetap ditampilkan walaupun belum ada di Column Order Setup
+        column_sheet_names = set(ordered_cols["Column Name"])
+        if self.kol_type is not None:
+            self.ordered_cols = _add_output_column(self.ordered_cols, column_sheet_names, KOL_TYPE_COLUMN, after="Followers")
+        if self.keyword_category is not None:
+            self.ordered_cols = _add_output_column(self.ordered_cols, column_sheet_names, CATEGORY_COLUMN)
+
+
+def _add_notice(notices, level, message):
+    if (level, message) not in notices:
+        notices.append((level, message))
+
+
+def _missing_columns_message(sheet_name, missing, stage_name):
+    columns = ", ".join(f"'{col}'" for col in missing)
+    return f"⚠️ Sheet {sheet_name} tidak punya kolom {columns}: {stage_name} dilewati."
+
+
+# Standardize Verified Account dan Setup Columns
+def _apply_column_setup(df_processed, setup):
+    # Standardize Verified Account
+    if "Verified Account" in df_processed.columns:
+        df_processed["Verified Account"] = (
+            df_processed["Verified Account"].astype(str).str.strip().str.lower().replace({"-": "no", "": "no", "nan": "no"})
+        )
+        df_processed["Verified Account"] = df_processed["Verified Account"].apply(lambda x: "Yes" if x == "yes" else "No")
+
+
+    for _, row in setup.column_setup.iterrows():
+        col = row["Target Column"]
+        ref_col = row["Reference Column"]
+        pos = row["Position"]
+        default = row["Default Value"] if pd.notna(row["Default Value"]) else ""
+
+        if col not in df_processed.columns:
+            # Jika kolom belum ada, tambahkan dan isi default
+            if ref_col in df_processed.columns:
+                ref_idx = df_processed.columns.get_loc(ref_col)
+                insert_at = ref_idx if pos == "before" else ref_idx + 1
+                df_processed.insert(loc=insert_at, column=col, value=default)
+            else:
+                df_processed[col] = default
+        else:
+            # Jika kolom sudah ada, isi semua nilai kosong / NaN dengan default
+            if isinstance(df_processed[col].dtype, pd.CategoricalDtype):
+                df_processed[col] = df_processed[col].astype(object)
+            df_processed[col] = df_processed[col].fillna("").replace("", default)
+    return df_processed
+
+
+# Column setup, official account, rules, gender, followers dan media tier untuk
+# satu DataFrame (seluruh raw data, atau satu chunk). summary_masks: list per pass
+# apply_rules untuk menampung (rule, mask) di summary, dipakai run cache.
+def _process_frame(df_processed, setup, apply_media_tier, media_tier_source, notices, profiler, summary_masks=None):
+    with profiler.stage("Column Setup", rows_in=len(df_processed)) as stage:
+        df_processed = _apply_column_setup(df_processed, setup)
+        stage.set_output(df_processed)
+
+    # Apply Official Account Logic dari setup sheet
+    with profiler.stage("Official Account", rows_in=len(df_processed)) as stage:
+        df_processed = setup.official_account.apply(df_processed)
+
+        # Bersihkan trailing .0 hanya untuk kolom 'Noise Tag' jika diperlukan
+        if "Noise Tag" in df_processed.columns and df_processed["Noise Tag"].notna().any():
+            try:
+                series_str = df_processed["Noise Tag"].astype(str)
+                if any(series_str.dropna().str.contains(r"\.0$", regex=True, na=False)):
+                    df_processed["Noise Tag"] = series_str.replace({r"\.0$": ""}, regex=True)
+            except Exception as e:
+                _add_notice(notices, "warning", f"⚠️ Gagal membersihkan kolom 'Noise Tag': {e}")
+        stage.set_output(df_processed)
+
+    # Apply untuk Noise Tag
+    with profiler.stage("Apply Rules - Noise Tag", rows_in=len(df_processed)) as stage:
+        df_processed, summary_df = apply_rules(
+            df=df_processed,
+            rules=setup.rule_plan,
+            output_column="Noise Tag",
+            source_output_column="Output Noise Tag",
+            profiler=profiler
+        )
+        if summary_masks is not None:
+            summary_masks[0].extend(setup.rule_plan.summary_masks())
+        stage.set_output(df_processed)
+
+    # Apply Gender Prediction
+    with profiler.stage("Gender Prediction", rows_in=len(df_processed)) as stage:
+        df_processed, gender_stats = fill_gender(df_processed)
+        stage.set_output(df_processed)
+
+    # Tambahkan ini untuk Issue
+    with profiler.stage("Apply Rules - Issue", rows_in=len(df_processed)) as stage:
+        df_processed, summary_df_issue = apply_rules(
+            df=df_processed,
+            rules=setup.rule_plan,
+            output_column="Issue",
+            source_output_column="Output Issue",
+            profiler=profiler
+        )
+        if summary_masks is not None:
+            summary_masks[1].extend(setup.rule_plan.summary_masks())
+        stage.set_output(df_processed)
+
+    with profiler.stage("Apply Rules - Sub Issue", rows_in=len(df_processed)) as stage:
+        df_processed, summary_df_sub_issue = apply_rules(
+            df=df_processed,
+            rules=setup.rule_plan,
+            output_column="Sub Issue",
+            source_output_column="Output Sub Issue",
+            profiler=profiler
+        )
+        if summary_masks is not None:
+            summary_masks[2].extend(setup.rule_plan.summary_masks())
+        setup.rule_plan.release()
+        stage.set_output(df_processed)
+
+    # === Hitung kolom Followers ===
+    if "Original Reach" in df_processed.columns and "Potential Reach" in df_processed.columns:
+        df_processed["Followers"] = df_processed["Original Reach"].fillna(0) + df_processed["Potential Reach"].fillna(0)
+
+    # Apply KOL Type if checked
+    if setup.kol_type is not None:
+        with profiler.stage("KOL Type", rows_in=len(df_processed)) as stage:
+            if "Followers" in df_processed.columns:
+                df_processed = setup.kol_type.apply(df_processed)
+            else:
+                _add_notice(notices, "warning", "⚠️ KOL Type tidak diisi: kolom 'Original Reach' / 'Potential Reach' tidak ada.")
+            stage.set_output(df_processed)
+
+    # Klasifikasi keyword (Method Selection)
+    if setup.keyword_category is not None:
+        with profiler.stage("Method 1 Keyword", rows_in=len(df_processed)) as stage:
+            df_processed = setup.keyword_category.apply(df_processed)
+            stage.set_output(df_processed)
+    elif setup.keyword_method is not None:
+        _add_notice(notices, "warning", f"⚠️ Method '{setup.keyword_method}' di sheet Method Selection belum didukung.")
+
+    # Apply Media Tier if checked
+    if apply_media_tier:
+        with profiler.stage("Media Tier", rows_in=len(df_processed)) as stage:
+            df_processed = apply_media_tier_logic(df_processed, media_tier_source)
+            stage.set_output(df_processed)
+
+    # Kolom output (Noise Tag, Issue, Chain Overwrite, dll.) jadi category kalau nilainya sedikit
+    df_processed = compact_text_dtypes(df_processed)
+    final_cols = [col for col in setup.ordered_cols if col in df_processed.columns]
+    df_final = df_processed[final_cols]
+
+    return df_processed, df_final, (summary_df, summary_df_issue, summary_df_sub_issue), gender_stats
+
+
+# Jumlah baris per Noise Tag (tanpa trailing .0), untuk Ringkasan Noise Tag
+def noise_tag_counts(df):
+    if "Noise Tag" not in df.columns:
+        return None
+    return df["Noise Tag"].astype(str).str.replace(r"\.0$", "", regex=True).value_counts()
+
+
+# Gabungkan summary dari beberapa chunk: Affected Rows dijumlahkan per rule,
+# urut sesuai posisi rule (index summary) seperti summary tanpa chunk
+def merge_summaries(summaries):
+    frames = [summary for summary in summaries if not summary.empty]
+    if not frames:
+        return pd.DataFrame()
+    columns = frames[0].columns
+    combined = pd.concat(frames)
+    # Rule dengan isi yang sama persis tetap dihitung sebagai baris terpisah (posisi rule berbeda)
+    keys = [combined.index.name] + [col for col in columns if col != "Affected Rows"]
+    merged = combined.reset_index().groupby(keys, dropna=False, sort=False)["Affected Rows"].sum().reset_index()
+    merged = merged.sort_values(combined.index.name, kind="stable").set_index(combined.index.name)
+    return merged[columns]
+
+
+# Noise Tag per baris (tanpa trailing .0), disimpan di RunSnapshot
+def _noise_values(df):
+    if "Noise Tag" not in df.columns:
+        return None
+    return df["Noise Tag"].astype(str).str.replace(r"\.0$", "", regex=True).to_numpy(dtype=object)
+
+
+def _media_tier_version(media_tier_source):
+    try:
+        loader = _media_tier_loader(media_tier_source)
+        loader.refresh()
+    except Exception as e:
+        raise PipelineError(f"❌ Gagal load file Media Tier dari Google Drive: {e}")
+    return loader.version
+
+
+# Key RunSnapshot: hasil per baris hanya dipakai ulang kalau project, isi sheet
+# setup, opsi, workbook Media Tier dan model gender sama
+def _run_key(project_name, sheets, keep_raw_data, apply_media_tier, apply_kol_type, media_tier_source):
+    parts = [project_name, keep_raw_data, apply_media_tier, apply_kol_type, model_fingerprint()]
+    parts += [frame_hash(sheets[sheet_name]) for sheet_name in SETUP_SHEETS]
+    if apply_kol_type and KOL_TYPE_SHEET in sheets:
+        parts.append(frame_hash(sheets[KOL_TYPE_SHEET]))
+    if apply_media_tier:
+        parts.append(_media_tier_version(media_tier_source))
+    return ("run", project_name, content_hash(repr(parts).encode("utf-8")))
+
+
+# Raw data, dari run cache kalau file dengan isi yang sama sudah pernah dibaca
+def _read_raw(raw_source, columns, run_cache):
+    if run_cache is None:
+        return read_raw_data(raw_source, columns=columns)
+    data = source_bytes(raw_source)
+    key = ("raw", content_hash(data), None if columns is None else tuple(sorted(columns)))
+    df_raw = run_cache.get(key)
+    if df_raw is None:
+        df_raw = read_raw_data(BytesIO(data), columns=columns)
+        run_cache.put(key, df_raw, int(df_raw.memory_usage(deep=True).sum()))
+    return df_raw.copy()
+
+
+# Gabungkan (rule, mask) baris lama dan baris baru satu pass, urut sesuai rule
+def _combine_masks(old_masks, new_masks, n_old, n_new, order):
+    rules = {}
+    for rule, _ in old_masks + new_masks:
+        rules.setdefault(rule.position, rule)
+    old = {rule.position: mask for rule, mask in old_masks}
+    new = {rule.position: mask for rule, mask in new_masks}
+
+    combined = []
+    for position in sorted(rules):
+        mask = np.concatenate([
+            old.get(position, np.zeros(n_old, dtype=bool)),
+            new.get(position, np.zeros(n_new, dtype=bool)),
+        ])
+        combined.append((rules[position], mask[order]))
+    return combined
+
+
+# === Incremental Run ===
+# Dengan run cache, baris yang sama persis (semua kolom, termasuk Link URL)
+# dengan baris di run sebelumnya untuk key yang sama tidak diproses ulang:
+# hasilnya diambil dari RunSnapshot. Hanya baris baru, mis. dari export yang
+# memperpanjang export sebelumnya, yang diproses (seperti satu chunk di
+# run_pipeline_chunked). Summary dihitung ulang dari mask per rule.
+def _process_incremental(df_processed, setup, run_key, run_cache, apply_media_tier, media_tier_source, notices, profiler):
+    with profiler.stage("Run Cache Lookup", rows_in=len(df_processed)) as stage:
+        columns = tuple(df_processed.columns)
+        hashes = row_hashes(df_processed)
+        snapshot = run_cache.get(run_key)
+        found = np.full(len(df_processed), -1, dtype=np.int64)
+        if snapshot is not None and snapshot.columns == columns:
+            found = snapshot.lookup(hashes)
+        old_rows = np.flatnonzero(found >= 0)
+        new_rows = np.flatnonzero(found < 0)
+        stage.rows_out = len(old_rows)
+
+    if len(old_rows) == 0:
+        masks = ([], [], [])
+        df_processed, df_final, summaries, gender_stats = _process_frame(
+            df_processed, setup, apply_media_tier, media_tier_source, notices, profiler, summary_masks=masks
+        )
+        noise = _noise_values(df_processed)
+    else:
+        snapshot_rows = found[old_rows]
+        df_final = snapshot.df_final.iloc[snapshot_rows]
+        noise = None if snapshot.noise is None else snapshot.noise[snapshot_rows]
+        masks = snapshot.masks_for(snapshot_rows)
+        gender_stats = {"Cache Hits": 0, "Cache Misses": 0}
+
+        if len(new_rows):
+            new_masks = ([], [], [])
+            frame, new_final, _, gender_stats = _process_frame(
+                df_processed.iloc[new_rows].reset_index(drop=True), setup, apply_media_tier, media_tier_source,
+                notices, profiler, summary_masks=new_masks
+            )
+            new_noise = _noise_values(frame)
+            del frame
+
+            # Baris lama dan baru dikembalikan ke urutan raw data
+            order = np.argsort(np.concatenate([old_rows, new_rows]), kind="stable")
+            df_final = pd.concat([df_final, new_final.reindex(columns=df_final.columns)], ignore_index=True).iloc[order]
+            noise = None if noise is None or new_noise is None else np.concatenate([noise, new_noise])[order]
+            masks = tuple(
+                _combine_masks(old, new, len(old_rows), len(new_rows), order) for old, new in zip(masks, new_masks)
+            )
+
+        df_final = compact_text_dtypes(df_final.reset_index(drop=True))
+        summaries = tuple(summary_for_rows(pass_masks) for pass_masks in masks)
+        df_processed = None
+        _add_notice(
+            notices, "info",
+            f"♻️ {len(old_rows)} baris sama dengan run sebelumnya (hasil dipakai ulang), {len(new_rows)} baris baru diproses"
+        )
+
+    with profiler.stage("Run Cache Store", rows_in=len(df_final)):
+        snapshot = RunSnapshot(columns, hashes, df_final, noise, masks)
+        run_cache.put(run_key, snapshot, snapshot.nbytes())
+
+    counts = None if noise is None else pd.Series(noise, name="Noise Tag").value_counts()
+    return df_processed, df_final, summaries, gender_stats, counts, len(old_rows)
+
+
+# Remove duplicate link pada link yang dinormalisasi (link_dedup): drop_duplicates
+# pada link standar. Hash link hanya dihitung untuk baris yang tersisa, untuk
+# seen_links (link chunk sebelumnya) dan seen_links_store (baris dengan link yang
+# sudah dikirim di export lain untuk project ini juga di-drop).
+# Return: df, jumlah baris duplikat, jumlah baris yang sudah dikirim
+def _remove_duplicate_links(df_processed, seen_links=None, seen_links_store=None, project_name=None, export=None):
+    rows, standard_links, is_url = unique_links(df_processed["Link URL"])
+    delivered_count = 0
+    if seen_links is not None or seen_links_store is not None:
+        hashes = hash_links(standard_links)
+        keep = np.ones(len(rows), dtype=bool) if seen_links is None else seen_links.first_seen_hashes(hashes, is_url)
+        if seen_links_store is not None:
+            delivered = keep & is_url & seen_links_store.delivered(project_name, hashes, export)
+            delivered_count = int(delivered.sum())
+            keep &= ~delivered
+        rows = rows[keep]
+    removed_count = len(df_processed) - len(rows) - delivered_count
+    return df_processed.iloc[rows].reset_index(drop=True), removed_count, delivered_count
+
+
+def _add_dedup_notices(notices, removed_count, delivered_count):
+    notices.insert(0, ("info", f"🔁 Removed {removed_count} duplicate rows based on 'Link URL'"))
+    if delivered_count:
+        notices.insert(1, ("info", f"📬 Removed {delivered_count} rows with links already delivered in earlier exports"))
+
+
+def _output_filename(project_name, output_ext):
+    tanggal_hari_ini = datetime.now().strftime("%Y-%m-%d")
+    return f"{project_name}_{tanggal_hari_ini}.{output_ext}"
+
+
+# Nama export untuk SeenLinksStore: export_name dari user, default nama file raw data
+def _export_name(raw_source, export_name):
+    if export_name:
+        return str(export_name)
+    name = raw_source if isinstance(raw_source, str) else getattr(raw_source, "name", None)
+    if not name:
+        raise PipelineError("❌ Nama export wajib diisi untuk menghapus link yang sudah dikirim di export sebelumnya.")
+    return os.path.basename(str(name))
+
+
+# === Pipeline ===
+# Seluruh proses untuk satu file raw data: column setup, official account,
+# rules, gender, followers, media tier, column order dan output file.
+# run_cache (RunCache): raw data, mask rule dan hasil per baris dipakai ulang
+# dari run sebelumnya; df_processed None kalau ada baris yang dipakai ulang.
+# rule_workers > 1: mask rule dievaluasi paralel di process pool (data besar).
+# seen_links_store (SeenLinksStore): dengan remove_duplicate_links, link yang
+# sudah dikirim di export lain project ini ikut di-drop. Export dikenali dari
+# export_name (default nama file raw data). Link export ini tidak dicatat di
+# sini: result.link_hashes dicatat pemanggil setelah hasilnya dikirim.
+def run_pipeline(
+    raw_source,
+    project_name,
+    sheets,
+    remove_duplicate_links=False,
+    keep_raw_data=False,
+    apply_media_tier=False,
+    apply_kol_type=False,
+    output_format="xlsx",
+    media_tier_source=None,
+    profiler=None,
+    run_cache=None,
+    rule_workers=None,
+    seen_links_store=None,
+    export_name=None,
+):
+    result = PipelineResult()
+    start_time = time.time()
+    profiler = profiler or DISABLED
+    setup = _ProjectSetup(project_name, sheets, keep_raw_data, apply_media_tier, run_cache, rule_workers, apply_kol_type)
+    result.notices.extend(setup.notices)
+
+    seen_links_store = seen_links_store if remove_duplicate_links else None
+    export = None
+    if seen_links_store is not None:
+        export = export_id(project_name, _export_name(raw_source, export_name))
+
+    # Workbook Media Tier di-download selama raw data dibaca
+    if apply_media_tier:
+        prefetch_media_tier_map(_media_tier_loader(media_tier_source))
+
+    with profiler.stage("Read Raw Data") as stage:
+        df_raw = _read_raw(raw_source, setup.raw_columns, run_cache)
+        if "Campaign" in df_raw.columns:
+            df_raw = df_raw.rename(columns={"Campaign": "Campaigns"})
+        df_processed = df_raw.copy()
+        stage.set_output(df_raw)
+
+    # Remove duplicate link
+    seen_links = None
+    if remove_duplicate_links and "Link URL" in df_processed.columns:
+        with profiler.stage("Remove Duplicate Link", rows_in=len(df_processed)) as stage:
+            # Link yang tersisa dikumpulkan hanya untuk dicatat di seen_links_store
+            seen_links = SeenLinks() if seen_links_store is not None else None
+            df_processed, removed_count, delivered_count = _remove_duplicate_links(
+                df_processed, seen_links, seen_links_store, project_name, export
+            )
+            stage.set_output(df_processed)
+        _add_dedup_notices(result.notices, removed_count, delivered_count)
+
+    if run_cache is None:
+        df_processed, df_final, summaries, gender_stats = _process_frame(
+            df_processed, setup, apply_media_tier, media_tier_source, result.notices, profiler
+        )
+        noise_counts = noise_tag_counts(df_processed)
+    else:
+        run_key = _run_key(project_name, sheets, keep_raw_data, apply_media_tier, apply_kol_type, media_tier_source)
+        df_processed, df_final, summaries, gender_stats, noise_counts, result.reused_rows = _process_incremental(
+            df_processed, setup, run_key, run_cache, apply_media_tier, media_tier_source, result.notices, profiler
+        )
+
+    # Save Output (langsung ke memory, tidak ada file yang ditulis ke disk)
+    #Jika keep raw data dan tidak keep raw data
+    with profiler.stage("Write Output", rows_in=len(df_final)) as stage:
+        output_sheets = []
+        if keep_raw_data:
+            output_sheets.append(("RAW Data", df_raw))
+        output_sheets.append(("Process Data", df_final))
+        output_data, output_ext, output_mime = write_output(output_sheets, output_format)
+
+    if seen_links is not None and seen_links_store is not None:
+        result.export, result.link_hashes = export, seen_links.url_hashes
+
+    result.df_raw = df_raw
+    result.df_processed = df_processed
+    result.df_final = df_final
+    result.summary_df = summaries[0]
+    # Gabungkan summary Noise Tag + Issue + Sub Issue
+    result.summary_combined = pd.concat(summaries, ignore_index=True)
+    result.noise_tag_counts = noise_counts
+    result.gender_stats = gender_stats
+    result.rows_in = len(df_raw)
+    result.rows_out = len(df_final)
+    result.output_data = output_data
+    result.output_filename = _output_filename(project_name, output_ext)
+    result.output_mime = output_mime
+    result.profile = profiler if profiler.enabled else None
+    result.duration_seconds = time.time() - start_time
+    return result
+
+
+# === Chunked Pipeline ===
+# Sama seperti run_pipeline, tapi raw data diproses per chunk_size baris dan
+# setiap chunk langsung ditulis ke output, jadi pemakaian memori ditentukan
+# oleh chunk_size, bukan ukuran file. output: file-like / path tujuan; kalau
+# None, hasil disimpan di result.output_data. df_raw, df_processed dan
+# df_final tidak disimpan di result.
+def run_pipeline_chunked(
+    raw_source,
+    project_name,
+    sheets,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    remove_duplicate_links=False,
+    keep_raw_data=False,
+    apply_media_tier=False,
+    apply_kol_type=False,
+    output_format="xlsx",
+    media_tier_source=None,
+    output=None,
+    profiler=None,
+    rule_workers=None,
+    seen_links_store=None,
+    export_name=None,
+):
+    result = PipelineResult()
+    start_time = time.time()
+    profiler = profiler or DISABLED
+    setup = _ProjectSetup(
+        project_name, sheets, keep_raw_data, apply_media_tier, rule_workers=rule_workers, apply_kol_type=apply_kol_type
+    )
+    result.notices.extend(setup.notices)
+    if apply_media_tier:
+        prefetch_media_tier_map(_media_tier_loader(media_tier_source))
+
+    target = BytesIO() if output is None else output
+    close_target = isinstance(target, str)
+    if close_target:
+        target = open(target, "wb")
+
+    seen_links_store = seen_links_store if remove_duplicate_links else None
+    export = None
+    if seen_links_store is not None:
+        export = export_id(project_name, _export_name(raw_source, export_name))
+
+    seen_links = SeenLinks()
+    removed_count = None
+    delivered_count = 0
+    summaries = ([], [], [])
+    gender_stats = {"Cache Hits": 0, "Cache Misses": 0}
+    noise_counts = None
+    final_cols = None
+    rows_in = rows_out = 0
+
+    try:
+        writer = OutputWriter(target, output_format)
+        chunks = iter_raw_data(raw_source, chunk_size, columns=setup.raw_columns)
+        while True:
+            with profiler.stage("Read Raw Data") as stage:
+                df_raw = next(chunks, None)
+                if df_raw is not None:
+                    if "Campaign" in df_raw.columns:
+                        df_raw = df_raw.rename(columns={"Campaign": "Campaigns"})
+                    stage.set_output(df_raw)
+            if df_raw is None:
+                break
+            rows_in += len(df_raw)
+            df_processed = df_raw.copy()
+
+            # Remove duplicate link, juga terhadap link di chunk sebelumnya
+            if remove_duplicate_links and "Link URL" in df_processed.columns:
+                with profiler.stage("Remove Duplicate Link", rows_in=len(df_processed)) as stage:
+                    df_processed, chunk_removed, chunk_delivered = _remove_duplicate_links(
+                        df_processed, seen_links, seen_links_store, project_name, export
+                    )
+                    removed_count = (removed_count or 0) + chunk_removed
+                    delivered_count += chunk_delivered
+                    stage.set_output(df_processed)
+
+            df_processed, df_final, chunk_summaries, chunk_gender_stats = _process_frame(
+                df_processed, setup, apply_media_tier, media_tier_source, result.notices, profiler
+            )
+            for collected, summary in zip(summaries, chunk_summaries):
+                collected.append(summary)
+            for key in gender_stats:
+                gender_stats[key] += chunk_gender_stats[key]
+            counts = noise_tag_counts(df_processed)
+            if counts is not None:
+                noise_counts = counts if noise_counts is None else noise_counts.add(counts, fill_value=0)
+
+            # Semua chunk memakai urutan kolom dari chunk pertama
+            if final_cols is None:
+                final_cols = list(df_final.columns)
+            with profiler.stage("Write Output", rows_in=len(df_final)) as stage:
+                if keep_raw_data:
+                    writer.write("RAW Data", df_raw)
+                writer.write("Process Data", df_final.reindex(columns=final_cols))
+            rows_out += len(df_final)
+            del df_raw, df_processed, df_final
+
+        if final_cols is None:
+            # File tanpa baris data: tetap tulis sheet kosong
+            empty = pd.DataFrame(columns=setup.ordered_cols)
+            if keep_raw_data:
+                writer.write("RAW Data", empty)
+            writer.write("Process Data", empty)
+        with profiler.stage("Write Output"):
+            output_ext, output_mime = writer.close()
+    finally:
+        if close_target:
+            target.close()
+
+    if removed_count is not None:
+        _add_dedup_notices(result.notices, removed_count, delivered_count)
+        if seen_links_store is not None:
+            result.export, result.link_hashes = export, seen_links.url_hashes
+
+    result.summary_df = merge_summaries(summaries[0])
+    result.summary_combined = pd.concat(
+        [merge_summaries(collected) for collected in summaries], ignore_index=True
+    )
+    if noise_counts is not None:
+        result.noise_tag_counts = noise_counts.astype(int).sort_values(ascending=False, kind="stable")
+    result.gender_stats = gender_stats
+    result.rows_in = rows_in
+    result.rows_out = rows_out
+    if output is None:
+        result.output_data = target.getvalue()
+    result.output_filename = _output_filename(project_name, output_ext)
+    result.output_mime = output_mime
+    result.profile = profiler if profiler.enabled else None
+    result.duration_seconds = time.time() - start_time
+    return result
@@ -0,0 +1,178 @@
+import json
+import os
+import resource
+import sys
+import threading
+import time
+
+import pandas as pd
+
+# === Profiling ===
+# Waktu, jumlah baris dan peak memory per stage pipeline, plus waktu per rule di
+# apply_rules. Profiler(enabled=False) tidak mengukur apa pun, jadi pipeline bisa
+# selalu memanggil profiler.stage() tanpa overhead berarti. Peak memory adalah
+# peak RSS proses selama stage: dari ru_maxrss kalau peak proses naik di stage
+# itu, selain itu dari sampling RSS di background thread (track_memory).
+# Frame MB adalah perkiraan memori DataFrame hasil stage (stage.set_output).
+# Stage dengan nama yang sama (mis. per chunk) dijumlahkan.
+
+
+# RSS proses saat ini dalam byte; None kalau /proc tidak tersedia (mis. macOS)
+def _current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Peak RSS proses sejak start dalam byte (ru_maxrss: KB di Linux, byte di macOS)
+def _max_rss():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+# Perkiraan memori DataFrame dalam byte. String di kolom object dihitung dari
+# sampel baris; memory_usage(deep=True) terlalu lambat untuk setiap stage.
+def frame_nbytes(df, sample_rows=1000):
+    total = int(df.memory_usage(index=True, deep=False).sum())
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if series.dtype == object and len(series):
+            sample = series.iloc[::max(1, len(series) // sample_rows)]
+            total += int(sum(map(sys.getsizeof, sample)) / len(sample) * len(series))
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            total += int(series.cat.categories.memory_usage(deep=True))
+    return total
+
+
+class _Stage:
+    def __init__(self, profiler, name, rows_in=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.frame = None
+        self._start = None
+
+    # Jumlah baris dan DataFrame hasil stage (untuk Frame MB)
+    def set_output(self, df):
+        self.rows_out = len(df)
+        self.frame = df
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            if self.profiler.track_memory:
+                self._max_rss = _max_rss()
+                self.profiler._sampled_peak = _current_rss() or 0
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._start is not None:
+            seconds = time.perf_counter() - self._start
+            peak = None
+            if self.profiler.track_memory:
+                max_rss = _max_rss()
+                if max_rss > self._max_rss:
+                    peak = max_rss
+                else:
+                    peak = max(self.profiler._sampled_peak, _current_rss() or 0) or None
+            frame_bytes = frame_nbytes(self.frame) if self.frame is not None else None
+            self.profiler._add_stage(self.name, seconds, self.rows_in, self.rows_out, peak, frame_bytes)
+        self.frame = None
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled=True, track_memory=True, sample_interval=0.01):
+        self.enabled = enabled
+        self.track_memory = enabled and track_memory
+        self.sample_interval = sample_interval
+        self.stages = {}    # nama stage -> dict hasil ukur, urut sesuai pertama kali dijalankan
+        self.rules = {}     # posisi rule -> dict hasil ukur
+        self._sampled_peak = 0
+        self._sampler = None
+        self._stopped = threading.Event()
+
+    def _sample(self):
+        while not self._stopped.wait(self.sample_interval):
+            rss = _current_rss()
+            if rss is None:
+                return
+            self._sampled_peak = max(self._sampled_peak, rss)
+
+    def start(self):
+        if self.track_memory and self._sampler is None:
+            self._stopped.clear()
+            self._sampler = threading.Thread(target=self._sample, name="profiler-rss", daemon=True)
+            self._sampler.start()
+        return self
+
+    def stop(self):
+        if self._sampler is not None:
+            self._stopped.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def stage(self, name, rows_in=None):
+        return _Stage(self, name, rows_in)
+
+    def _add_stage(self, name, seconds, rows_in, rows_out, peak, frame_bytes=None):
+        record = self.stages.setdefault(name, {
+            "Stage": name, "Calls": 0, "Seconds": 0.0, "Rows In": None, "Rows Out": None, "Peak RSS (MB)": None,
+            "Frame MB": None,
+        })
+        record["Calls"] += 1
+        record["Seconds"] += seconds
+        if rows_in is not None:
+            record["Rows In"] = (record["Rows In"] or 0) + rows_in
+        if rows_out is not None:
+            record["Rows Out"] = (record["Rows Out"] or 0) + rows_out
+        if peak is not None:
+            record["Peak RSS (MB)"] = max(record["Peak RSS (MB)"] or 0, peak / 2 ** 20)
+        if frame_bytes is not None:
+            record["Frame MB"] = max(record["Frame MB"] or 0, frame_bytes / 2 ** 20)
+
+    # Satu evaluasi mask rule (hasil cache dari pass sebelumnya tidak dihitung lagi)
+    def add_rule(self, rule, seconds, affected_rows):
+        record = self.rules.get(rule.position)
+        if record is None:
+            record = self.rules[rule.position] = {
+                "Priority": rule.priority,
+                "Matching Column": rule.column,
+                "Matching Value": rule.value,
+                "Matching Type": rule.match_type,
+                "Channel": rule.channel,
+                "Evaluations": 0,
+                "Seconds": 0.0,
+                "Affected Rows": 0,
+            }
+        record["Evaluations"] += 1
+        record["Seconds"] += seconds
+        record["Affected Rows"] += int(affected_rows)
+
+    def stage_report(self):
+        report = pd.DataFrame(list(self.stages.values()))
+        if not report.empty:
+            report = report.astype({"Rows In": "Int64", "Rows Out": "Int64"})
+        return report
+
+    # Rule paling lambat di atas
+    def rule_report(self):
+        report = pd.DataFrame(list(self.rules.values()))
+        if report.empty:
+            return report
+        return report.sort_values("Seconds", ascending=False, kind="stable").reset_index(drop=True)
+
+    def to_dict(self):
+        def records(df):
+            return json.loads(df.to_json(orient="records"))
+        return {"stages": records(self.stage_report()), "rules": records(self.rule_report())}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+
+# Dipakai kalau pemanggil tidak memberikan profiler
+DISABLED = Profiler(enabled=False)
@@ -0,0 +1,193 @@
+from datetime import date, time, timedelta
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+# Kolom raw data yang selalu dipakai oleh pipeline (gender, media tier, followers, dll.)
+PIPELINE_COLUMNS = {
+    "Author", "Gender", "Channel", "Media Name", "Ad Value", "Verified Account",
+    "Link URL", "Original Reach", "Potential Reach", "Campaign", "Campaigns",
+    "Noise Tag", "Official Account", "Media Tier", "KOL Type", "Category",
+}
+CATEGORY_COLUMNS = ["Channel", "Media Name", "Verified Account"]
+NUMERIC_COLUMNS = ["Original Reach", "Potential Reach", "Ad Value"]
+
+# Kolom teks lain jadi category kalau jumlah nilai uniknya paling banyak sekian
+# dari jumlah baris; dicek dulu pada sampel baris pertama
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+CATEGORY_SAMPLE_ROWS = 10000
+
+
+# Fastest engine available; calamine (python-calamine) parses xlsx much faster than openpyxl
+def excel_engines():
+    engines = []
+    try:
+        import python_calamine  # noqa: F401
+        engines.append("calamine")
+    except ImportError:
+        pass
+    engines.append("openpyxl")
+    return engines
+
+
+def _split_matching_column(col):
+    if not isinstance(col, str):
+        return []
+    return [p.strip() for p in col.split("+")]
+
+
+# Columns of the raw export that the project's setup sheets actually reference
+def required_raw_columns(project_name, df_column_order, df_column_setup, df_rules, df_official_account_setup):
+    columns = set(PIPELINE_COLUMNS)
+
+    column_order = df_column_order[df_column_order["Project"].isin([project_name, "Default"])]
+    columns.update(column_order["Column Name"].dropna())
+
+    column_setup = df_column_setup[df_column_setup["Project"].isin([project_name, "Default"])]
+    columns.update(column_setup["Target Column"].dropna())
+    columns.update(column_setup["Reference Column"].dropna())
+
+    rules = df_rules.rename(columns=lambda c: c.strip())
+    rules = rules[rules["Project"].isin([project_name, "Default"])]
+    for col in rules["Matching Column"]:
+        columns.update(_split_matching_column(col))
+
+    official = df_official_account_setup.rename(columns=lambda c: c.strip())
+    columns.update(official.loc[official["Project"] == project_name, "Matching Column"].dropna())
+    return columns
+
+
+# Category only keeps values apart that are never equal to each other: text and
+# integers, with NaN as the only missing value (1 / 1.0 / True, or None / NaT
+# would be merged)
+def _categorical_safe(values, is_null):
+    for value_type in set(map(type, values[~is_null])):
+        if not issubclass(value_type, (str, int, np.integer)) or issubclass(value_type, (bool, np.bool_)):
+            return False
+    return set(map(type, values[is_null])) <= {float}
+
+
+# Object columns with few distinct values -> category: one small integer code per
+# row instead of a pointer, and every distinct value stored once. Values, and so
+# the written output, stay the same.
+def compact_text_dtypes(df, max_unique_ratio=CATEGORY_MAX_UNIQUE_RATIO):
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if series.dtype != object or len(series) == 0:
+            continue
+        sample = series.iloc[:CATEGORY_SAMPLE_ROWS]
+        if sample.nunique() > max_unique_ratio * len(sample):
+            continue
+        values = series.to_numpy()
+        is_null = pd.isna(values)
+        if not _categorical_safe(values, is_null):
+            continue
+        categorical = pd.Categorical(values)
+        if len(categorical.categories) <= max_unique_ratio * len(series):
+            df.isetitem(i, categorical)
+    return df
+
+
+# Compact dtypes: categoricals for low-cardinality text, numbers for reach / Ad Value.
+# A column is only converted to numeric when no existing value would be lost.
+def compact_raw_dtypes(df):
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype("category")
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            numeric = pd.to_numeric(df[col], errors="coerce")
+            if numeric.notna().sum() == df[col].notna().sum():
+                df[col] = numeric
+    return compact_text_dtypes(df)
+
+
+# Isi file raw data: file-like (mis. upload Streamlit) atau path
+def source_bytes(source):
+    if hasattr(source, "read"):
+        return source.read()
+    with open(source, "rb") as f:
+        return f.read()
+
+
+# === Read Raw Data ===
+# columns=None membaca semua kolom (dibutuhkan untuk Keep RAW Data)
+def read_raw_data(source, columns=None, engine=None):
+    data = source_bytes(source)
+    usecols = None if columns is None else (lambda c: c in columns)
+
+    engines = [engine] if engine else excel_engines()
+    for i, name in enumerate(engines):
+        try:
+            df = pd.read_excel(BytesIO(data), sheet_name=0, engine=name, usecols=usecols)
+            break
+        except (ImportError, ValueError):
+            # Engine tidak didukung versi pandas ini; pakai engine berikutnya
+            if i == len(engines) - 1:
+                raise
+    return compact_raw_dtypes(df)
+
+
+# Same cell conversion as pandas' openpyxl reader
+def _convert_openpyxl_cell(cell):
+    if cell.value is None:
+        return ""
+    if cell.data_type == "e":
+        return float("nan")
+    if cell.data_type == "n" and not isinstance(cell.value, (date, time, timedelta)):
+        return int(cell.value) if int(cell.value) == cell.value else float(cell.value)
+    return cell.value
+
+
+# Rows of the first sheet, one list per row. openpyxl read-only mode reads the
+# sheet XML while iterating, so only the current chunk is in memory (calamine
+# always loads the whole sheet first). source: path or file-like.
+def _iter_sheet_rows(source):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # Dimensi sheet dari exporter bisa salah; baca semua cell yang ada
+        sheet.reset_dimensions()
+        for row in sheet.rows:
+            yield [_convert_openpyxl_cell(cell) for cell in row]
+    finally:
+        workbook.close()
+
+
+# === Read Raw Data per Chunk ===
+# Sama seperti read_raw_data, tapi menghasilkan DataFrame per chunk_size baris.
+# File di-stream (bukan dibaca ke memori dulu), jadi memori dibatasi chunk_size.
+# Tipe kolom ditentukan per chunk (pandas TextParser yang sama dengan read_excel).
+def iter_raw_data(source, chunk_size, columns=None):
+    usecols = None if columns is None else (lambda c: c in columns)
+    rows = _iter_sheet_rows(source)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    def parse(chunk):
+        # Baris yang lebih pendek / panjang dari header disamakan lebarnya
+        chunk = [(row + [""] * (len(header) - len(row)))[:len(header)] for row in chunk]
+        df = TextParser([header] + chunk, header=0, usecols=usecols, skip_blank_lines=False).read()
+        return compact_raw_dtypes(df)
+
+    chunk = []
+    blank = []
+    for row in rows:
+        # Baris kosong di akhir sheet di-skip seperti read_excel; baris kosong
+        # di tengah tetap ikut
+        if all(value == "" for value in row):
+            blank.append(row)
+            continue
+        for pending in blank + [row]:
+            chunk.append(pending)
+            if len(chunk) == chunk_size:
+                yield parse(chunk)
+                chunk = []
+        blank = []
+    if chunk:
+        yield parse(chunk)
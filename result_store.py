@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from functools import lru_cache
+
+from output_writer import parquet_table
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULT_STORE_DIR = os.path.join(BASE_DIR, ".cache/results")
+
+# Batas total ukuran hasil yang disimpan di disk
+RESULT_STORE_MAX_BYTES = 2 * 1024**3
+
+META_FILE = "meta.json"
+
+
+def _dir_nbytes(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+# === Result Store ===
+# Hasil satu run disimpan di disk, satu folder per result id: tabel report
+# sebagai Parquet, file output apa adanya, dan meta.json (notices, durasi, dll.).
+# Streamlit cukup menyimpan result id di session state; rerun membaca dari sini
+# tanpa memproses ulang. query() mengembalikan satu halaman tabel (filter, sort,
+# offset/limit dengan pyarrow), jadi browser hanya menerima baris yang tampil.
+# Result yang paling lama tidak dibuka dihapus ketika total ukurannya melewati
+# max_bytes.
+class ResultStore:
+    def __init__(self, directory=RESULT_STORE_DIR, max_bytes=RESULT_STORE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, result_id, name=None):
+        # result id selalu uuid hex, jadi tidak bisa keluar dari folder store
+        path = os.path.join(self.directory, uuid.UUID(hex=result_id).hex)
+        return path if name is None else os.path.join(path, name)
+
+    # tables: {nama: DataFrame}, files: {nama: bytes}, meta: dict yang bisa di-JSON-kan
+    def put(self, tables, files=None, meta=None):
+        import pyarrow.parquet as pq
+
+        result_id = uuid.uuid4().hex
+        path = self._path(result_id)
+        os.makedirs(path)
+        for name, df in tables.items():
+            pq.write_table(parquet_table(df), self._path(result_id, f"{name}.parquet"))
+        for name, data in (files or {}).items():
+            with open(self._path(result_id, name), "wb") as f:
+                f.write(data)
+        meta = dict(meta or {}, tables=list(tables), files=list(files or {}), created=time.time())
+        with open(self._path(result_id, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+        self._evict(keep=result_id)
+        return result_id
+
+    def exists(self, result_id):
+        try:
+            return os.path.exists(self._path(result_id, META_FILE))
+        except ValueError:
+            return False
+
+    # meta.json; membuka result juga menandai result terakhir dipakai (LRU)
+    def meta(self, result_id):
+        path = self._path(result_id, META_FILE)
+        os.utime(path)
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def file(self, result_id, name):
+        with open(self._path(result_id, name), "rb") as f:
+            return f.read()
+
+    # Nilai unik satu kolom (untuk pilihan filter)
+    def values(self, result_id, table_name, column):
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        values = pq.read_table(self._path(result_id, f"{table_name}.parquet"), columns=[column])[column]
+        return sorted(v for v in pc.unique(values).to_pylist() if v is not None)
+
+    # Satu halaman tabel: equals {kolom: nilai}, search (substring, case-insensitive)
+    # di search_columns, sort_by [(kolom, "ascending" / "descending")].
+    # Returns (DataFrame halaman, jumlah baris setelah filter).
+    def query(self, result_id, table_name, equals=None, search=None, search_columns=(), sort_by=None,
+              offset=0, limit=50):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(self._path(result_id, f"{table_name}.parquet"))
+        mask = None
+        for column, value in (equals or {}).items():
+            condition = pc.equal(table[column], pa.scalar(value, table.schema.field(column).type))
+            mask = condition if mask is None else pc.and_(mask, condition)
+        if search:
+            matches = [
+                pc.match_substring(table[column].cast(pa.string()), search, ignore_case=True)
+                for column in search_columns
+            ]
+            if matches:
+                condition = matches[0]
+                for match in matches[1:]:
+                    condition = pc.or_(condition, match)
+                mask = condition if mask is None else pc.and_(mask, condition)
+        if mask is not None:
+            table = table.filter(pc.fill_null(mask, False))
+        if sort_by:
+            table = table.sort_by(sort_by)
+        return table.slice(offset, limit).to_pandas(), table.num_rows
+
+    def delete(self, result_id):
+        with self._lock:
+            shutil.rmtree(self._path(result_id), ignore_errors=True)
+
+    def _evict(self, keep=None):
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                meta_path = os.path.join(entry.path, META_FILE)
+                if entry.is_dir() and os.path.exists(meta_path):
+                    entries.append((os.path.getmtime(meta_path), entry.name, _dir_nbytes(entry.path)))
+            total = sum(nbytes for _, _, nbytes in entries)
+            for _, name, nbytes in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+                total -= nbytes
+
+
+@lru_cache(maxsize=1)
+def get_result_store():
+    return ResultStore()
@@ -0,0 +1,825 @@
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher, contains_index
+from run_cache import frame_hash, pack_mask, unpack_mask
+
+# Batas memori series turunan per run (lowercase, keyword index, word count)
+COLUMN_CACHE_MAX_BYTES = 512 * 2**20
+
+# Evaluasi paralel: minimal baris per blok; data lebih kecil dievaluasi serial
+PARALLEL_MIN_BLOCK_ROWS = 20000
+
+
+# === Rule Engine ===
+# Sheet "Rules" di-parse sekali menjadi CompiledRules (matcher, filter channel,
+# priority dan output per rule). apply_rules lalu mengevaluasi semua rule satu
+# kali per dataset dan me-resolve priority untuk semua kolom Output sekaligus.
+# Dengan mask_cache (RunCache), mask per rule disimpan dengan key hash isi
+# kolom yang dibaca + matcher rule, jadi run berikutnya dengan data yang sama
+# hanya mengevaluasi rule yang baru atau berubah.
+# Rule yang Matching Column-nya kolom output (mis. "Issue equals Harga") membaca
+# nilai yang ditulis rule sebelumnya di pass yang sama; kalau ada, pass tersebut
+# dijalankan berurutan per rule seperti aslinya (lihat _apply_sequential).
+
+
+class CompiledRule:
+    def __init__(self, position, column, value, match_type, priority, channel, outputs, matcher):
+        self.position = position      # urutan rule setelah sort Priority (descending)
+        self.column = column          # "Matching Column" apa adanya, termasuk bentuk "col1+col2"
+        self.value = value
+        self.match_type = match_type
+        self.priority = priority
+        self.channel = channel
+        self.outputs = outputs        # [(nama kolom output, nilai output)] yang terisi
+        self.matcher = matcher        # hasil parse "Matching Value", None jika rule di-skip
+
+
+# Parse "Matching Value" of a contains rule into clauses of (negate, terms).
+# A clause matches when any of its terms is found; all clauses must match.
+def _parse_contains(val):
+    if "+" not in val:
+        if val.startswith("!"):
+            return ((True, (val[1:],)),)
+        return ((False, (val,)),)
+
+    clauses = []
+    for v in val.split("+"):
+        v = v.strip()
+        if "|" in v:
+            # re.escape does not escape "!", so "!" inside an "|" group has
+            # always been matched literally.
+            clauses.append((False, tuple(x.strip() for x in v.split("|"))))
+        elif v.startswith("!"):
+            clauses.append((True, (v[1:],)))
+        else:
+            clauses.append((False, (v,)))
+    return tuple(clauses)
+
+
+def _parse_matcher(match_type, val):
+    if match_type == "contains":
+        if not isinstance(val, str):
+            if pd.isna(val):
+                return None
+            val = str(val)
+        return ("contains", _parse_contains(val))
+    elif match_type == "equals":
+        return ("equals", val)
+    elif match_type in ("greater_than", "less_than"):
+        try:
+            return (match_type, float(val))
+        except ValueError:
+            return None
+    elif match_type == "count_contains":
+        try:
+            keyword, constraint = val.split(":")
+            keyword = re.escape(keyword.strip())
+            constraint = constraint.strip()
+            if "max=" in constraint:
+                return ("count_contains", keyword, "max", int(constraint.replace("max=", "").strip()))
+            elif "min=" in constraint:
+                return ("count_contains", keyword, "min", int(constraint.replace("min=", "").strip()))
+            return None
+        except Exception as e:
+            print(f"⚠️ Error parsing count_contains rule: {val} - {e}")
+            return None
+    return None
+
+
+class CompiledRules:
+    def __init__(self, rules):
+        rules.columns = rules.columns.str.strip()
+        rules_sorted = rules.sort_values(by="Priority", ascending=False)
+
+        self.output_columns = [col for col in rules.columns if col.startswith("Output ")]
+        self.rules = []
+        for position, (_, rule) in enumerate(rules_sorted.iterrows()):
+            outputs = []
+            for output_col in self.output_columns:
+                out_val = rule.get(output_col)
+                if pd.notna(out_val):
+                    outputs.append((output_col.replace("Output ", ""), out_val))
+            match_type = rule["Matching Type"]
+            val = rule["Matching Value"]
+            self.rules.append(CompiledRule(
+                position=position,
+                column=rule["Matching Column"],
+                value=val,
+                match_type=match_type,
+                priority=rule["Priority"],
+                channel=rule.get("Channel", ""),
+                outputs=outputs,
+                matcher=_parse_matcher(match_type, val),
+            ))
+
+        # Semua keyword "contains" per Matching Column, untuk satu KeywordMatcher per kolom
+        self.keywords = {}
+        for rule in self.rules:
+            if rule.matcher is not None and rule.matcher[0] == "contains":
+                keywords = self.keywords.setdefault(rule.column, set())
+                for _, terms in rule.matcher[1]:
+                    keywords.update(terms)
+
+        # Keyword count_contains per Matching Column, untuk satu word-count index per kolom
+        self.count_keywords = {}
+        for rule in self.rules:
+            if rule.matcher is not None and rule.matcher[0] == "count_contains":
+                self.count_keywords.setdefault(rule.column, set()).add(rule.matcher[1])
+
+        # Nama kolom yang ditulis rules
+        self.output_names = {col.replace("Output ", "") for col in self.output_columns}
+
+        # Hasil evaluasi terakhir, dipakai ulang selama kolom yang dibaca rule tidak berubah
+        self._state = None
+        self.mask_cache = None
+        self.workers = 1      # > 1: mask rule dievaluasi paralel per blok baris
+
+    def release(self):
+        self._state = None
+
+    # (rule, mask) untuk setiap rule di summary apply_rules terakhir
+    def summary_masks(self):
+        if self._state is None:
+            return []
+        return self._state.summary_masks
+
+    # Posisi rule yang membaca kolom yang ditulis di pass untuk output_column
+    def chained_positions(self, output_column):
+        written = self.output_names | {output_column}
+        return {
+            rule.position for rule in self.rules
+            if rule.outputs and rule.matcher is not None and set(_column_parts(rule.column)) & written
+        }
+
+
+def compile_rules(rules):
+    return CompiledRules(rules)
+
+
+def _column_parts(col):
+    if not isinstance(col, str):
+        return []
+    return [p.strip() for p in col.split("+")] if "+" in col else [col]
+
+
+# Build the text series a rule matches against ("col1+col2" joins the columns).
+# texts: astype(str) per kolom untuk pass ini; joined: hasil gabungan dari pass
+# sebelumnya, dipakai ulang selama teks kolom-kolomnya tidak berubah.
+def _matching_series(df, col, texts, joined):
+    parts = _column_parts(col)
+    if not parts or not all(p in df.columns for p in parts):
+        return None
+    part_texts = []
+    for p in parts:
+        if p not in texts:
+            texts[p] = df[p].astype(str)
+        part_texts.append(texts[p])
+    if len(parts) == 1:
+        return part_texts[0]
+
+    previous = joined.get(col)
+    if previous is not None and all(_same_series(a, b) for a, b in zip(previous[0], part_texts)):
+        return previous[1]
+    series = part_texts[0]
+    for text in part_texts[1:]:
+        series = series + "+" + text
+    joined[col] = (part_texts, series)
+    return series
+
+
+def _same_series(a, b):
+    if a is None or b is None:
+        return a is None and b is None
+    return a is b or a.equals(b)
+
+
+# Perkiraan memori series teks: isi string + object overhead + pointer
+def _text_nbytes(series):
+    return int(series.str.len().sum()) + 57 * len(series)
+
+
+_WORD = re.compile(r"\w+")
+
+
+# Word-count index: occurrences of every single-word, lowercase keyword per row,
+# equal to str.count(rf"\b{keyword}\b"). Candidate rows come from one substring
+# scan (KeywordMatcher); only those rows are tokenized, in one regex pass for
+# all keywords. Other keywords are not in the index.
+def _word_counts(lowered, keywords):
+    words = sorted(k for k in keywords if _WORD.fullmatch(k) and k == k.lower())
+    if not words:
+        return {}
+    hits = KeywordMatcher(words).match(lowered)
+    candidates = np.unique(np.concatenate([hits[word] for word in words]))
+
+    counts = {word: np.zeros(len(lowered), dtype=np.int64) for word in words}
+    if len(candidates):
+        pattern = r"\b(?:" + "|".join(words) + r")\b"
+        found = lowered.iloc[candidates].str.findall(pattern).to_numpy()
+        lengths = np.fromiter((len(x) for x in found), dtype=np.int64, count=len(found))
+        rows = np.repeat(candidates, lengths)
+        codes = pd.Categorical(list(chain.from_iterable(found)), categories=words).codes
+        for code, word in enumerate(words):
+            counts[word] = np.bincount(rows[codes == code], minlength=len(lowered))
+    return counts
+
+
+# Derived data for one matching column, shared by every rule that reads it.
+# Lowercase series, keyword index dan word count bisa dilepas (drop_derived)
+# saat memori melewati batas; dibangun ulang kalau dibutuhkan lagi.
+class _ColumnState:
+    def __init__(self, series, keywords=(), count_keywords=()):
+        self.series = series
+        self.keywords = keywords
+        self.count_keywords = count_keywords
+        self.lowered = None
+        self.numeric = None
+        self.keyword_index = None
+        self.clauses = {}
+        self.counts = None
+        self.masks = {}
+        self.nbytes = 0               # perkiraan memori data turunan
+        self.last_used = 0
+        self.prepare_seconds = 0.0    # waktu membangun series, dihitung ke rule pertama yang memakainya
+        self._digest = None
+
+    # Hash isi series, key untuk mask cache
+    def digest(self):
+        if self._digest is None:
+            self._digest = frame_hash(self.series)
+        return self._digest
+
+    def lower(self):
+        if self.lowered is None:
+            self.lowered = self.series.str.lower()
+            self.nbytes += _text_nbytes(self.lowered)
+        return self.lowered
+
+    def drop_derived(self):
+        self.lowered = None
+        self.numeric = None
+        self.keyword_index = None
+        self.clauses = {}
+        self.counts = None
+        self.nbytes = 0
+
+    def clause_mask(self, negate, terms):
+        key = (negate, terms)
+        if key not in self.clauses:
+            if self.keyword_index is None:
+                self.keyword_index = contains_index(self.series, self.keywords)
+                self.nbytes += sum(rows.nbytes for rows in self.keyword_index.values())
+            mask = np.zeros(len(self.series), dtype=bool)
+            for term in terms:
+                mask[self.keyword_index[term]] = True
+            self.clauses[key] = ~mask if negate else mask
+            self.nbytes += mask.nbytes
+        return self.clauses[key]
+
+    def word_count(self, keyword):
+        if self.counts is None:
+            self.counts = _word_counts(self.lower(), self.count_keywords)
+            self.nbytes += sum(counts.nbytes for counts in self.counts.values())
+        if keyword not in self.counts:
+            self.counts[keyword] = self.lower().str.count(rf"\b{keyword}\b").to_numpy()
+            self.nbytes += self.counts[keyword].nbytes
+        return self.counts[keyword]
+
+    def rule_mask(self, matcher):
+        kind = matcher[0]
+        if kind == "contains":
+            masks = [self.clause_mask(negate, terms) for negate, terms in matcher[1]]
+            return np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
+        elif kind == "equals":
+            return (self.series == matcher[1]).to_numpy(dtype=bool)
+        elif kind in ("greater_than", "less_than"):
+            if self.numeric is None:
+                self.numeric = pd.to_numeric(self.series, errors="coerce")
+                self.nbytes += self.numeric.nbytes
+            if kind == "greater_than":
+                return (self.numeric > matcher[1]).to_numpy(dtype=bool)
+            return (self.numeric < matcher[1]).to_numpy(dtype=bool)
+        elif kind == "count_contains":
+            _, keyword, bound, limit = matcher
+            counts = self.word_count(keyword)
+            if bound == "max":
+                return counts <= limit
+            return counts >= limit
+
+
+def _mask_cache_key(column_state, rule):
+    return ("mask", column_state.digest(), repr(rule.matcher))
+
+
+def _store_mask(mask_cache, column_state, rule, mask):
+    if mask_cache is not None:
+        packed = pack_mask(mask)
+        mask_cache.put(_mask_cache_key(column_state, rule), packed, packed.nbytes)
+
+
+# Mask satu rule; dari mask cache kalau kolom dengan isi yang sama sudah pernah
+# dievaluasi dengan matcher yang sama
+def _rule_mask(column_state, rule, mask_cache):
+    if mask_cache is not None:
+        packed = mask_cache.get(_mask_cache_key(column_state, rule))
+        if packed is not None:
+            return unpack_mask(packed, len(column_state.series))
+    mask = column_state.rule_mask(rule.matcher)
+    _store_mask(mask_cache, column_state, rule, mask)
+    return mask
+
+
+# === Parallel Evaluation ===
+# Semua mask rule hanya bergantung pada baris itu sendiri, jadi bisa dihitung
+# per blok baris di process pool lalu digabung. Matching series ditulis sekali
+# sebagai file Arrow IPC (di /dev/shm kalau ada) yang di-memory-map oleh setiap
+# worker, bukan DataFrame yang di-pickle. Resolve priority dan summary tetap di
+# proses utama, jadi hasilnya sama dengan evaluasi serial.
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def _worker_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: worker tidak ikut mewarisi thread server Streamlit
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+# Worker yang mati (mis. OOM kill) membuat pool tidak bisa dipakai lagi; pool
+# dibuang supaya run berikutnya membuat pool baru
+def _discard_pool(pool):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool.shutdown(wait=False)
+            _pool = None
+            _pool_workers = None
+
+
+# Worker: mask setiap rule untuk baris [start, start + length). tasks berisi
+# (nama kolom Arrow, keywords, count keywords, [(posisi rule, matcher)]).
+# Returns {posisi rule: (mask packbits, detik)}.
+def _evaluate_block(path, start, length, tasks):
+    import pyarrow as pa
+
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all().slice(start, length)
+        results = {}
+        for name, keywords, count_keywords, rules in tasks:
+            column_state = _ColumnState(table.column(name).to_pandas(), keywords, count_keywords)
+            for position, matcher in rules:
+                rule_start = time.perf_counter()
+                mask = column_state.rule_mask(matcher)
+                results[position] = (pack_mask(mask), time.perf_counter() - rule_start)
+        del table
+    return results
+
+
+# Hitung mask rule yang belum ada di columns (dan mask cache) secara paralel.
+# Returns {posisi rule: detik}, jumlah waktu semua worker per rule; kosong kalau
+# data terlalu kecil atau evaluasi paralel tidak tersedia (lalu serial).
+def _evaluate_parallel(compiled, columns, n_rows):
+    n_blocks = min(compiled.workers, n_rows // PARALLEL_MIN_BLOCK_ROWS)
+    if n_blocks < 2:
+        return {}
+
+    pending = {}
+    for rule in compiled.rules:
+        column_state = columns.get(rule.column)
+        if not rule.outputs or rule.matcher is None or column_state is None or rule.position in column_state.masks:
+            continue
+        if compiled.mask_cache is not None:
+            packed = compiled.mask_cache.get(_mask_cache_key(column_state, rule))
+            if packed is not None:
+                column_state.masks[rule.position] = unpack_mask(packed, n_rows)
+                continue
+        pending.setdefault(rule.column, []).append(rule)
+    if not pending:
+        return {}
+
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        return {}
+
+    names = {column: f"c{i}" for i, column in enumerate(pending)}
+    fd, path = tempfile.mkstemp(suffix=".arrow", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    os.close(fd)
+    try:
+        table = pa.table({
+            names[column]: pa.array(columns[column].series.to_numpy(dtype=object), type=pa.large_string())
+            for column in pending
+        })
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        del table
+
+        tasks = [
+            (
+                names[column],
+                compiled.keywords.get(column, ()),
+                compiled.count_keywords.get(column, ()),
+                [(rule.position, rule.matcher) for rule in rules],
+            )
+            for column, rules in pending.items()
+        ]
+        bounds = np.linspace(0, n_rows, n_blocks + 1).astype(np.int64)
+        pool = _worker_pool(compiled.workers)
+        try:
+            futures = [
+                pool.submit(_evaluate_block, path, int(start), int(end - start), tasks)
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            blocks = [future.result() for future in futures]
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+    except Exception as e:
+        print(f"⚠️ Evaluasi rule paralel gagal, lanjut serial: {e}")
+        return {}
+    finally:
+        os.remove(path)
+
+    seconds = {}
+    for column, rules in pending.items():
+        column_state = columns[column]
+        for rule in rules:
+            mask = np.concatenate([
+                unpack_mask(block[rule.position][0], int(end - start))
+                for block, start, end in zip(blocks, bounds[:-1], bounds[1:])
+            ])
+            column_state.masks[rule.position] = mask
+            _store_mask(compiled.mask_cache, column_state, rule, mask)
+            seconds[rule.position] = sum(block[rule.position][1] for block in blocks)
+    return seconds
+
+
+class _EvaluationState:
+    def __init__(self, index, max_bytes=COLUMN_CACHE_MAX_BYTES):
+        self.index = index
+        self.columns = {}
+        self.joined = {}
+        self.channel = None
+        self.channel_masks = {}
+        self.resolution = None
+        self.summary_masks = []
+        self.max_bytes = max_bytes
+        self._clock = 0
+
+    # Data turunan kolom yang paling lama tidak dipakai dilepas dulu sampai
+    # total memorinya di bawah max_bytes
+    def trim(self, current):
+        self._clock += 1
+        current.last_used = self._clock
+        column_states = [c for c in self.columns.values() if c is not None]
+        total = sum(c.nbytes for c in column_states)
+        for column_state in sorted(column_states, key=lambda c: c.last_used):
+            if total <= self.max_bytes:
+                break
+            if column_state is not current:
+                total -= column_state.nbytes
+                column_state.drop_derived()
+
+
+# Channel filter satu rule (mask semua baris kalau rule tidak punya Channel)
+def _channel_mask(state, channel):
+    if pd.isna(channel) or state.channel is None:
+        return None
+    key = str(channel).strip().lower()
+    if key not in state.channel_masks:
+        state.channel_masks[key] = (state.channel == key).to_numpy(dtype=bool)
+    return state.channel_masks[key]
+
+
+# skip: posisi rule yang tidak dievaluasi di sini (rule berantai, lihat _apply_sequential)
+def _evaluate(compiled, df, profiler=None, skip=()):
+    timed = profiler is not None and profiler.enabled
+    state = compiled._state
+    if state is None or not state.index.equals(df.index):
+        state = _EvaluationState(df.index.copy())
+    changed = state.resolution is None
+
+    channel_series = df["Channel"].astype(str).str.lower() if "Channel" in df.columns else None
+    if not _same_series(state.channel, channel_series):
+        state.channel = channel_series
+        state.channel_masks = {}
+        changed = True
+
+    columns = {}
+    texts = {}
+    for rule in compiled.rules:
+        if rule.column in columns or not rule.outputs or rule.matcher is None or rule.position in skip:
+            continue
+        if timed:
+            start = time.perf_counter()
+        series = _matching_series(df, rule.column, texts, state.joined)
+        previous = state.columns.get(rule.column)
+        if previous is not None and _same_series(previous.series, series):
+            columns[rule.column] = previous
+        else:
+            columns[rule.column] = None if series is None else _ColumnState(
+                series, compiled.keywords.get(rule.column, ()), compiled.count_keywords.get(rule.column, ())
+            )
+            changed = changed or previous is not None or series is not None
+            if timed and series is not None:
+                columns[rule.column].prepare_seconds = time.perf_counter() - start
+    state.columns = columns
+    parallel_seconds = _evaluate_parallel(compiled, columns, len(df)) if compiled.workers > 1 else {}
+
+    evaluated = []
+    for rule in compiled.rules:
+        if not rule.outputs or rule.matcher is None or rule.position in skip:
+            continue
+        column_state = columns.get(rule.column)
+        if column_state is None:
+            continue
+        computed = rule.position not in column_state.masks
+        if timed:
+            start = time.perf_counter()
+        if computed:
+            column_state.masks[rule.position] = _rule_mask(column_state, rule, compiled.mask_cache)
+            state.trim(column_state)
+        mask = column_state.masks[rule.position]
+
+        channel_mask = _channel_mask(state, rule.channel)
+        if channel_mask is not None:
+            mask = mask & channel_mask
+        evaluated.append((rule, mask))
+
+        if timed and computed:
+            seconds = time.perf_counter() - start + column_state.prepare_seconds
+            column_state.prepare_seconds = 0.0
+            profiler.add_rule(rule, seconds, mask.sum())
+        elif timed and rule.position in parallel_seconds:
+            profiler.add_rule(rule, parallel_seconds[rule.position], mask.sum())
+
+    compiled._state = state
+    return evaluated, state, changed
+
+
+# === Chain Overwrite ===
+# Riwayat overwrite disimpan kolumnar: per (rule, kolom output) satu array posisi
+# baris. Teks " ➔ " per baris baru dibangun sekali saat dibutuhkan.
+class ChainOverwrite:
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self.rule_positions = []
+        self.columns = []
+        self.priorities = []
+        self.entries = []
+        self._rows = []
+        self._text = None
+
+    def add(self, rows, rule_position, colname, priority, out_val):
+        if len(rows) == 0:
+            return
+        self.rule_positions.append(rule_position)
+        self.columns.append(colname)
+        self.priorities.append(priority)
+        self.entries.append(f"{colname} P{priority}: {out_val}")
+        self._rows.append(rows.astype(np.int32) if self.n_rows < 2**31 else rows)
+
+    # (row position, entry id) for every recorded overwrite, in rule order per row
+    def arrays(self):
+        if not self._rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+        rows = np.concatenate(self._rows)
+        entry_ids = np.repeat(np.arange(len(self._rows), dtype=np.int32), [len(r) for r in self._rows])
+        order = np.argsort(rows, kind="stable")
+        return rows[order], entry_ids[order]
+
+    # Rows with the same set of overwrites share one joined string: each row gets
+    # a signature (sum of random 64-bit keys of its entries; entries are added in
+    # rule order, so the set fixes the sequence) and each distinct signature is
+    # joined once, from one representative row.
+    def text(self):
+        if self._text is None:
+            chain = np.full(self.n_rows, "", dtype=object)
+            if self._rows:
+                keys = np.random.default_rng(0).integers(1, 2**63, size=(len(self.entries), 2), dtype=np.uint64)
+                signatures = np.zeros((self.n_rows, 2), dtype=np.uint64)
+                has_entry = np.zeros(self.n_rows, dtype=bool)
+                for rows, key in zip(self._rows, keys):
+                    signatures[rows] += key
+                    has_entry[rows] = True
+
+                positions = np.flatnonzero(has_entry)
+                row_signatures = np.ascontiguousarray(signatures[positions]).view([("a", np.uint64), ("b", np.uint64)]).ravel()
+                _, first, inverse = np.unique(row_signatures, return_index=True, return_inverse=True)
+                representatives = positions[first]
+
+                sequences = [[] for _ in representatives]
+                for rows, entry in zip(self._rows, self.entries):
+                    found = np.searchsorted(rows, representatives)
+                    hit = rows[np.minimum(found, len(rows) - 1)] == representatives
+                    for i in np.flatnonzero(hit):
+                        sequences[i].append(entry)
+                joined = np.array([" ➔ ".join(x) for x in sequences], dtype=object)
+                chain[positions] = joined[inverse.ravel()]
+            self._text = chain
+        return self._text
+
+
+def _summary_logs(rule, affected_count):
+    return [
+        (rule.position, {
+            "Priority": rule.priority,
+            "Matching Column": rule.column,
+            "Matching Value": rule.value,
+            "Matching Type": rule.match_type,
+            "Channel": rule.channel,
+            "Affected Rows": affected_count,
+            "Output Column": colname,
+            "Output Value": out_val
+        })
+        for colname, out_val in rule.outputs
+    ]
+
+
+# Summary DataFrame dengan posisi rule sebagai index (urutan rule untuk merge_summaries)
+def _summary_frame(summary_logs):
+    index = pd.Index([position for position, _ in summary_logs], name="Rule Position")
+    return pd.DataFrame([log for _, log in summary_logs], index=index)
+
+
+# Smallest signed integer dtype that holds values up to `limit`
+def _small_int_dtype(limit):
+    for dtype in (np.int8, np.int16, np.int32):
+        if limit <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+# Resolve priorities for every output column in one pass over the rules.
+# Priority dibandingkan sebagai rank integer kecil (urutan sama dengan nilai
+# Priority), bukan array float64 per kolom output.
+def _resolve(evaluated, n_rows):
+    priorities = sorted({float(rule.priority) for rule, _ in evaluated if rule.outputs and pd.notna(rule.priority)})
+    ranks = {priority: rank for rank, priority in enumerate(priorities)}
+    rank_dtype = _small_int_dtype(len(priorities))
+    position_dtype = _small_int_dtype(max((rule.position for rule, _ in evaluated), default=0))
+
+    priority_tracker = {}
+    winners = {}
+    summary_logs = []
+    summary_masks = []
+    chain = ChainOverwrite(n_rows)
+
+    for rule, update_mask in evaluated:
+        if not rule.outputs:
+            continue
+        priority = rule.priority
+        # Priority kosong tidak pernah menang (sama seperti perbandingan dengan NaN)
+        rank = ranks.get(float(priority)) if pd.notna(priority) else None
+        for colname, out_val in rule.outputs:
+            if colname not in priority_tracker:
+                # len(priorities) berfungsi sebagai "belum ada rule" (lebih besar dari semua rank)
+                priority_tracker[colname] = np.full(n_rows, len(priorities), dtype=rank_dtype)
+                winners[colname] = np.full(n_rows, -1, dtype=position_dtype)
+            if rank is None:
+                continue
+            update_condition = update_mask & (priority_tracker[colname] > rank)
+            priority_tracker[colname][update_condition] = rank
+            winners[colname][update_condition] = rule.position
+            chain.add(np.flatnonzero(update_condition), rule.position, colname, priority, out_val)
+
+        affected_count = update_mask.sum()
+        if affected_count > 0:
+            summary_logs.extend(_summary_logs(rule, affected_count))
+            summary_masks.append((rule, update_mask))
+
+    return winners, summary_logs, chain, summary_masks
+
+
+# Mask rule berantai dari isi df saat ini (setelah ditulis rule sebelumnya)
+def _chained_mask(df, rule):
+    series = _matching_series(df, rule.column, {}, {})
+    if series is None:
+        return None
+    keywords, count_keywords = (), ()
+    if rule.matcher[0] == "contains":
+        keywords = set(chain.from_iterable(terms for _, terms in rule.matcher[1]))
+    elif rule.matcher[0] == "count_contains":
+        count_keywords = (rule.matcher[1],)
+    return _ColumnState(series, keywords, count_keywords).rule_mask(rule.matcher)
+
+
+# Pass apply_rules dengan rule berantai: rule dijalankan berurutan (Priority
+# descending) dan output langsung ditulis ke df, jadi rule berikutnya membaca
+# nilai terbaru. Mask rule lain tidak bergantung pada urutan dan tetap dari
+# _evaluate (dan mask cache). Returns (summary logs, chain overwrite, summary masks).
+def _apply_sequential(compiled, df, chained, profiler=None):
+    timed = profiler is not None and profiler.enabled
+    evaluated, state, _ = _evaluate(compiled, df, profiler, skip=chained)
+    masks = {rule.position: mask for rule, mask in evaluated}
+
+    priority_tracker = {}
+    summary_logs = []
+    summary_masks = []
+    overwrites = ChainOverwrite(len(df))
+    for rule in compiled.rules:
+        if rule.position in chained:
+            if timed:
+                start = time.perf_counter()
+            update_mask = _chained_mask(df, rule)
+            if update_mask is None:
+                continue
+            channel_mask = _channel_mask(state, rule.channel)
+            if channel_mask is not None:
+                update_mask = update_mask & channel_mask
+            if timed:
+                profiler.add_rule(rule, time.perf_counter() - start, update_mask.sum())
+        elif rule.position in masks:
+            update_mask = masks[rule.position]
+        else:
+            continue
+
+        priority = float(rule.priority)
+        for colname, out_val in rule.outputs:
+            if colname not in priority_tracker:
+                priority_tracker[colname] = np.full(len(df), np.inf)
+            update_condition = update_mask & (priority_tracker[colname] > priority)
+            if update_condition.any():
+                df.loc[update_condition, colname] = out_val
+                priority_tracker[colname][update_condition] = priority
+            overwrites.add(np.flatnonzero(update_condition), rule.position, colname, rule.priority, out_val)
+
+        affected_count = update_mask.sum()
+        if affected_count > 0:
+            summary_logs.extend(_summary_logs(rule, affected_count))
+            summary_masks.append((rule, update_mask))
+
+    # Isi df sudah berubah; pass berikutnya dievaluasi ulang
+    state.resolution = None
+    state.summary_masks = summary_masks
+    return summary_logs, overwrites, summary_masks
+
+
+# Summary seperti apply_rules untuk sebagian baris, dari (rule, mask) per rule
+# yang sudah dibatasi ke baris tersebut
+def summary_for_rows(summary_masks):
+    summary_logs = []
+    for rule, mask in summary_masks:
+        affected_count = mask.sum()
+        if affected_count > 0:
+            summary_logs.extend(_summary_logs(rule, affected_count))
+    return _summary_frame(summary_logs)
+
+
+# === FUNGSI: Apply Rules ===
+# Menulis semua kolom "Output *" dari rules ke df dan menyimpan chain overwrite
+# di kolom "<output_column> - Chain Overwrite". Pemanggilan berikutnya dengan
+# CompiledRules yang sama (mis. untuk Issue dan Sub Issue) memakai ulang mask
+# dan hasil resolve selama kolom yang dibaca rule tidak berubah. Dengan
+# profiler, waktu dan jumlah baris yang match dicatat per rule.
+def apply_rules(df, rules, output_column, source_output_column=None, profiler=None):
+    compiled = rules if isinstance(rules, CompiledRules) else compile_rules(rules)
+
+    if output_column not in df.columns:
+        df[output_column] = ""
+    for output_col in compiled.output_columns:
+        colname = output_col.replace("Output ", "")
+        if colname not in df.columns:
+            df[colname] = ""
+        elif isinstance(df[colname].dtype, pd.CategoricalDtype):
+            # Kolom raw bisa category; nilai output baru tidak ada di kategorinya
+            df[colname] = df[colname].astype(object)
+
+    chained = compiled.chained_positions(output_column)
+    if chained:
+        summary_logs, chain, _ = _apply_sequential(compiled, df, chained, profiler)
+    else:
+        evaluated, state, changed = _evaluate(compiled, df, profiler)
+        if changed:
+            state.resolution = _resolve(evaluated, len(df))
+        winners, summary_logs, chain, state.summary_masks = state.resolution
+
+        by_position = {rule.position: rule for rule, _ in evaluated}
+        for colname, winner in winners.items():
+            for position in np.unique(winner[winner >= 0]):
+                out_val = dict(by_position[position].outputs)[colname]
+                df.loc[winner == position, colname] = out_val
+
+    # Simpan chain overwrite jika hanya untuk Noise Tag
+    df[output_column + " - Chain Overwrite"] = chain.text()
+    summary_df = _summary_frame(summary_logs)
+    return df, summary_df
@@ -0,0 +1,130 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Batas memori run cache per proses (raw data, mask rule dan hasil run terakhir)
+RUN_CACHE_MAX_BYTES = 1024 * 2**20
+
+
+# sha256 dari isi file (bytes)
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# 64-bit hash per baris dari semua kolom (tanpa index)
+def row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+# Hash isi Series / DataFrame, termasuk nama kolom
+def frame_hash(obj):
+    digest = hashlib.sha256(row_hashes(obj).tobytes())
+    if isinstance(obj, pd.DataFrame):
+        digest.update(repr(list(obj.columns)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def pack_mask(mask):
+    return np.packbits(mask)
+
+
+def unpack_mask(packed, n_rows):
+    return np.unpackbits(packed, count=n_rows).view(bool)
+
+
+# === Run Cache ===
+# Cache per proses untuk run berikutnya dengan input yang (sebagian) sama:
+#   ("raw", hash file, kolom)          -> DataFrame raw data hasil read_raw_data
+#   ("mask", hash kolom, matcher rule) -> mask rule (packbits)
+#   ("run", project, hash setup)       -> RunSnapshot run terakhir
+# Entry yang paling lama tidak dipakai dibuang ketika total ukurannya melewati
+# max_bytes.
+class RunCache:
+    def __init__(self, max_bytes=RUN_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()   # key -> (value, nbytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@lru_cache(maxsize=1)
+def get_run_cache():
+    return RunCache()
+
+
+# === Run Snapshot ===
+# Hasil per baris dari satu run: hash baris input (setelah remove duplicate
+# link), baris df_final, Noise Tag (tanpa trailing .0) dan mask per rule yang
+# masuk summary, per pass apply_rules (Noise Tag, Issue, Sub Issue).
+class RunSnapshot:
+    def __init__(self, columns, row_hashes, df_final, noise, summary_masks):
+        self.columns = tuple(columns)
+        self.row_hashes = row_hashes
+        self.df_final = df_final.reset_index(drop=True)
+        self.noise = noise
+        # Pass yang memakai ulang hasil resolve berbagi mask yang sama: cukup di-pack sekali
+        packed = {}
+        self.summary_masks = []
+        for masks in summary_masks:
+            pass_masks = []
+            for rule, mask in masks:
+                mask_bits = pack_mask(mask)
+                key = (rule.position, mask_bits.tobytes())
+                pass_masks.append((rule, packed.setdefault(key, mask_bits)))
+            self.summary_masks.append(pass_masks)
+        self.summary_masks = tuple(self.summary_masks)
+
+    # Posisi baris snapshot dengan hash yang sama untuk setiap hash, -1 kalau tidak ada
+    def lookup(self, hashes):
+        index = pd.Index(self.row_hashes)
+        if index.is_unique:
+            return index.get_indexer(hashes)
+        first = np.flatnonzero(~index.duplicated(keep="first"))
+        found = pd.Index(self.row_hashes[first]).get_indexer(hashes)
+        return np.where(found >= 0, first[found], -1)
+
+    # (rule, mask) per pass untuk sebagian baris snapshot
+    def masks_for(self, rows):
+        n_rows = len(self.row_hashes)
+        return tuple(
+            [(rule, unpack_mask(packed, n_rows)[rows]) for rule, packed in masks]
+            for masks in self.summary_masks
+        )
+
+    def nbytes(self):
+        packed = {id(p): p.nbytes for masks in self.summary_masks for _, p in masks}
+        noise = 0 if self.noise is None else self.noise.nbytes + 64 * len(self.noise)
+        return int(self.df_final.memory_usage(deep=True).sum()) + self.row_hashes.nbytes + noise + sum(packed.values())
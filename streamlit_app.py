@@ -1,358 +1,167 @@
+from functools import partial
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import time
-from datetime import datetime
-import requests
-from io import BytesIO
-import joblib
-import re
-
-# Load the model and vectorizer for gender prediction
-class GenderPredictor:
-    def __init__(self):
-        model_path = 'path_files/file1.pkl'
-        vectorizer_path = 'path_files/file2.pkl'
-        self.model = joblib.load(model_path)
-        self.vectorizer = joblib.load(vectorizer_path)
-        self.labels = {1: "male", 0: "female"}
-
-    def predict(self, name: str):
-        vector = self.vectorizer.transform([name])
-        result = self.model.predict(vector)[0]
-        proba = self.model.predict_proba(vector).max()
-        return self.labels[result], round(proba * 100, 2)
-
-# Function to process and fill gender prediction if confidence > 70%
-def fill_gender(df):
-    predictor = GenderPredictor()
-    for index, row in df[df['Gender'].isna()].iterrows():
-        name = row['Author']  # Assuming there's an 'Author' column
-        
-        # Skip rows where the 'Author' name is NaN
-        if pd.isna(name):
-            continue
-
-        # Remove non-alphabetic characters (keep only letters)
-        name_cleaned = re.sub(r'[^a-zA-Z]', '', name)
-
-        # Skip empty names after cleaning
-        if not name_cleaned:
-            continue
-        
-        # Predict gender
-        gender, probability = predictor.predict(name_cleaned)
-        
-        # Fill the 'Gender' column if the prediction confidence is greater than 70%
-        if probability > 70:
-            df.at[index, 'Gender'] = gender
-    return df
-
-
-# === Apply Media Tier Logic ===
-def apply_media_tier_logic(df):
-    try:
-        file_id = "1LIcEKO-fdXfo1v-IUeU64He5mh6ti1nc"  # ID file Excel update Media Tier
-
-        # Download file Excel
-        download_url_media_tier = f"https://drive.google.com/uc?id={file_id}"
-        response_media_tier = requests.get(download_url_media_tier)
-        xls_media_tier = pd.ExcelFile(BytesIO(response_media_tier.content))
-
-        # Load the relevant sheets
-        sheet_client = pd.read_excel(xls_media_tier, sheet_name="Le Minerale - from Client")
-        sheet_online = pd.read_excel(xls_media_tier, sheet_name="Online with AVE - Updated")
-        
-        load_success = True
-    except Exception as e:
-        st.error(f"❌ Gagal load file Media Tier dari Google Drive: {e}")
-        load_success = False
-
-    if load_success:
-
-        # Mapping 'Media Name' to 'Media Tier' for both sheets
-        media_tier_dict = {}
-        
-        # Get media tier from the "Le Minerale - from Client"
-        for index, row in sheet_client.iterrows():
-            media_name = row['Media Name']
-            media_tier = row['Media Tier']
-            media_tier_dict[media_name] = media_tier
-
-        # Get media tier from the "Online with AVE - Updated"
-        for index, row in sheet_online.iterrows():
-            media_name = row['Media Name']
-            media_tier = row['Media Tier']
-            if media_name not in media_tier_dict:
-                media_tier_dict[media_name] = media_tier
-
-        # Apply media tier to the raw data
-        for index, row in df[df['Media Name'].notna()].iterrows():
-            media_name = row['Media Name']
-            
-            # Check if Media Name is in our media_tier_dict, otherwise apply Ad Value logic
-            if media_name in media_tier_dict:
-                df.at[index, 'Media Tier'] = media_tier_dict[media_name]
-            else:
-                ad_value = row['Ad Value']
-                if ad_value >= 18000000:
-                    df.at[index, 'Media Tier'] = 1
-                elif ad_value >= 12600000:
-                    df.at[index, 'Media Tier'] = 2
-                else:
-                    df.at[index, 'Media Tier'] = 3
-        return df
-    
-    else:
-        st.stop()
-
-
-# Function to update the "Media Tier" visibility in the Column Order Setup sheet
-def update_media_tier_visibility(df_column_order):
-
-    # Find the row where 'Column Name' is "Media Tier"
-    media_tier_row = df_column_order[df_column_order["Column Name"] == "Media Tier"]
-
-    # Check if "Hide" is "Yes" and change it to "No"
-    if not media_tier_row.empty:
-        if media_tier_row["Hide"].iloc[0].strip().lower() == "yes":
-            df_column_order.loc[df_column_order["Column Name"] == "Media Tier", "Hide"] = "No"
-    
-    # Return the updated DataFrame
-    return df_column_order
-
-
-# === FUNGSI: Apply Rules ===
-def apply_rules(df, rules, output_column, source_output_column):
-    import re
-    rules.columns = rules.columns.str.strip()
-    rules_sorted = rules.sort_values(by="Priority", ascending=False)
-
-    if output_column not in df.columns:
-        df[output_column] = ""
-
-    # Tambahkan: deteksi semua kolom output dari rules
-    output_cols_in_rules = [col for col in rules.columns if col.startswith("Output ")]
-    for output_col in output_cols_in_rules:
-        colname = output_col.replace("Output ", "")
-        if colname not in df.columns:
-            df[colname] = ""
-    priority_tracker = {
-        col.replace("Output ", ""): pd.Series([float("inf")] * len(df), index=df.index)
-        for col in output_cols_in_rules
-    }
-
-    summary_logs = []
-    overwrite_tracker = [[] for _ in range(len(df))]
 
-    for _, rule in rules_sorted.iterrows():
-        col = rule["Matching Column"]
-        val = rule["Matching Value"]
-        match_type = rule["Matching Type"]
-        priority = rule["Priority"]
-        channel = rule.get("Channel", "")
-
-        # Filter Channel
-        if pd.notna(channel) and "Channel" in df.columns:
-            channel_mask = df["Channel"].astype(str).str.lower() == str(channel).strip().lower()
-        else:
-            channel_mask = pd.Series([True] * len(df), index=df.index)
-
-        # Matching logic (same as before)
-        if "+" in col:
-            parts = [p.strip() for p in col.split("+")]
-            if not all(p in df.columns for p in parts):
-                continue
-            series = df[parts[0]].astype(str)
-            for p in parts[1:]:
-                series += "+" + df[p].astype(str)
-        else:
-            if col not in df.columns:
-                continue
-            series = df[col].astype(str)
-
-        if match_type == "contains":
-            if "+" in val:
-                val_parts = val.split("+")
-                submasks = []
-                for v in val_parts:
-                    v = v.strip()
-                    if "|" in v:
-                        keywords = [re.escape(x.strip()) for x in v.split("|")]
-                        if all(k.startswith("\\!") for k in keywords):
-                            keywords_clean = [k[2:] for k in keywords]
-                            submask = ~series.str.contains("|".join(keywords_clean), case=False, na=False)
-                        elif all(not k.startswith("\\!") for k in keywords):
-                            submask = series.str.contains("|".join(keywords), case=False, na=False)
-                        else:
-                            must_not = [k[2:] for k in keywords if k.startswith("\\!")]
-                            must_yes = [k for k in keywords if not k.startswith("\\!")]
-                            mask_not = ~series.str.contains("|".join(must_not), case=False, na=False) if must_not else True
-                            mask_yes = series.str.contains("|".join(must_yes), case=False, na=False) if must_yes else True
-                            submask = mask_not & mask_yes
-                    elif v.startswith("!"):
-                        submask = ~series.str.contains(re.escape(v[1:]), case=False, na=False)
-                    else:
-                        submask = series.str.contains(re.escape(v), case=False, na=False)
-                    submasks.append(submask)
-                mask = pd.concat(submasks, axis=1).all(axis=1)
-            else:
-                if val.startswith("!"):
-                    mask = ~series.str.contains(re.escape(val[1:]), case=False, na=False)
-                else:
-                    mask = series.str.contains(re.escape(val), case=False, na=False)
-        elif match_type == "equals":
-            mask = series == val
-        elif match_type == "greater_than":
-            try:
-                val_num = float(val)
-                series_num = pd.to_numeric(series, errors="coerce")
-                mask = series_num > val_num
-            except ValueError:
-                continue
-        elif match_type == "less_than":
-            try:
-                val_num = float(val)
-                series_num = pd.to_numeric(series, errors="coerce")
-                mask = series_num < val_num
-            except ValueError:
-                continue
-        elif match_type == "count_contains":
-            try:
-                keyword, constraint = val.split(":")
-                keyword = re.escape(keyword.strip())
-                constraint = constraint.strip()
-                counts = series.str.lower().str.count(rf"\b{keyword}\b")
-                if "max=" in constraint:
-                    max_allowed = int(constraint.replace("max=", "").strip())
-                    mask = counts <= max_allowed
-                elif "min=" in constraint:
-                    min_allowed = int(constraint.replace("min=", "").strip())
-                    mask = counts >= min_allowed
-                else:
-                    continue
-            except Exception as e:
-                print(f"⚠️ Error parsing count_contains rule: {val} - {e}")
-                continue
-        else:
-            continue
-
-        update_mask = mask & channel_mask
-
-        # Apply output to all relevant output columns
-        for output_col in output_cols_in_rules:
-            out_val = rule.get(output_col)
-            colname = output_col.replace("Output ", "")
-            if pd.notna(out_val) and colname in df.columns:
-                update_condition = update_mask & (priority_tracker[colname] > priority)
-                df.loc[update_condition, colname] = out_val
-                priority_tracker[colname].loc[update_condition] = priority
-                for idx in update_condition[update_condition].index:
-                    overwrite_tracker[idx].append(f"{colname} P{priority}: {out_val}")
-
-        # Log per Output Column
-        for output_col in output_cols_in_rules:
-            out_val = rule.get(output_col)
-            colname = output_col.replace("Output ", "")
-            if pd.notna(out_val) and colname in df.columns:
-                affected_count = update_mask.sum()
-                if affected_count > 0 and pd.notna(out_val):
-                    summary_logs.append({
-                        "Priority": priority,
-                        "Matching Column": col,
-                        "Matching Value": val,
-                        "Matching Type": match_type,
-                        "Channel": channel,
-                        "Affected Rows": affected_count,
-                        "Output Column": colname,
-                        "Output Value": out_val
-                    })
-
-
-    # Simpan chain overwrite jika hanya untuk Noise Tag
-    df[output_column + " - Chain Overwrite"] = [" ➔ ".join(x) if x else "" for x in overwrite_tracker]
-    summary_df = pd.DataFrame(summary_logs)
-    return df, summary_df
-
-
-
-#Untuk menentukan official account
-def apply_official_account_logic(df, setup_df, project_name):
-    import re
-    setup_df.columns = setup_df.columns.str.strip()
-    
-    # Ubah nilai TRUE/FALSE jadi Yes/No (string)
-    setup_df["Verified Account"] = setup_df["Verified Account"].apply(
-        lambda x: "yes" if str(x).strip().lower() in ["true", "yes", "1"] else "no"
+from batch import default_worker_count, run_batch
+from output_writer import OUTPUT_FORMATS
+from link_dedup import get_seen_links_store
+from media_tier import get_media_tier_loader, prefetch_media_tier_map
+from pipeline import RULES_SHEETS, PipelineError, load_rules_sheets, run_pipeline, run_pipeline_chunked
+from profiling import DISABLED, Profiler
+from result_store import get_result_store
+from run_cache import get_run_cache
+from workbook_loader import (
+    RULES_FILE_ID, STATUS_FAILED, STATUS_LOADING, STATUS_READY, STATUS_STALE, drive_url, get_workbook_loader,
+)
+
+WORKBOOK_STATUS_LABELS = {
+    STATUS_LOADING: "⏳ sedang download",
+    STATUS_READY: "✅ siap",
+    STATUS_STALE: "⚠️ memakai salinan terakhir",
+    STATUS_FAILED: "❌ gagal",
+}
+
+
+def show_workbook_status(placeholder, rules_workbook, media_tier_workbook):
+    placeholder.caption(
+        f"📡 Rules: {WORKBOOK_STATUS_LABELS.get(rules_workbook.status, '⏳ menunggu')} | "
+        f"Media Tier: {WORKBOOK_STATUS_LABELS.get(media_tier_workbook.status, '⏳ menunggu')}"
     )
 
-    # Ambil rules yang sesuai project
-    setup_project = setup_df[setup_df["Project"] == project_name]
-
-    for _, row in setup_project.iterrows():
-        verified = str(row.get("Verified Account", "")).strip().lower()
-        channel = str(row.get("Channel", "")).strip().lower()
-        col = row["Matching Column"]
-        val = row["Matching Value"]
-        match_type = row["Matching Type"]
-
-        if col not in df.columns or "Channel" not in df.columns or "Verified Account" not in df.columns:
-            continue
-
-        # Filter: channel dan verified
-        mask = (
-            df["Verified Account"].astype(str).str.strip().str.lower() == verified
-        ) & (
-            df["Channel"].astype(str).str.strip().str.lower() == channel
-        )
-
-        series = df[col].astype(str)
-
-        if match_type == "contains":
-            pattern = re.escape(val)
-            mask &= series.str.contains(pattern, case=False, na=False)
-
-        elif match_type == "equals":
-            mask &= series == val
-
-        else:
-            continue
-
-        df.loc[mask, "Official Account"] = "Official Account"
-        df.loc[mask, "Noise Tag"] = "1"
-
-    return df
 
+# Jumlah baris per halaman tabel report
+REPORT_PAGE_SIZE = 50
+
+CHAIN_OVERWRITE_COLUMNS = [output_column + " - Chain Overwrite" for output_column in ["Noise Tag"]]
+
+NOISE_TAG_DESCRIPTIONS = {
+    "0": "Valid Content",
+    "1": "Official Brand",
+    "2": "Exclude Content (noise)",
+    "3": "Need QC"
+}
+
+
+# Tabel report, notices dan file output satu run ke result store; returns result id
+def store_result(result_store, result, project_name, output_format):
+    tables = {}
+    if not result.summary_df.empty:
+        # Hilangkan .0 di Output Value
+        summary_cleaned = result.summary_combined.copy()
+        summary_cleaned["Output Value"] = summary_cleaned["Output Value"].astype(str).str.replace(r"\.0$", "", regex=True)
+        tables["summary"] = summary_cleaned[[
+            "Priority", "Matching Column", "Matching Value", "Matching Type",
+            "Channel", "Affected Rows", "Output Column", "Output Value"
+        ]]
+
+        if result.noise_tag_counts is not None:
+            noise_summary = result.noise_tag_counts.reset_index()
+            noise_summary.columns = ["Noise Tag", "Jumlah"]
+            noise_summary["Description"] = noise_summary["Noise Tag"].astype(str).map(NOISE_TAG_DESCRIPTIONS)
+            tables["noise"] = noise_summary
+
+    df_final = result.df_final
+    chain_columns = [] if df_final is None else [col for col in CHAIN_OVERWRITE_COLUMNS if col in df_final.columns]
+    if chain_columns:
+        # Nomor baris di file hasil (baris 1 = header)
+        chain_overwrite_df = df_final[chain_columns].reset_index(drop=True)
+        chain_overwrite_df.insert(0, "Row", chain_overwrite_df.index + 2)
+        tables["chain"] = chain_overwrite_df
+
+    files = {"output": result.output_data}
+    if result.link_hashes is not None:
+        # Link hasil ini, dicatat di SeenLinksStore setelah user menandai sudah dikirim
+        files["links"] = result.link_hashes.tobytes()
+    if result.profile is not None:
+        tables["stages"] = result.profile.stage_report()
+        rule_report = result.profile.rule_report()
+        if not rule_report.empty:
+            tables["rules"] = rule_report.head(20)
+        files["profiling.json"] = result.profile.to_json().encode("utf-8")
+
+    meta = {
+        "project_name": project_name,
+        "notices": result.notices,
+        "duration_seconds": result.duration_seconds,
+        "gender_stats": result.gender_stats,
+        "chunked": df_final is None,
+        "output_format": output_format,
+        "output_filename": result.output_filename,
+        "output_mime": result.output_mime,
+        "export": None if result.export is None else int(result.export),
+    }
+    return result_store.put(tables, files, meta)
+
+
+# Catat link hasil di SeenLinksStore: export berikutnya project ini tidak memuat link tersebut lagi
+def record_delivered_links(result_store, result_id):
+    meta = result_store.meta(result_id)
+    link_hashes = np.frombuffer(result_store.file(result_id, "links"), dtype=np.uint64)
+    get_seen_links_store().record(meta["project_name"], link_hashes, np.uint64(meta["export"]))
+
+
+# Satu halaman tabel dari result store dengan filter, pencarian dan nomor halaman
+def show_table_page(result_store, result_id, table_name, filter_column=None, search_columns=(), sort_by=None):
+    key = f"{result_id}_{table_name}"
+    equals, search = {}, None
+    if filter_column or search_columns:
+        filter_col, search_col = st.columns(2)
+        if filter_column:
+            options = ["Semua"] + result_store.values(result_id, table_name, filter_column)
+            choice = filter_col.selectbox(filter_column, options, key=f"{key}_filter")
+            if choice != "Semua":
+                equals[filter_column] = choice
+        if search_columns:
+            search = search_col.text_input("Cari", key=f"{key}_search")
+
+    page_key = f"{key}_page"
+    page = st.session_state.get(page_key, 1)
+    query = dict(equals=equals, search=search, search_columns=search_columns, sort_by=sort_by, limit=REPORT_PAGE_SIZE)
+    page_df, total_rows = result_store.query(result_id, table_name, offset=(page - 1) * REPORT_PAGE_SIZE, **query)
+    page_count = max(1, -(-total_rows // REPORT_PAGE_SIZE))
+    if page > page_count:
+        # Filter berubah: halaman lama sudah tidak ada
+        page = st.session_state[page_key] = page_count
+        page_df, total_rows = result_store.query(result_id, table_name, offset=(page - 1) * REPORT_PAGE_SIZE, **query)
+
+    st.dataframe(page_df, hide_index=True)
+    if page_count > 1:
+        st.number_input(f"Halaman (dari {page_count}, {total_rows} baris)", min_value=1, max_value=page_count, step=1, key=page_key)
 
 
 # === MULAI STREAMLIT APP ===
 st.title("Insight Automation Phase 1")
 
 # --- Load satu file Excel dari Google Drive (Project List + Rules) ---
+# Workbook di-cache per proses, jadi rerun Streamlit tidak download ulang.
+# Workbook rules dan Media Tier di-download dan di-parse di background selama
+# user mengisi form; halaman hanya menunggu sheet Project List.
+rules_workbook = get_workbook_loader(drive_url(RULES_FILE_ID))
+result_store = get_result_store()
+media_tier_workbook = get_media_tier_loader()
+rules_workbook.prefetch(RULES_SHEETS)
+prefetch_media_tier_map(media_tier_workbook)
+workbook_status = st.empty()
+show_workbook_status(workbook_status, rules_workbook, media_tier_workbook)
 try:
-    file_id = "1qKZcRumDYft3SJ-Cl3qB65gwCRcB1rUZ"  # ID file Excel kamu
-
-    # Download file Excel
-    download_url = f"https://drive.google.com/uc?id={file_id}"
-    response = requests.get(download_url)
-    xls = pd.ExcelFile(BytesIO(response.content))
-
-    # Load semua sheet yang dibutuhkan
-    df_project_list = pd.read_excel(xls, sheet_name="Project List")
-    df_column_setup = pd.read_excel(xls, sheet_name="Column Setup")
-    df_rules = pd.read_excel(xls, sheet_name="Rules")
-    df_column_order = pd.read_excel(xls, sheet_name="Column Order Setup")
-    df_method_1_keyword = pd.read_excel(xls, sheet_name="Method 1 Keyword")
-    df_method_selection = pd.read_excel(xls, sheet_name="Method Selection")
+    with st.spinner("Memuat rules dari Google Drive..."):
+        df_project_list = rules_workbook.sheet("Project List")
+    show_workbook_status(workbook_status, rules_workbook, media_tier_workbook)
+    if rules_workbook.last_error is not None:
+        st.warning(f"⚠️ Gagal refresh file dari Google Drive, memakai salinan terakhir: {rules_workbook.last_error}")
 
     # Load Last Updated dari NOTES!B2
     try:
-        df_notes = pd.read_excel(xls, sheet_name="NOTES", header=None)
+        df_notes = rules_workbook.sheet("NOTES", header=None)
         last_updated = df_notes.iloc[0, 1]
     except:
         last_updated = "Unknown"
 
     load_success = True
 except Exception as e:
+    show_workbook_status(workbook_status, rules_workbook, media_tier_workbook)
     st.error(f"❌ Gagal load file dari Google Drive: {e}")
     load_success = False
 
@@ -360,11 +169,44 @@ if load_success:
     st.markdown("#### Pilih Project Name:")
     st.caption(f"📄 Rules terakhir diperbarui pada: {last_updated}")
 
-    project_name = st.selectbox("", ["Pilih Project"] + df_project_list["Project Name"].dropna().tolist())
+    project_options = ["Pilih Project"] + df_project_list["Project Name"].dropna().tolist()
 
-    uploaded_raw = st.file_uploader("Upload Raw Data", type=["xlsx"], key="raw")
+    # Batch mode: beberapa file sekaligus, masing-masing dengan project-nya sendiri
+    batch_mode = st.toggle("Batch mode (banyak file sekaligus)")
+
+    if not batch_mode:
+        project_name = st.selectbox("", project_options)
+
+        uploaded_raw = st.file_uploader("Upload Raw Data", type=["xlsx"], key="raw")
+    else:
+        uploaded_batch = st.file_uploader("Upload Raw Data", type=["xlsx"], key="raw_batch", accept_multiple_files=True)
+        batch_projects = {}
+        for uploaded_file in uploaded_batch or []:
+            # Tebak project dari nama file
+            guessed = next(
+                (i for i, name in enumerate(project_options[1:], start=1) if str(name).lower() in uploaded_file.name.lower()),
+                0,
+            )
+            batch_projects[uploaded_file.name] = st.selectbox(
+                f"Project untuk {uploaded_file.name}", project_options, index=guessed, key=f"project_{uploaded_file.name}"
+            )
 
     remove_duplicate_links = st.checkbox("Remove duplicate link")
+
+    # Link yang sudah ada di export sebelumnya untuk project yang sama ikut dihapus (disimpan di server)
+    skip_delivered_links = False
+    export_name = None
+    if remove_duplicate_links and not batch_mode:
+        skip_delivered_links = st.checkbox("Hapus juga link yang sudah ada di export sebelumnya (project yang sama)")
+        if skip_delivered_links:
+            # Upload ulang export yang dikoreksi dengan nama yang sama dianggap export yang sama
+            export_name = st.text_input(
+                "Nama export (batch id)", value=uploaded_raw.name if uploaded_raw is not None else "",
+                help="Link hanya dianggap sudah dikirim kalau berasal dari export dengan nama lain.",
+            )
+        if skip_delivered_links and project_name != "Pilih Project" and st.button("Reset riwayat link project ini"):
+            get_seen_links_store().clear(project_name)
+            st.info(f"🧹 Riwayat link untuk {project_name} dihapus.")
     keep_raw_data = st.checkbox("Keep RAW Data (Save original file as separate sheet)")
 
     # New checkboxes for Media Tier and KOL Tier
@@ -373,214 +215,168 @@ if load_success:
     # New checkboxes for Media Tier and KOL Tier
     apply_kol_type = st.checkbox("Apply KOL Type")
 
-    submit = st.button("Submit")
+    # Untuk hasil yang sangat besar, CSV / Parquet jauh lebih cepat dari Excel
+    output_format = st.selectbox("Format Output", list(OUTPUT_FORMATS))
 
-    if submit:
-        if project_name == "Pilih Project" or uploaded_raw is None:
-            st.error("❌ Anda harus memilih project dan upload raw data sebelum submit.")
-        else:
-            st.success(f"✅ Project: {project_name} | File Loaded Successfully!")
+    # Raw data besar diproses per chunk supaya tidak kehabisan memori
+    chunked_mode = st.checkbox("Mode hemat memori (proses per 100.000 baris)")
 
-            start_time = time.time()
+    # Upload ulang dengan rules yang diubah / export yang diperpanjang: hanya rule dan baris yang berubah diproses
+    use_run_cache = st.checkbox("Pakai ulang hasil run sebelumnya (incremental)", value=True)
 
-            df_raw = pd.read_excel(uploaded_raw, sheet_name=0)
-            if "Campaign" in df_raw.columns:
-                df_raw = df_raw.rename(columns={"Campaign": "Campaigns"})
-            df_processed = df_raw.copy()
+    # Waktu, jumlah baris dan memori per stage + waktu per rule di Summary Execution Report
+    enable_profiling = st.checkbox("Profiling per stage")
 
-            # Remove duplicate link
-            if remove_duplicate_links and "Link URL" in df_processed.columns:
-                before_count = len(df_processed)
-                df_processed = df_processed.drop_duplicates(subset="Link URL").reset_index(drop=True)
-                after_count = len(df_processed)
-                st.info(f"🔁 Removed {before_count - after_count} duplicate rows based on 'Link URL'")
+    submit = st.button("Submit")
 
-            # Standardize Verified Account
-            if "Verified Account" in df_processed.columns:
-                df_processed["Verified Account"] = (
-                    df_processed["Verified Account"].astype(str).str.strip().str.lower().replace({"-": "no", "": "no", "nan": "no"})
+    if submit and batch_mode:
+        if not uploaded_batch or "Pilih Project" in batch_projects.values():
+            st.error("❌ Anda harus upload raw data dan memilih project untuk setiap file sebelum submit.")
+        else:
+            jobs = [(f.name, f.getvalue(), batch_projects[f.name]) for f in uploaded_batch]
+            with st.spinner(f"Memproses {len(jobs)} file..."):
+                batch_timing, batch_zip = run_batch(
+                    jobs,
+                    load_rules_sheets(rules_workbook),
+                    remove_duplicate_links=remove_duplicate_links,
+                    keep_raw_data=keep_raw_data,
+                    apply_media_tier=apply_media_tier,
+                    apply_kol_type=apply_kol_type,
+                    output_format=OUTPUT_FORMATS[output_format],
                 )
-                df_processed["Verified Account"] = df_processed["Verified Account"].apply(lambda x: "Yes" if x == "yes" else "No")
-
-
-            # Setup Columns
-            column_setup_default = df_column_setup[df_column_setup["Project"] == "Default"]
-            column_setup_project = df_column_setup[df_column_setup["Project"] == project_name]
-            column_setup_combined = pd.concat([column_setup_default, column_setup_project], ignore_index=True)
-
-            for _, row in column_setup_combined.iterrows():
-                col = row["Target Column"]
-                ref_col = row["Reference Column"]
-                pos = row["Position"]
-                default = row["Default Value"] if pd.notna(row["Default Value"]) else ""
-
-                if col not in df_processed.columns:
-                    # Jika kolom belum ada, tambahkan dan isi default
-                    if ref_col in df_processed.columns:
-                        ref_idx = df_processed.columns.get_loc(ref_col)
-                        insert_at = ref_idx if pos == "before" else ref_idx + 1
-                        df_processed.insert(loc=insert_at, column=col, value=default)
-                    else:
-                        df_processed[col] = default
-                else:
-                    # Jika kolom sudah ada, isi semua nilai kosong / NaN dengan default
-                    df_processed[col] = df_processed[col].fillna("").replace("", default)
-
-            # Apply Official Account Logic dari setup sheet
-            df_official_account_setup = pd.read_excel(xls, sheet_name="Official Account Setup")
-            df_processed = apply_official_account_logic(df_processed, df_official_account_setup, project_name)
-
-
-            # Bersihkan trailing .0 hanya untuk kolom 'Noise Tag' jika diperlukan
-            if "Noise Tag" in df_processed.columns and df_processed["Noise Tag"].notna().any():
-                try:
-                    series_str = df_processed["Noise Tag"].astype(str)
-                    if any(series_str.dropna().str.contains(r"\.0$", regex=True, na=False)):
-                        df_processed["Noise Tag"] = series_str.replace({r"\.0$": ""}, regex=True)
-                except Exception as e:
-                    st.warning(f"⚠️ Gagal membersihkan kolom 'Noise Tag': {e}")
-
-            # === Apply Rules ===
-            rules_default = df_rules[df_rules["Project"] == "Default"]
-            rules_project = df_rules[df_rules["Project"] == project_name] if project_name in df_rules["Project"].values else pd.DataFrame()
-            rules_combined = pd.concat([rules_default, rules_project], ignore_index=True)
-            
-            
-            # 🔍 DEBUG: Cek jumlah rules
-            #st.markdown("##### Debug Rule Matching")
-            #st.write("Jumlah rules Default:", len(rules_default))
-            #st.write("Jumlah rules Project:", len(rules_project))
-            #st.write("Total rules digabung:", len(rules_combined))
-
-       
-            # Apply untuk Noise Tag
-            df_processed, summary_df = apply_rules(
-                df=df_processed,
-                rules=rules_combined,
-                output_column="Noise Tag",
-                source_output_column="Output Noise Tag"
-            )
 
-            # Apply Gender Prediction
-            df_processed = fill_gender(df_processed)
-
-            # Tambahkan ini untuk Issue
-            df_processed, summary_df_issue = apply_rules(
-                df=df_processed,
-                rules=rules_combined,
-                output_column="Issue",
-                source_output_column="Output Issue"
-            )
-
-            df_processed, summary_df_sub_issue = apply_rules(
-                df=df_processed,
-                rules=rules_combined,
-                output_column="Sub Issue",
-                source_output_column="Output Sub Issue"
+            st.subheader("📊 Batch Execution Report")
+            st.dataframe(batch_timing)
+            failed = batch_timing[batch_timing["Error"] != ""]
+            if not failed.empty:
+                st.error(f"❌ {len(failed)} file gagal diproses, lihat kolom Error.")
+            st.download_button(
+                label="⬇️ Download Semua Hasil (.zip)",
+                data=batch_zip,
+                file_name=f"batch_{pd.Timestamp.now().strftime('%Y-%m-%d')}.zip",
+                mime="application/zip"
             )
 
+    elif submit:
+        if project_name == "Pilih Project" or uploaded_raw is None:
+            st.error("❌ Anda harus memilih project dan upload raw data sebelum submit.")
+        else:
+            st.success(f"✅ Project: {project_name} | File Loaded Successfully!")
 
-            # Gabungkan summary Noise Tag + Issue + Sub Issue
-            summary_combined = pd.concat([summary_df, summary_df_issue, summary_df_sub_issue], ignore_index=True)
-
-            # === Hitung kolom Followers ===
-            if "Original Reach" in df_processed.columns and "Potential Reach" in df_processed.columns:
-                df_processed["Followers"] = df_processed["Original Reach"].fillna(0) + df_processed["Potential Reach"].fillna(0)
-
-
-            # Apply Media Tier if checked
-            if apply_media_tier:
-                # Apply Media Tier logic
-                df_processed = apply_media_tier_logic(df_processed)
+            profiler = Profiler().start() if enable_profiling else None
+            try:
+                # Sheet sudah di-parse di background (prefetch); revalidate juga di background
+                with (profiler or DISABLED).stage("Load Rules Workbook"):
+                    rules_sheets = load_rules_sheets(rules_workbook)
+                if chunked_mode:
+                    run, run_options = run_pipeline_chunked, {}
+                else:
+                    run, run_options = run_pipeline, {"run_cache": get_run_cache() if use_run_cache else None}
+                result = run(
+                    uploaded_raw,
+                    project_name,
+                    rules_sheets,
+                    remove_duplicate_links=remove_duplicate_links,
+                    keep_raw_data=keep_raw_data,
+                    apply_media_tier=apply_media_tier,
+                    apply_kol_type=apply_kol_type,
+                    output_format=OUTPUT_FORMATS[output_format],
+                    profiler=profiler,
+                    rule_workers=default_worker_count(),
+                    seen_links_store=get_seen_links_store() if skip_delivered_links else None,
+                    export_name=export_name,
+                    **run_options,
+                )
+            except PipelineError as e:
+                st.error(str(e))
+                st.stop()
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+
+            # Hasil disimpan di result store; session hanya menyimpan result id
+            previous_result_id = st.session_state.get("result_id")
+            st.session_state["result_id"] = store_result(result_store, result, project_name, output_format)
+            if previous_result_id:
+                result_store.delete(previous_result_id)
+
+    # Hasil run terakhir session ini, dibaca dari result store (tetap ada setelah rerun)
+    result_id = st.session_state.get("result_id")
+    if not batch_mode and result_id and result_store.exists(result_id):
+        meta = result_store.meta(result_id)
+        for level, message in meta["notices"]:
+            getattr(st, level)(message)
+
+        # === Hitung durasi proses
+        duration_seconds = meta["duration_seconds"]
+        hours, remainder = divmod(duration_seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
+
+        st.info(f"🕒 Proses ini berjalan selama {int(hours)} jam {int(minutes)} menit {int(seconds)} detik.")
+
+
+        # 1. Tampilkan Summary Execution Report
+        st.subheader("📊 Summary Execution Report")
+        with st.expander("Lihat Summary Execution Report"):
+            if "summary" in meta["tables"]:
+                show_table_page(
+                    result_store, result_id, "summary", filter_column="Output Column",
+                    search_columns=["Matching Column", "Matching Value", "Output Value"],
+                    sort_by=[("Priority", "descending")],
+                )
 
-                # Update "Media Tier" visibility to be shown
-                df_column_order = update_media_tier_visibility(df_column_order)
+                # 🔹 Tambahan Ringkasan Noise Tag
+                if "noise" in meta["tables"]:
+                    st.markdown("**🧮 Ringkasan Noise Tag:**")
+                    show_table_page(result_store, result_id, "noise")
+            else:
+                st.info("ℹ️ Tidak ada rule yang match pada data ini.")
 
+            gender_stats = meta["gender_stats"]
+            st.caption(
+                f"🧠 Gender cache: {gender_stats['Cache Hits']} nama dari cache, "
+                f"{gender_stats['Cache Misses']} nama diprediksi model"
+            )
 
+            # 🔹 Profiling per stage dan rule paling lambat
+            if "stages" in meta["tables"]:
+                st.markdown("**⏱️ Profiling per Stage:**")
+                show_table_page(result_store, result_id, "stages")
+                if "rules" in meta["tables"]:
+                    st.markdown("**🐢 Rule paling lambat:**")
+                    show_table_page(result_store, result_id, "rules")
+                # File dibaca dari result store saat tombol diklik, bukan di setiap rerun
+                st.download_button(
+                    label="⬇️ Download Profiling (.json)",
+                    data=partial(result_store.file, result_id, "profiling.json"),
+                    file_name=f"profiling_{meta['project_name']}.json",
+                    mime="application/json"
+                )
 
-            # Setup Column Order
-            if project_name in df_column_order["Project"].values:
-                ordered_cols = df_column_order[df_column_order["Project"] == project_name]
+        # 2. Tampilkan Chain Overwrite Tracker
+        st.subheader("🧩 Chain Overwrite Tracker")
+        with st.expander("Lihat Chain Overwrite Tracker"):
+            if meta["chunked"]:
+                st.info("ℹ️ Mode hemat memori: lihat kolom Chain Overwrite di file hasil.")
+            elif "chain" in meta["tables"]:
+                show_table_page(result_store, result_id, "chain", search_columns=CHAIN_OVERWRITE_COLUMNS)
             else:
-                ordered_cols = df_column_order[df_column_order["Project"] == "Default"]
-
-            ordered_cols = ordered_cols[ordered_cols["Hide"].str.lower() != "yes"]["Column Name"].tolist()
-            final_cols = [col for col in ordered_cols if col in df_processed.columns]
-
-            df_final = df_processed[final_cols]
-
-            
-            # Save Output
-            tanggal_hari_ini = datetime.now().strftime("%Y-%m-%d")
-            output_filename = f"{project_name}_{tanggal_hari_ini}.xlsx"
-
-            #Jika keep raw data dan tidak keep raw data
-            with pd.ExcelWriter(output_filename, engine='openpyxl') as writer:
-                if keep_raw_data:
-                    df_raw.to_excel(writer, sheet_name="RAW Data", index=False)
-                df_final.to_excel(writer, sheet_name="Process Data", index=False)
-
-
-            end_time = time.time()
-            minutes, seconds = divmod(end_time - start_time, 60)
-
-            # === Hitung durasi proses
-            duration_seconds = end_time - start_time
-            hours, remainder = divmod(duration_seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-
-            st.info(f"🕒 Proses ini berjalan selama {int(hours)} jam {int(minutes)} menit {int(seconds)} detik.")
-
-
-            # 1. Tampilkan Summary Execution Report
-            st.subheader("📊 Summary Execution Report")
-            with st.expander("Lihat Summary Execution Report"):
-                if not summary_df.empty:
-                    # Hilangkan .0 di Output Value
-                    summary_cleaned = summary_combined.copy()
-                    summary_cleaned["Output Value"] = summary_cleaned["Output Value"].astype(str).str.replace(r"\.0$", "", regex=True)
-
-                    summary_sorted = summary_cleaned.sort_values(by="Priority", ascending=False)
-                    st.dataframe(summary_sorted[[
-                        "Priority", "Matching Column", "Matching Value", "Matching Type",
-                        "Channel", "Affected Rows", "Output Column", "Output Value"
-                    ]])
-
-                    # 🔹 Tambahan Ringkasan Noise Tag
-                    if "Noise Tag" in df_processed.columns:
-                        st.markdown("**🧮 Ringkasan Noise Tag:**")
-                        noise_summary = df_processed["Noise Tag"].astype(str).str.replace(r"\.0$", "", regex=True).value_counts().reset_index()
-                        noise_summary.columns = ["Noise Tag", "Jumlah"]
-
-                        description_map = {
-                            "0": "Valid Content",
-                            "1": "Official Brand",
-                            "2": "Exclude Content (noise)",
-                            "3": "Need QC"
-                        }
-                        noise_summary["Description"] = noise_summary["Noise Tag"].astype(str).map(description_map)
-                        st.dataframe(noise_summary)
-                else:
-                    st.info("ℹ️ Tidak ada rule yang match pada data ini.")
-
-            # 2. Tampilkan Chain Overwrite Tracker
-            st.subheader("🧩 Chain Overwrite Tracker")
-            with st.expander("Lihat Chain Overwrite Tracker"):
-                chain_overwrite_columns = [output_column + " - Chain Overwrite" for output_column in ["Noise Tag"]]
-                if any(col in df_final.columns for col in chain_overwrite_columns):
-                    chain_overwrite_df = df_final[chain_overwrite_columns]
-                    st.dataframe(chain_overwrite_df)
-                else:
-                    st.info("ℹ️ Tidak ada perubahan tercatat (Chain Overwrite kosong).")
+                st.info("ℹ️ Tidak ada perubahan tercatat (Chain Overwrite kosong).")
+
+        # 3. Tombol Download Hasil di paling bawah
+        st.success(f"⏱️ Proses selesai dalam {int(minutes)} menit {int(seconds)} detik")
+        st.download_button(
+            label=f"⬇️ Download Hasil {meta['output_format']}",
+            data=partial(result_store.file, result_id, "output"),
+            file_name=meta["output_filename"],
+            mime=meta["output_mime"]
+        )
 
-            # 3. Tombol Download Hasil di paling bawah
-            st.success(f"⏱️ Proses selesai dalam {int(minutes)} menit {int(seconds)} detik")
-            st.download_button(
-                label="⬇️ Download Hasil Excel",
-                data=open(output_filename, "rb").read(),
-                file_name=output_filename,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        # Link baru dicatat sebagai sudah dikirim setelah dikonfirmasi, bukan saat hasil dibuat
+        if "links" in meta["files"]:
+            if st.button("✅ Tandai link hasil ini sudah dikirim ke client"):
+                record_delivered_links(result_store, result_id)
+                st.success(f"📌 Link hasil ini dicatat untuk {meta['project_name']}.")
 
 else:
     st.stop()
@@ -0,0 +1,202 @@
+# Salinan persis apply_rules dan apply_official_account_logic dari streamlit_app.py
+# sebelum rule engine dan official account di-compile, sebagai pembanding di test.
+import pandas as pd
+
+
+def apply_rules(df, rules, output_column, source_output_column):
+    import re
+    rules.columns = rules.columns.str.strip()
+    rules_sorted = rules.sort_values(by="Priority", ascending=False)
+
+    if output_column not in df.columns:
+        df[output_column] = ""
+
+    # Tambahkan: deteksi semua kolom output dari rules
+    output_cols_in_rules = [col for col in rules.columns if col.startswith("Output ")]
+    for output_col in output_cols_in_rules:
+        colname = output_col.replace("Output ", "")
+        if colname not in df.columns:
+            df[colname] = ""
+    priority_tracker = {
+        col.replace("Output ", ""): pd.Series([float("inf")] * len(df), index=df.index)
+        for col in output_cols_in_rules
+    }
+
+    summary_logs = []
+    overwrite_tracker = [[] for _ in range(len(df))]
+
+    for _, rule in rules_sorted.iterrows():
+        col = rule["Matching Column"]
+        val = rule["Matching Value"]
+        match_type = rule["Matching Type"]
+        priority = rule["Priority"]
+        channel = rule.get("Channel", "")
+
+        # Filter Channel
+        if pd.notna(channel) and "Channel" in df.columns:
+            channel_mask = df["Channel"].astype(str).str.lower() == str(channel).strip().lower()
+        else:
+            channel_mask = pd.Series([True] * len(df), index=df.index)
+
+        # Matching logic (same as before)
+        if "+" in col:
+            parts = [p.strip() for p in col.split("+")]
+            if not all(p in df.columns for p in parts):
+                continue
+            series = df[parts[0]].astype(str)
+            for p in parts[1:]:
+                series += "+" + df[p].astype(str)
+        else:
+            if col not in df.columns:
+                continue
+            series = df[col].astype(str)
+
+        if match_type == "contains":
+            if "+" in val:
+                val_parts = val.split("+")
+                submasks = []
+                for v in val_parts:
+                    v = v.strip()
+                    if "|" in v:
+                        keywords = [re.escape(x.strip()) for x in v.split("|")]
+                        if all(k.startswith("\\!") for k in keywords):
+                            keywords_clean = [k[2:] for k in keywords]
+                            submask = ~series.str.contains("|".join(keywords_clean), case=False, na=False)
+                        elif all(not k.startswith("\\!") for k in keywords):
+                            submask = series.str.contains("|".join(keywords), case=False, na=False)
+                        else:
+                            must_not = [k[2:] for k in keywords if k.startswith("\\!")]
+                            must_yes = [k for k in keywords if not k.startswith("\\!")]
+                            mask_not = ~series.str.contains("|".join(must_not), case=False, na=False) if must_not else True
+                            mask_yes = series.str.contains("|".join(must_yes), case=False, na=False) if must_yes else True
+                            submask = mask_not & mask_yes
+                    elif v.startswith("!"):
+                        submask = ~series.str.contains(re.escape(v[1:]), case=False, na=False)
+                    else:
+                        submask = series.str.contains(re.escape(v), case=False, na=False)
+                    submasks.append(submask)
+                mask = pd.concat(submasks, axis=1).all(axis=1)
+            else:
+                if val.startswith("!"):
+                    mask = ~series.str.contains(re.escape(val[1:]), case=False, na=False)
+                else:
+                    mask = series.str.contains(re.escape(val), case=False, na=False)
+        elif match_type == "equals":
+            mask = series == val
+        elif match_type == "greater_than":
+            try:
+                val_num = float(val)
+                series_num = pd.to_numeric(series, errors="coerce")
+                mask = series_num > val_num
+            except ValueError:
+                continue
+        elif match_type == "less_than":
+            try:
+                val_num = float(val)
+                series_num = pd.to_numeric(series, errors="coerce")
+                mask = series_num < val_num
+            except ValueError:
+                continue
+        elif match_type == "count_contains":
+            try:
+                keyword, constraint = val.split(":")
+                keyword = re.escape(keyword.strip())
+                constraint = constraint.strip()
+                counts = series.str.lower().str.count(rf"\b{keyword}\b")
+                if "max=" in constraint:
+                    max_allowed = int(constraint.replace("max=", "").strip())
+                    mask = counts <= max_allowed
+                elif "min=" in constraint:
+                    min_allowed = int(constraint.replace("min=", "").strip())
+                    mask = counts >= min_allowed
+                else:
+                    continue
+            except Exception as e:
+                print(f"⚠️ Error parsing count_contains rule: {val} - {e}")
+                continue
+        else:
+            continue
+
+        update_mask = mask & channel_mask
+
+        # Apply output to all relevant output columns
+        for output_col in output_cols_in_rules:
+            out_val = rule.get(output_col)
+            colname = output_col.replace("Output ", "")
+            if pd.notna(out_val) and colname in df.columns:
+                update_condition = update_mask & (priority_tracker[colname] > priority)
+                df.loc[update_condition, colname] = out_val
+                priority_tracker[colname].loc[update_condition] = priority
+                for idx in update_condition[update_condition].index:
+                    overwrite_tracker[idx].append(f"{colname} P{priority}: {out_val}")
+
+        # Log per Output Column
+        for output_col in output_cols_in_rules:
+            out_val = rule.get(output_col)
+            colname = output_col.replace("Output ", "")
+            if pd.notna(out_val) and colname in df.columns:
+                affected_count = update_mask.sum()
+                if affected_count > 0 and pd.notna(out_val):
+                    summary_logs.append({
+                        "Priority": priority,
+                        "Matching Column": col,
+                        "Matching Value": val,
+                        "Matching Type": match_type,
+                        "Channel": channel,
+                        "Affected Rows": affected_count,
+                        "Output Column": colname,
+                        "Output Value": out_val
+                    })
+
+
+    # Simpan chain overwrite jika hanya untuk Noise Tag
+    df[output_column + " - Chain Overwrite"] = [" ➔ ".join(x) if x else "" for x in overwrite_tracker]
+    summary_df = pd.DataFrame(summary_logs)
+    return df, summary_df
+
+
+def apply_official_account_logic(df, setup_df, project_name):
+    import re
+    setup_df.columns = setup_df.columns.str.strip()
+    
+    # Ubah nilai TRUE/FALSE jadi Yes/No (string)
+    setup_df["Verified Account"] = setup_df["Verified Account"].apply(
+        lambda x: "yes" if str(x).strip().lower() in ["true", "yes", "1"] else "no"
+    )
+
+    # Ambil rules yang sesuai project
+    setup_project = setup_df[setup_df["Project"] == project_name]
+
+    for _, row in setup_project.iterrows():
+        verified = str(row.get("Verified Account", "")).strip().lower()
+        channel = str(row.get("Channel", "")).strip().lower()
+        col = row["Matching Column"]
+        val = row["Matching Value"]
+        match_type = row["Matching Type"]
+
+        if col not in df.columns or "Channel" not in df.columns or "Verified Account" not in df.columns:
+            continue
+
+        # Filter: channel dan verified
+        mask = (
+            df["Verified Account"].astype(str).str.strip().str.lower() == verified
+        ) & (
+            df["Channel"].astype(str).str.strip().str.lower() == channel
+        )
+
+        series = df[col].astype(str)
+
+        if match_type == "contains":
+            pattern = re.escape(val)
+            mask &= series.str.contains(pattern, case=False, na=False)
+
+        elif match_type == "equals":
+            mask &= series == val
+
+        else:
+            continue
+
+        df.loc[mask, "Official Account"] = "Official Account"
+        df.loc[mask, "Noise Tag"] = "1"
+
+    return df
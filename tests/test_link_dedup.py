@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from link_dedup import _NORMALIZED_LINK, _is_url, normalize_link, normalize_links, unique_links
+
+SCHEMES = ["https://", "http://", "HTTPS://", "Http://", "https:/", ""]
+HOSTS = ["example.com", "Example.COM", "x.co:8080", "sub-1.a.id", "", "user@host.com", "[::1]", "bücher.de"]
+PATHS = ["", "/", "/p/1", "/p/1/", "//", "/a b", "/%2F", "/ü", "/a;b", "/a\x0bb", "/a\x1cb", "/a ", "/x?"]
+QUERIES = [
+    "", "?", "?a=1", "?utm_source=x", "?utm_a=1&utm_b=2", "?a=1&utm_medium=y", "?UTM_x=1", "?Utm_x", "?utm",
+    "?a=utm_x", "?&utm_x", "?a=1&&b=2", "?&", "?utm_a=1&b=2", "?utm_a=1&UTM_b=2", "?a=1?utm_x", "?utm_a=1?x",
+    "?utm_a=1&", "?utm_a= 1", "?utm_a=\x1f",
+]
+FRAGMENTS = ["", "#", "#top", "#a?utm_z=1", "#a b", "# "]
+PADDING = ["", " ", "\t", "\x0b", " ", "\x1c"]
+
+
+def random_links(rng, n):
+    links = []
+    for _ in range(n):
+        link = (
+            f"{rng.choice(SCHEMES)}{rng.choice(HOSTS)}{rng.choice(PATHS)}{rng.choice(QUERIES)}{rng.choice(FRAGMENTS)}"
+        )
+        if rng.random() < 0.1:
+            link = rng.choice([f"{rng.choice(PADDING)}{link}{rng.choice(PADDING)}", "-", "", np.nan, 12345])
+        elif rng.random() < 0.5:
+            # Bentuk standar, yang diambil jalur cepat regex
+            link = normalize_link(link)
+        links.append(link)
+    return links
+
+
+# Link ASCII yang lolos _NORMALIZED_LINK tidak di-parse; harus sudah sama dengan hasil
+# normalize_link. Link yang ditulis ulang (http://, query utm_*) dan sisanya dicek lewat
+# normalize_links dan unique_links terhadap normalize_link per link.
+@pytest.mark.parametrize("seed", range(20))
+def test_normalized_link_fast_path_matches_normalize_link(seed):
+    links = random_links(np.random.default_rng(seed), 500)
+    ascii_links = [link for link in links if isinstance(link, str) and link.isascii()]
+    is_standard = pc.match_substring_regex(pa.array(ascii_links, type=pa.string()), _NORMALIZED_LINK).to_pylist()
+    assert any(is_standard)
+    for link, standard in zip(ascii_links, is_standard):
+        if standard:
+            assert normalize_link(link) == link
+
+    expected = pd.Series([normalize_link(link) for link in links], dtype=object)
+    normalized, is_url = normalize_links(links)
+    pd.testing.assert_series_equal(pd.Series(normalized, dtype=object), expected)
+    assert is_url.tolist() == [isinstance(link, str) and _is_url(link) for link in links]
+
+    rows, standard_links, _ = unique_links(links)
+    expected_rows = np.flatnonzero(~expected.duplicated().to_numpy())
+    assert rows.tolist() == expected_rows.tolist()
+    pd.testing.assert_series_equal(pd.Series(standard_links, dtype=object), expected[expected_rows].reset_index(drop=True))
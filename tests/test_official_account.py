@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import legacy
+from official_account import OfficialAccountMatcher
+
+PROJECTS = ["Proj A", "Proj B"]
+HANDLES = ["brand", "Brand_ID", "BRAND official", "İstanbul", "toko", "ſtore", "@Kopi"]
+CHANNELS = ["Twitter", " twitter ", "Instagram", "TikTok"]
+
+
+def random_raw(rng, n_rows):
+    authors = [
+        np.nan if rng.random() < 0.1 else f"{rng.choice(['', 'the ', 'TOKO '])}{rng.choice(HANDLES)}{rng.choice(['', ' ID', '_2'])}"
+        for _ in range(n_rows)
+    ]
+    return pd.DataFrame({
+        "Author": authors,
+        "Media Name": rng.choice(HANDLES + ["Kompas", np.nan], size=n_rows),
+        "Channel": rng.choice(CHANNELS + [np.nan], size=n_rows),
+        "Verified Account": rng.choice(["yes", "No", "TRUE", "", np.nan], size=n_rows),
+        "Noise Tag": rng.choice(["", "0", "2"], size=n_rows),
+    })
+
+
+def random_setup(rng, n_rows, sequential):
+    columns = ["Author", "Media Name", "Missing Column"]
+    if sequential:
+        columns += ["Noise Tag", "Official Account"]
+    rows = []
+    for _ in range(n_rows):
+        column = str(rng.choice(columns))
+        match_type = str(rng.choice(["contains", "equals", "regex"]))
+        if column == "Noise Tag":
+            value = str(rng.choice(["1", "2"]))
+        elif column == "Official Account":
+            value = "Official Account"
+        else:
+            value = str(rng.choice(HANDLES)) if match_type == "contains" else str(rng.choice(HANDLES + ["the brand"]))
+        if match_type == "equals" and rng.random() < 0.1:
+            value = np.nan
+        rows.append({
+            # Handle yang sama bisa muncul di beberapa project
+            "Project": str(rng.choice(PROJECTS)),
+            "Verified Account": rng.choice([True, False, "Yes", "no", 1]),
+            "Channel": str(rng.choice(CHANNELS)),
+            "Matching Column": column,
+            "Matching Value": value,
+            "Matching Type": match_type,
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("sequential", [False, True])
+@pytest.mark.parametrize("seed", range(100))
+def test_official_account_matches_legacy(seed, sequential):
+    rng = np.random.default_rng(seed)
+    raw = random_raw(rng, 60)
+    setup = random_setup(rng, int(rng.integers(1, 12)), sequential)
+    project = str(rng.choice(PROJECTS))
+
+    expected = legacy.apply_official_account_logic(raw.copy(), setup.copy(), project)
+    actual = OfficialAccountMatcher(setup.copy(), project).apply(raw.copy())
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_official_account_rejects_non_text_contains_handle():
+    raw = random_raw(np.random.default_rng(0), 10)
+    setup = pd.DataFrame({
+        "Project": ["Proj A"], "Verified Account": ["yes"], "Channel": ["Twitter"],
+        "Matching Column": ["Author"], "Matching Value": [np.nan], "Matching Type": ["contains"],
+    })
+    with pytest.raises(TypeError):
+        legacy.apply_official_account_logic(raw.copy(), setup.copy(), "Proj A")
+    with pytest.raises(TypeError):
+        OfficialAccountMatcher(setup.copy(), "Proj A").apply(raw.copy())
@@ -0,0 +1,122 @@
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from workbook_loader import STATUS_READY, STATUS_STALE, WorkbookLoader, http_fetch
+
+
+def workbook_bytes(value):
+    output = BytesIO()
+    pd.DataFrame({"Project": [value]}).to_excel(output, sheet_name="Project List", index=False)
+    return output.getvalue()
+
+
+# Server lokal: setiap request mengambil satu aksi dari server.actions
+# ("ok", "error" untuk 503, "slow" untuk respons yang lebih lama dari timeout);
+# kalau habis, aksi terakhir diulang
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        action = server.actions.pop(0) if len(server.actions) > 1 else server.actions[0]
+        if action == "slow":
+            time.sleep(server.slow_seconds)
+        if action == "error":
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(server.content)))
+        self.end_headers()
+        self.wfile.write(server.content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.actions = ["ok"]
+    httpd.requests = []
+    httpd.etag = '"v1"'
+    httpd.content = workbook_bytes("Proj A")
+    httpd.slow_seconds = 1.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/workbook.xlsx"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def loader_for(server, **kwargs):
+    fetch = partial(http_fetch, timeout=0.3, retries=1, backoff=0)
+    return WorkbookLoader(server.url, fetch=fetch, **kwargs)
+
+
+def test_not_modified_reuses_parsed_workbook(server):
+    loader = loader_for(server)
+    assert loader.sheet("Project List")["Project"].tolist() == ["Proj A"]
+    version = loader.version
+
+    loader.refresh(force=True)
+    assert server.requests[-1].get("If-None-Match") == '"v1"'
+    assert len(server.requests) == 2
+    assert loader.version == version
+    assert loader.status == STATUS_READY
+
+
+def test_server_error_is_retried(server):
+    server.actions = ["error", "ok"]
+    loader = loader_for(server)
+    assert loader.sheet("Project List")["Project"].tolist() == ["Proj A"]
+    assert len(server.requests) == 2
+    assert loader.status == STATUS_READY
+
+
+def test_timeout_falls_back_to_last_good_copy(server):
+    loader = loader_for(server)
+    loader.refresh()
+
+    server.actions = ["slow"]
+    start = time.time()
+    loader.refresh(force=True)
+    assert time.time() - start < server.slow_seconds * 2
+    assert loader.status == STATUS_STALE
+    assert loader.sheet("Project List")["Project"].tolist() == ["Proj A"]
+
+
+def test_failed_refresh_backs_off_for_error_ttl(server):
+    loader = loader_for(server, ttl=0, error_ttl=60)
+    loader.refresh()
+
+    server.actions = ["error"]
+    loader.refresh()
+    requests_after_failure = len(server.requests)
+    assert loader.status == STATUS_STALE
+    for _ in range(5):
+        loader.refresh()
+    assert len(server.requests) == requests_after_failure
+    assert loader.sheet("Project List")["Project"].tolist() == ["Proj A"]
+
+    # Setelah error_ttl habis download dicoba lagi
+    server.actions = ["ok"]
+    server.etag = '"v2"'
+    server.content = workbook_bytes("Proj B")
+    loader.error_ttl = 0
+    loader.refresh()
+    assert len(server.requests) == requests_after_failure + 1
+    assert loader.status == STATUS_READY
+    assert loader.sheet("Project List")["Project"].tolist() == ["Proj B"]
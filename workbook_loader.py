@@ -0,0 +1,216 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+import pandas as pd
+import requests
+
+RULES_FILE_ID = "1qKZcRumDYft3SJ-Cl3qB65gwCRcB1rUZ"  # ID file Excel Project List + Rules
+WORKBOOK_TTL_SECONDS = 300
+# Setelah download gagal, salinan lama dipakai sekian detik sebelum dicoba lagi
+WORKBOOK_ERROR_TTL_SECONDS = 60
+
+# Download dari Google Drive: timeout per request dan retry dengan backoff
+# (1s, 2s, ...) untuk error koneksi, timeout dan status 429 / 5xx
+FETCH_TIMEOUT_SECONDS = 30
+FETCH_RETRIES = 2
+FETCH_BACKOFF_SECONDS = 1
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def drive_url(file_id):
+    return f"https://drive.google.com/uc?id={file_id}"
+
+
+class FetchResult:
+    def __init__(self, content=None, etag=None, last_modified=None, not_modified=False):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
+
+
+# Download via HTTP, revalidated with ETag / Last-Modified when the server sends them
+def http_fetch(url, etag=None, last_modified=None, timeout=FETCH_TIMEOUT_SECONDS,
+               retries=FETCH_RETRIES, backoff=FETCH_BACKOFF_SECONDS):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        try:
+            response = requests.get(url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_attempt:
+                raise
+        else:
+            if last_attempt or response.status_code not in RETRY_STATUS_CODES:
+                break
+        time.sleep(backoff * 2 ** attempt)
+    if response.status_code == 304:
+        return FetchResult(not_modified=True)
+    response.raise_for_status()
+    return FetchResult(
+        content=response.content,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+# Read a local copy of the workbook, revalidated with the file mtime
+def file_fetch(path, etag=None, last_modified=None):
+    mtime = str(os.path.getmtime(path))
+    if last_modified == mtime:
+        return FetchResult(not_modified=True)
+    with open(path, "rb") as f:
+        return FetchResult(content=f.read(), last_modified=mtime)
+
+
+# Thread pool untuk download dan parse workbook di background (prefetch)
+@lru_cache(maxsize=1)
+def get_prefetch_executor():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="workbook-prefetch")
+
+
+# Status workbook untuk ditampilkan ke user
+STATUS_IDLE = "idle"          # belum pernah di-load
+STATUS_LOADING = "loading"    # sedang download
+STATUS_READY = "ready"        # salinan terbaru sudah di-load
+STATUS_STALE = "stale"        # refresh terakhir gagal, salinan lama dipakai
+STATUS_FAILED = "failed"      # download gagal dan belum ada salinan
+
+
+# === Workbook Loader ===
+# Satu workbook di-download dan di-parse sekali per proses. Setelah TTL habis
+# workbook di-revalidate; sheet hanya di-parse ulang kalau isinya berubah.
+# Kalau download gagal, salinan terakhir yang berhasil tetap dipakai dan
+# download baru dicoba lagi setelah error_ttl. Download berjalan di luar lock
+# sheet: selama revalidate, sheet() dan refresh() di thread lain langsung
+# memakai salinan yang ada, tanpa menunggu download selesai. prefetch()
+# menjalankan refresh + parse di background.
+class WorkbookLoader:
+    def __init__(self, source, fetch=None, ttl=WORKBOOK_TTL_SECONDS, error_ttl=WORKBOOK_ERROR_TTL_SECONDS):
+        self.source = source
+        if fetch is None:
+            fetch = http_fetch if source.startswith(("http://", "https://")) else file_fetch
+        self.fetch = fetch
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.last_error = None
+        self._lock = threading.Lock()            # workbook dan sheet hasil parse
+        self._refresh_lock = threading.Lock()    # satu download dalam satu waktu
+        self._fetching = False
+        self._prefetch = None
+        self._prefetch_lock = threading.Lock()
+        self._checked_at = None
+        self._etag = None
+        self._last_modified = None
+        self._digest = None
+        self._excel = None
+        self._sheets = {}
+
+    def _is_fresh(self):
+        ttl = self.ttl if self.last_error is None else self.error_ttl
+        return self._checked_at is not None and time.time() - self._checked_at < ttl
+
+    def refresh(self, force=False):
+        if not self._refresh_lock.acquire(blocking=self._excel is None):
+            # Download lain sedang berjalan; salinan yang ada dipakai dulu
+            return
+        try:
+            if not force and self._is_fresh():
+                return
+            self._fetching = True
+            try:
+                result = self.fetch(self.source, etag=self._etag, last_modified=self._last_modified)
+            except Exception as e:
+                self.last_error = e
+                if self._excel is None:
+                    raise
+                # Salinan lama dipakai; download dicoba lagi setelah error_ttl
+                self._checked_at = time.time()
+                return
+            finally:
+                self._fetching = False
+            self.last_error = None
+            self._checked_at = time.time()
+            if result.not_modified:
+                return
+            self._etag = result.etag
+            self._last_modified = result.last_modified
+            digest = hashlib.sha256(result.content).hexdigest()
+            if digest != self._digest:
+                excel = pd.ExcelFile(BytesIO(result.content))
+                with self._lock:
+                    self._excel = excel
+                    self._digest = digest
+                    self._sheets = {}
+        finally:
+            self._refresh_lock.release()
+
+    # Refresh (kalau TTL habis) dan parse sheet_names di background. Future
+    # yang sama dikembalikan selama prefetch sebelumnya belum selesai; error
+    # tersimpan di Future dan last_error.
+    def prefetch(self, sheet_names=()):
+        with self._prefetch_lock:
+            if self._prefetch is not None and not self._prefetch.done():
+                return self._prefetch
+            if self._excel is not None and self._is_fresh() and all((name, ()) in self._sheets for name in sheet_names):
+                future = Future()
+                future.set_result(self)
+                return future
+            self._prefetch = get_prefetch_executor().submit(self._load, tuple(sheet_names))
+            return self._prefetch
+
+    def _load(self, sheet_names):
+        self.refresh()
+        for sheet_name in sheet_names:
+            self.sheet(sheet_name)
+        return self
+
+    @property
+    def status(self):
+        if self._fetching:
+            return STATUS_LOADING
+        if self._excel is None:
+            return STATUS_IDLE if self.last_error is None else STATUS_FAILED
+        return STATUS_READY if self.last_error is None else STATUS_STALE
+
+    # Changes whenever a different workbook content is loaded
+    @property
+    def version(self):
+        return self._digest
+
+    # Sheet names of the loaded workbook, for optional sheets
+    def sheet_names(self):
+        if self._excel is None:
+            self.refresh()
+        with self._lock:
+            return list(self._excel.sheet_names)
+
+    # Parsed sheet; a copy is returned because callers modify the DataFrames in place
+    def sheet(self, sheet_name, **read_kwargs):
+        if self._excel is None:
+            self.refresh()
+        key = (sheet_name, tuple(sorted(read_kwargs.items())))
+        with self._lock:
+            if key not in self._sheets:
+                self._sheets[key] = pd.read_excel(self._excel, sheet_name=sheet_name, **read_kwargs)
+            return self._sheets[key].copy()
+
+
+_loaders = {}
+_loaders_lock = threading.Lock()
+
+
+def get_workbook_loader(source, fetch=None, ttl=WORKBOOK_TTL_SECONDS, error_ttl=WORKBOOK_ERROR_TTL_SECONDS):
+    with _loaders_lock:
+        if source not in _loaders:
+            _loaders[source] = WorkbookLoader(source, fetch=fetch, ttl=ttl, error_ttl=error_ttl)
+        return _loaders[source]